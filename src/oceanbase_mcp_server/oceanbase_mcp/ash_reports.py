@@ -0,0 +1,337 @@
+from __future__ import annotations
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Structured sections and the report titles they are taken from, in order of preference.
+SECTION_TITLES = {
+    "top_sql": ("top sql with top events", "top sql"),
+    "top_wait_events": ("top events", "top wait events", "top foreground db time"),
+    "top_sessions": ("top sessions",),
+}
+# Columns used to match rows of the same SQL, event or session when comparing two reports.
+_KEY_COLUMN_RE = re.compile(r"sql[ _]?id|event[ _]?name|session[ _]?id", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?%?$")
+
+
+class AshReport(BaseModel):
+    tenant_id: Optional[str] = None
+    start_time: str
+    end_time: str
+    generated_at: str
+    elapsed_seconds: float
+    text: str
+    # Every table of the report by section title, each row maps column name to cell text.
+    tables: Dict[str, List[Dict[str, str]]] = {}
+    sections: Dict[str, List[Dict[str, str]]] = {}
+
+
+class AshReportJob(BaseModel):
+    job_id: str
+    tenant_id: Optional[str] = None
+    start_time: str
+    end_time: str
+    status: str = "queued"
+    progress: float = 0.0
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+def parse_time(value: str) -> datetime:
+    try:
+        return datetime.strptime(value.strip(), TIME_FORMAT)
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}, expected format yyyy-MM-dd HH:mm:ss")
+
+
+def report_key(start_time: str, end_time: str, tenant_id: Optional[str]) -> Tuple[str, str, str]:
+    return (
+        parse_time(start_time).strftime(TIME_FORMAT),
+        parse_time(end_time).strftime(TIME_FORMAT),
+        str(tenant_id) if tenant_id is not None else "all",
+    )
+
+
+def _split_cells(line: str) -> List[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def parse_report_tables(text: str) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Parse the tables of a TEXT ASH report. A section starts at an unindented line ending
+    with a colon, its table is drawn with +---+ borders and | separated cells, and the first
+    row of the table is the header.
+    """
+    tables: Dict[str, List[Dict[str, str]]] = {}
+    title = None
+    header = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if line[0] not in " \t|+" and stripped.endswith(":"):
+            title = stripped[:-1].strip()
+            header = None
+            continue
+        if title is None or not stripped.startswith("|"):
+            continue
+        cells = _split_cells(stripped)
+        if header is None:
+            header = cells
+            tables.setdefault(title, [])
+        elif len(cells) == len(header):
+            tables[title].append(dict(zip(header, cells)))
+    return tables
+
+
+def extract_sections(tables: Dict[str, List[Dict[str, str]]]) -> Dict[str, List[Dict[str, str]]]:
+    by_title = {title.lower(): rows for title, rows in tables.items()}
+    sections = {}
+    for section, candidates in SECTION_TITLES.items():
+        sections[section] = next((by_title[title] for title in candidates if title in by_title), [])
+    return sections
+
+
+def _key_column(rows: List[Dict[str, str]]) -> Optional[str]:
+    if not rows:
+        return None
+    columns = list(rows[0])
+    return next((column for column in columns if _KEY_COLUMN_RE.fullmatch(column)), columns[0])
+
+
+def _number(value: str) -> Optional[float]:
+    value = value.replace(",", "")
+    if not _NUMBER_RE.match(value):
+        return None
+    return float(value.rstrip("%"))
+
+
+def compare_section(base: List[Dict[str, str]], target: List[Dict[str, str]]) -> dict:
+    """
+    Match the rows of one section of two reports by their SQL id, event name or session id
+    and return the numeric differences of the rows present in both.
+    """
+    key = _key_column(base) or _key_column(target)
+    if key is None:
+        return {"key": None, "changed": [], "only_in_base": [], "only_in_target": []}
+    base_rows = {row.get(key): row for row in base}
+    target_rows = {row.get(key): row for row in target}
+    changed = []
+    for name, target_row in target_rows.items():
+        base_row = base_rows.get(name)
+        if base_row is None:
+            continue
+        delta = {}
+        for column, value in target_row.items():
+            new, old = _number(value), _number(base_row.get(column, ""))
+            if new is not None and old is not None and new != old:
+                delta[column] = round(new - old, 6)
+        changed.append({key: name, "base": base_row, "target": target_row, "delta": delta})
+    return {
+        "key": key,
+        "changed": changed,
+        "only_in_base": [row for name, row in base_rows.items() if name not in target_rows],
+        "only_in_target": [row for name, row in target_rows.items() if name not in base_rows],
+    }
+
+
+class AshReportStore:
+    """
+    Finished ASH reports keyed by tenant and time window. The most recent `max_reports`
+    are kept in memory, and also written to `directory` as JSON if one is given so they
+    survive a restart. Reports put with an expiry are only kept in memory until then.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_reports: int = 32):
+        self.directory = os.path.expanduser(directory) if directory else None
+        self.max_reports = max_reports
+        self._reports: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: Tuple[str, str, str]) -> str:
+        start, end, tenant = key
+        name = f"{tenant}_{start}_{end}".replace(":", "").replace(" ", "T")
+        return os.path.join(self.directory, f"ash_{name}.json")
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[AshReport]:
+        with self._lock:
+            entry = self._reports.get(key)
+            if entry is not None:
+                report, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._reports.move_to_end(key)
+                    return report
+                del self._reports[key]
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), encoding="utf-8") as f:
+                report = AshReport.model_validate_json(f.read())
+            self._remember(key, report, None)
+            return report
+        return None
+
+    def put(
+        self, key: Tuple[str, str, str], report: AshReport, expires_at: Optional[float] = None
+    ) -> None:
+        self._remember(key, report, expires_at)
+        if self.directory and expires_at is None:
+            with open(self._path(key), "w", encoding="utf-8") as f:
+                f.write(report.model_dump_json())
+
+    def _remember(self, key, report: AshReport, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._reports[key] = (report, expires_at)
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+
+
+class AshReportJobs:
+    """
+    Runs ASH reports in the background. submit() returns a job at once, the report is
+    generated by `run_report(start_time, end_time, tenant_id)` on one of `max_workers`
+    threads, parsed, and put into `store`. A window that is already in the store, or
+    already being generated, is not generated again.
+
+    DBMS_WORKLOAD_REPOSITORY.ASH_REPORT does not report its own progress, so running jobs
+    estimate it from how long earlier reports took per hour of window.
+
+    Samples of the last `flush_lag` seconds may not be visible to ASH_REPORT yet. A report
+    whose window ends after that is incomplete, it is kept in memory only until the window
+    has settled, then generated again on the next request.
+    """
+
+    def __init__(
+        self,
+        run_report: Callable[[str, str, Optional[str]], str],
+        store: AshReportStore,
+        max_workers: int = 2,
+        job_ttl: float = 3600,
+        flush_lag: float = 60,
+    ):
+        self._run_report = run_report
+        self.store = store
+        self.job_ttl = job_ttl
+        self.flush_lag = flush_lag
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ob_ash")
+        self._jobs: Dict[str, AshReportJob] = {}
+        self._running: Dict[Tuple[str, str, str], str] = {}
+        self._seconds_per_hour: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self, start_time: str, end_time: str, tenant_id: Optional[str] = None
+    ) -> AshReportJob:
+        key = report_key(start_time, end_time, tenant_id)
+        if parse_time(key[0]) >= parse_time(key[1]):
+            raise ValueError("start_time must be before end_time")
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if key in self._running:
+                return self._jobs[self._running[key]]
+            job = AshReportJob(
+                job_id=secrets.token_hex(8),
+                tenant_id=tenant_id,
+                start_time=key[0],
+                end_time=key[1],
+                submitted_at=now,
+            )
+            self._jobs[job.job_id] = job
+            if self.store.get(key) is not None:
+                job.status, job.progress, job.finished_at = "done", 1.0, now
+                return job
+            self._running[key] = job.job_id
+        self._executor.submit(self._run, job, key)
+        return job
+
+    def get(self, job_id: str) -> AshReportJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError(f"Unknown or expired ASH report job: {job_id}")
+            if job.status == "running":
+                job.progress = self._estimate_progress(job)
+            return job.model_copy()
+
+    def wait(self, job_id: str, timeout: float) -> AshReportJob:
+        deadline = time.monotonic() + timeout
+        job = self.get(job_id)
+        while job.status in ("queued", "running") and time.monotonic() < deadline:
+            time.sleep(min(0.2, max(0.0, deadline - time.monotonic())))
+            job = self.get(job_id)
+        return job
+
+    def report(self, job: AshReportJob) -> Optional[AshReport]:
+        return self.store.get(report_key(job.start_time, job.end_time, job.tenant_id))
+
+    def _estimate_progress(self, job: AshReportJob) -> float:
+        if self._seconds_per_hour is None or job.started_at is None:
+            return 0.0
+        hours = (parse_time(job.end_time) - parse_time(job.start_time)).total_seconds() / 3600
+        expected = max(self._seconds_per_hour * hours, 1.0)
+        return round(min(0.95, (time.time() - job.started_at) / expected), 2)
+
+    def _run(self, job: AshReportJob, key: Tuple[str, str, str]) -> None:
+        job.started_at = time.time()
+        job.status = "running"
+        try:
+            text = self._run_report(job.start_time, job.end_time, job.tenant_id)
+            tables = parse_report_tables(text)
+            elapsed = time.time() - job.started_at
+            report = AshReport(
+                tenant_id=job.tenant_id,
+                start_time=job.start_time,
+                end_time=job.end_time,
+                generated_at=datetime.now().strftime(TIME_FORMAT),
+                elapsed_seconds=round(elapsed, 3),
+                text=text,
+                tables=tables,
+                sections=extract_sections(tables),
+            )
+            settles_at = parse_time(job.end_time).timestamp() + self.flush_lag
+            self.store.put(key, report, settles_at if settles_at > time.time() else None)
+            hours = (parse_time(job.end_time) - parse_time(job.start_time)).total_seconds() / 3600
+            if hours > 0:
+                self._seconds_per_hour = elapsed / hours
+            job.status, job.progress = "done", 1.0
+            logger.info(
+                f"ASH report {job.job_id} finished in {elapsed:.1f}s, {len(text)} characters, "
+                f"{len(tables)} sections"
+            )
+            logger.debug(f"ASH report {job.job_id}: {text}")
+        except Exception as e:
+            logger.error(f"ASH report {job.job_id} failed: {e}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                self._running.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.job_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
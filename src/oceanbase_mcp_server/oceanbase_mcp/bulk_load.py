@@ -0,0 +1,181 @@
+from __future__ import annotations
+import csv
+import itertools
+import json
+import logging
+import os
+from typing import IO, Iterator, List, Optional, Tuple
+
+from oceanbase_mcp.sql_utils import quote_identifier
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+SUPPORTED_FORMATS = ("csv", "jsonl", "parquet")
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(
+            f"Cannot detect the format of {path}, set file_format to one of {SUPPORTED_FORMATS}"
+        )
+    return _EXTENSIONS[extension]
+
+
+def default_delimiter(path: str) -> str:
+    """Tab for .tsv files, comma for every other CSV file."""
+    return "\t" if os.path.splitext(path)[1].lower() == ".tsv" else ","
+
+
+def insert_sql(table: str, columns: List[str]) -> str:
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {quote_identifier(table)} ({column_list}) VALUES ({placeholders})"
+
+
+def load_data_sql(table: str, columns: List[str], chunk_path: str) -> str:
+    """LOAD DATA statement for a chunk written by write_csv_chunk()."""
+    column_list = ", ".join(quote_identifier(column) for column in columns)
+    escaped_path = chunk_path.replace("\\", "\\\\").replace("'", "\\'")
+    return (
+        f"LOAD DATA LOCAL INFILE '{escaped_path}' INTO TABLE {quote_identifier(table)} "
+        "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        f"LINES TERMINATED BY '\\n' ({column_list})"
+    )
+
+
+def write_csv_chunk(rows: List[tuple], out: IO[str]) -> None:
+    """
+    Write rows in the layout load_data_sql() expects: every value is enclosed in double quotes
+    with embedded quotes doubled, and NULL is the unquoted word NULL.
+    """
+    for row in rows:
+        fields = [
+            "NULL" if value is None else '"' + str(value).replace('"', '""') + '"' for value in row
+        ]
+        out.write(",".join(fields) + "\n")
+
+
+def _to_db_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _batched(rows: Iterator[tuple], batch_size: int) -> Iterator[List[tuple]]:
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _csv_rows(path: str, columns, delimiter: str, has_header: bool):
+    f = open(path, newline="", encoding="utf-8")
+    reader = csv.reader(f, delimiter=delimiter)
+    try:
+        header = next(reader, None) if has_header else None
+    except csv.Error as e:
+        f.close()
+        raise ValueError(f"Invalid CSV on line {reader.line_num}: {e}") from None
+    columns = columns or header
+    if not columns:
+        f.close()
+        raise ValueError("The CSV file has no header row, pass the target columns explicitly")
+
+    def rows():
+        with f:
+            try:
+                for record in reader:
+                    # Empty CSV fields become NULL.
+                    yield tuple(value if value != "" else None for value in record)
+            except csv.Error as e:
+                raise ValueError(f"Invalid CSV on line {reader.line_num}: {e}") from None
+
+    return columns, rows()
+
+
+def _jsonl_record(line_number: int, line: str) -> dict:
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON on line {line_number}: {e}") from None
+    if not isinstance(record, dict):
+        raise ValueError(f"Line {line_number} is not a JSON object")
+    return record
+
+
+def _jsonl_rows(path: str, columns):
+    f = open(path, encoding="utf-8")
+    lines = ((number, line) for number, line in enumerate(f, start=1) if line.strip())
+    records = itertools.starmap(_jsonl_record, lines)
+    try:
+        first = next(records, None)
+    except ValueError:
+        f.close()
+        raise
+    if first is None:
+        f.close()
+        return columns or [], iter(())
+    columns = columns or list(first)
+
+    def rows():
+        with f:
+            for record in itertools.chain([first], records):
+                yield tuple(_to_db_value(record.get(column)) for column in columns)
+
+    return columns, rows()
+
+
+def _parquet_rows(path: str, columns, batch_size: int):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(
+            "Reading Parquet files requires pyarrow, install it with: pip install oceanbase-mcp[parquet]"
+        )
+    parquet_file = pq.ParquetFile(path)
+    columns = columns or parquet_file.schema_arrow.names
+
+    def rows():
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+            data = record_batch.to_pydict()
+            for values in zip(*(data[column] for column in columns)):
+                yield tuple(_to_db_value(value) for value in values)
+
+    return columns, rows()
+
+
+def read_batches(
+    path: str,
+    file_format: str,
+    batch_size: int,
+    columns: Optional[List[str]] = None,
+    start_row: int = 0,
+    delimiter: Optional[str] = None,
+    has_header: bool = True,
+) -> Tuple[List[str], Iterator[List[tuple]]]:
+    """
+    Stream the data rows of a CSV, JSON Lines or Parquet file in batches of `batch_size`.
+    The first `start_row` data rows are skipped, which is how a failed load is resumed.
+    A malformed row raises ValueError when its batch is read.
+    """
+    if file_format == "csv":
+        columns, rows = _csv_rows(path, columns, delimiter or default_delimiter(path), has_header)
+    elif file_format == "jsonl":
+        columns, rows = _jsonl_rows(path, columns)
+    elif file_format == "parquet":
+        columns, rows = _parquet_rows(path, columns, batch_size)
+    else:
+        raise ValueError(
+            f"Unsupported file format: {file_format}, expected one of {SUPPORTED_FORMATS}"
+        )
+    rows = itertools.islice(rows, start_row, None)
+    return list(columns), _batched(rows, batch_size)
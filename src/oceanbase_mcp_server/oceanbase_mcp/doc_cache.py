@@ -0,0 +1,132 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )
+"""
+_ACCESS_INDEX = "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+
+
+class DocCache:
+    """
+    SQLite-backed cache of OceanBase documentation API responses, values are stored as JSON.
+
+    Entries older than `ttl` seconds are not returned by get() unless `allow_stale` is set,
+    which is how the doc tools keep answering when the API is unreachable. Expired entries
+    are therefore kept, and the least recently used ones are deleted once the cache grows
+    beyond `max_bytes`. A `ttl` of 0 disables the cache.
+    """
+
+    def __init__(self, directory: str, ttl: float = 86400, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path = os.path.join(os.path.expanduser(directory), "doc_cache.sqlite3")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use so that importing the server does not create the directory.
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute(_ACCESS_INDEX)
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, namespace: str, key: str, allow_stale: bool = False) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            now = time.time()
+            if not allow_stale and now - created_at > self.ttl:
+                return None
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key),
+            )
+            conn.commit()
+        return json.loads(value)
+
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            old = conn.execute(
+                "SELECT size FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, key, data, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        while self._bytes > self.max_bytes:
+            rows = conn.execute(
+                "SELECT namespace, key, size FROM entries ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for namespace, key, size in rows:
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+                self._bytes -= size
+                if self._bytes <= self.max_bytes:
+                    break
+        logger.debug(f"Documentation cache is {self._bytes} bytes")
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            conn = self._connection()
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"enabled": True, "path": self.path, "entries": entries, "bytes": self._bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,210 @@
+from __future__ import annotations
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from oceanbase_mcp.doc_text import html_to_text, tokenize
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+INDEX_VERSION = 1
+DOC_EXTENSIONS = (".md", ".markdown", ".html", ".htm")
+
+_FRONT_MATTER_RE = re.compile(r"\A---\n.*?\n---\n", re.DOTALL)
+_MD_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_MD_HEADING_RE = re.compile(r"^#+\s*(.*)$", re.MULTILINE)
+_HTML_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def read_document(path: str) -> Tuple[str, str]:
+    """Return the title and plain text of a markdown or HTML file."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        raw = f.read()
+    if path.lower().endswith((".html", ".htm")):
+        match = _HTML_TITLE_RE.search(raw)
+        text = html_to_text(raw)
+        title = match.group(1).strip() if match else ""
+    else:
+        text = _FRONT_MATTER_RE.sub("", raw)
+        text = _MD_LINK_RE.sub(r"\1", text)
+        match = _MD_HEADING_RE.search(text)
+        title = match.group(1).strip() if match else ""
+        text = _MD_HEADING_RE.sub(r"\1", text)
+        text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    return title or os.path.splitext(os.path.basename(path))[0], text
+
+
+def build_index(source_dir: str, index_dir: str) -> dict:
+    """
+    Index every markdown and HTML file below `source_dir` into `index_dir`:
+        meta.json       format version, document count and average length
+        docs.json       path, title and text offsets of each document
+        texts.bin       the extracted text of all documents, UTF-8
+        terms.json      term -> [first posting, posting count]
+        postings.npy    (document, term frequency) pairs grouped by term, int32
+        lengths.npy     token count of each document
+    """
+    docs: List[dict] = []
+    lengths: List[int] = []
+    postings: Dict[str, List[Tuple[int, int]]] = {}
+    os.makedirs(index_dir, exist_ok=True)
+    offset = 0
+    with open(os.path.join(index_dir, "texts.bin"), "wb") as texts:
+        for root, _, files in os.walk(source_dir):
+            for name in sorted(files):
+                if not name.lower().endswith(DOC_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                title, text = read_document(path)
+                tokens = tokenize(f"{title}\n{text}")
+                if not tokens:
+                    continue
+                doc_id = len(docs)
+                for term, tf in Counter(tokens).items():
+                    postings.setdefault(term, []).append((doc_id, tf))
+                data = text.encode("utf-8")
+                texts.write(data)
+                docs.append(
+                    {
+                        "path": os.path.relpath(path, source_dir),
+                        "title": title,
+                        "start": offset,
+                        "end": offset + len(data),
+                    }
+                )
+                offset += len(data)
+                lengths.append(len(tokens))
+
+    terms = {}
+    arrays = []
+    start = 0
+    for term in sorted(postings):
+        pairs = postings[term]
+        terms[term] = [start, len(pairs)]
+        arrays.append(np.asarray(pairs, dtype=np.int32))
+        start += len(pairs)
+    np.save(
+        os.path.join(index_dir, "postings.npy"),
+        np.concatenate(arrays) if arrays else np.empty((0, 2), dtype=np.int32),
+    )
+    np.save(os.path.join(index_dir, "lengths.npy"), np.asarray(lengths, dtype=np.int32))
+    with open(os.path.join(index_dir, "terms.json"), "w", encoding="utf-8") as f:
+        json.dump(terms, f, ensure_ascii=False)
+    with open(os.path.join(index_dir, "docs.json"), "w", encoding="utf-8") as f:
+        json.dump(docs, f, ensure_ascii=False)
+    meta = {
+        "version": INDEX_VERSION,
+        "documents": len(docs),
+        "terms": len(terms),
+        "average_length": float(np.mean(lengths)) if lengths else 0.0,
+    }
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+
+class LocalDocIndex:
+    """
+    Read-only BM25 search over an index written by build_index(). Postings and document
+    texts are memory-mapped, so opening a large index is cheap and a query only touches the
+    posting lists of its terms.
+    """
+
+    def __init__(self, index_dir: str, k1: float = 1.2, b: float = 0.75):
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Documentation index in {index_dir} has version {self.meta.get('version')}, "
+                f"expected {INDEX_VERSION}, build it again"
+            )
+        with open(os.path.join(index_dir, "terms.json"), encoding="utf-8") as f:
+            self._terms: Dict[str, List[int]] = json.load(f)
+        with open(os.path.join(index_dir, "docs.json"), encoding="utf-8") as f:
+            self._docs: List[dict] = json.load(f)
+        self._postings = np.load(os.path.join(index_dir, "postings.npy"), mmap_mode="r")
+        lengths = np.load(os.path.join(index_dir, "lengths.npy")).astype(np.float64)
+        # The length normalization of BM25 only depends on the document.
+        self._norms = k1 * (1 - b + b * lengths / (self.meta["average_length"] or 1))
+        texts_path = os.path.join(index_dir, "texts.bin")
+        self._texts_file = open(texts_path, "rb")
+        self._texts = (
+            mmap.mmap(self._texts_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.path.getsize(texts_path)
+            else b""
+        )
+        self.k1 = k1
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """Return (document id, BM25 score) of the best matching documents."""
+        if not self._docs:
+            return []
+        scores = np.zeros(len(self._docs))
+        for term in set(tokenize(query)):
+            entry = self._terms.get(term)
+            if entry is None:
+                continue
+            start, count = entry
+            postings = self._postings[start : start + count]
+            doc_ids, tf = postings[:, 0], postings[:, 1].astype(np.float64)
+            idf = np.log(1 + (len(self._docs) - count + 0.5) / (count + 0.5))
+            # Each document appears once per term, so fancy-index addition is safe.
+            scores[doc_ids] += idf * tf * (self.k1 + 1) / (tf + self._norms[doc_ids])
+        matched = np.flatnonzero(scores)
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in ranked]
+
+    def document(self, doc_id: int) -> dict:
+        doc = self._docs[doc_id]
+        text = self._texts[doc["start"] : doc["end"]].decode("utf-8")
+        return {"title": doc["title"], "path": doc["path"], "content": text}
+
+    def close(self) -> None:
+        if isinstance(self._texts, mmap.mmap):
+            self._texts.close()
+        self._texts_file.close()
+
+
+def open_index(index_dir: Optional[str]) -> Optional[LocalDocIndex]:
+    """Open the index in `index_dir`, None if it is not configured or not built yet."""
+    if not index_dir:
+        return None
+    index_dir = os.path.expanduser(index_dir)
+    if not os.path.exists(os.path.join(index_dir, "meta.json")):
+        logger.warning(
+            f"No documentation index in {index_dir}, build it with oceanbase_mcp_doc_index"
+        )
+        return None
+    index = LocalDocIndex(index_dir)
+    logger.info(f"Opened documentation index {index_dir} with {len(index)} documents")
+    return index
+
+
+def main(argv: Optional[List[str]] = None):
+    """Build the local documentation index used by search_oceanbase_document."""
+    parser = argparse.ArgumentParser(
+        description="Index OceanBase markdown or HTML documentation for offline search."
+    )
+    parser.add_argument("source", help="Directory with the .md or .html documentation files")
+    parser.add_argument(
+        "output", help="Directory to write the index to, set it as OB_DOC_INDEX_DIR"
+    )
+    args = parser.parse_args(argv)
+    meta = build_index(args.source, args.output)
+    print(f"Indexed {meta['documents']} documents with {meta['terms']} terms into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import importlib.util
+import math
+import re
+from collections import Counter
+from typing import List
+
+from bs4 import BeautifulSoup
+
+# lxml parses large pages several times faster than the built-in parser, use it when installed.
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+_WORD_RE = re.compile(r"[a-z0-9_$.]+|[\u4e00-\u9fff]+")
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+
+
+def html_to_text(html: str) -> str:
+    """Strip an HTML page to its text, one non-empty line per block."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    # Remove script, style, nav, header, and footer elements.
+    for element in soup(["script", "style", "nav", "header", "footer"]):
+        element.decompose()
+    # Remove spaces at the beginning and end of each line, and empty lines.
+    lines = (line.strip() for line in soup.get_text().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase words for Latin text. Chinese has no word boundaries, so runs of Chinese
+    characters are split into overlapping character bigrams.
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if _CJK_RE.match(word):
+            tokens.extend(word[i : i + 2] for i in range(max(len(word) - 1, 1)))
+        else:
+            tokens.append(word.strip("."))
+    return [token for token in tokens if token]
+
+
+def split_passages(text: str, passage_chars: int = 600) -> List[str]:
+    """Group consecutive lines into passages of about `passage_chars` characters."""
+    passages, current, size = [], [], 0
+    for line in text.splitlines():
+        while len(line) > passage_chars:
+            # A single very long line becomes passages of its own.
+            if current:
+                passages.append("\n".join(current))
+                current, size = [], 0
+            passages.append(line[:passage_chars])
+            line = line[passage_chars:]
+        if current and size + len(line) > passage_chars:
+            passages.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        passages.append("\n".join(current))
+    return [passage for passage in passages if passage.strip()]
+
+
+def bm25_scores(passages: List[List[str]], query: List[str], k1: float = 1.5, b: float = 0.75):
+    """Okapi BM25 score of each tokenized passage for the query, with the passages as corpus."""
+    if not passages:
+        return []
+    average_length = sum(len(tokens) for tokens in passages) / len(passages) or 1.0
+    counts = [Counter(tokens) for tokens in passages]
+    terms = set(query)
+    document_frequency = {term: sum(1 for c in counts if term in c) for term in terms}
+    scores = []
+    for tokens, term_counts in zip(passages, counts):
+        norm = k1 * (1 - b + b * len(tokens) / average_length)
+        score = 0.0
+        for term in terms:
+            tf = term_counts.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(passages) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def select_passages(text: str, query: str, budget: int, passage_chars: int = 600) -> str:
+    """
+    Return the passages of `text` that best match `query` by BM25, in document order,
+    up to `budget` characters. Falls back to the beginning of the text if nothing matches.
+    """
+    if len(text) <= budget:
+        return text
+    passages = split_passages(text, passage_chars)
+    scores = bm25_scores([tokenize(passage) for passage in passages], tokenize(query or ""))
+    if not any(scores):
+        return text[:budget] + "... [content truncated]"
+    chosen, used = [], 0
+    for i in sorted(range(len(passages)), key=lambda i: -scores[i]):
+        if scores[i] <= 0 or used + len(passages[i]) > budget:
+            continue
+        chosen.append(i)
+        used += len(passages[i])
+    if not chosen:
+        # Even the best passage is larger than the budget.
+        best = max(range(len(passages)), key=lambda i: scores[i])
+        return passages[best][:budget]
+    return "\n...\n".join(passages[i] for i in sorted(chosen))
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from oceanbase_mcp.vector_bench import BenchmarkPoint, QuerySet, measure, sample_queries
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+# Range of the ob_hnsw_ef_search session variable.
+MIN_EF_SEARCH = 1
+MAX_EF_SEARCH = 1000
+
+
+class EfSearchSetting(BaseModel):
+    table_name: str
+    vec_column_name: str
+    ef_search: int
+    target_recall: float
+    # Recall of ef_search on the held-out queries, which were not used to choose it.
+    holdout_recall: float
+    met_target: bool
+    k: int
+    distance: str
+    tuned_at: str
+
+
+class EfSearchTuning(BaseModel):
+    setting: EfSearchSetting
+    # Every ef_search measured on the tuning queries, in the order of the search.
+    tried: List[BenchmarkPoint]
+    holdout: BenchmarkPoint
+
+
+def tune_ef_search(
+    backend,
+    table_name: str,
+    vec_column_name: str,
+    target_recall: float = 0.95,
+    k: int = 10,
+    queries: int = 100,
+    max_ef_search: int = MAX_EF_SEARCH,
+    seed: int = 0,
+) -> EfSearchTuning:
+    """
+    Binary search the smallest ef_search whose recall@k on a sample of tuning queries reaches
+    `target_recall`, assuming recall does not drop as ef_search grows. The result is then
+    measured on a second, disjoint sample of held-out queries. If even `max_ef_search` misses
+    the target, it is returned with met_target false.
+    """
+    if not 0 < target_recall <= 1:
+        raise ValueError("target_recall must be above 0 and at most 1")
+    if not MIN_EF_SEARCH <= max_ef_search <= MAX_EF_SEARCH:
+        raise ValueError(f"max_ef_search must be between {MIN_EF_SEARCH} and {MAX_EF_SEARCH}")
+    if k < 1 or queries < 1:
+        raise ValueError("k and queries must be at least 1")
+    _, ids, vectors = sample_queries(backend, 2 * queries, k, seed)
+    # Half of the sampled rows choose ef_search, the other half check it.
+    size = min(queries, len(ids) // 2)
+    tuning = QuerySet(backend, ids[:size], vectors[:size], k)
+    holdout = QuerySet(backend, ids[size : 2 * size], vectors[size : 2 * size], k)
+
+    tried: Dict[int, BenchmarkPoint] = {}
+
+    def meets_target(ef_search: int) -> bool:
+        tried[ef_search] = measure(backend, tuning, ef_search)
+        return tried[ef_search].recall >= target_recall
+
+    # ef_search below k cannot return k neighbors.
+    low, high = min(k, max_ef_search), max_ef_search
+    met_target = meets_target(high)
+    if met_target:
+        while low < high:
+            middle = (low + high) // 2
+            if meets_target(middle):
+                high = middle
+            else:
+                low = middle + 1
+    holdout_point = measure(backend, holdout, high) if len(holdout) else tried[high]
+    logger.info(
+        f"Tuned ef_search of {table_name}.{vec_column_name} to {high}, "
+        f"held-out recall@{k} {holdout_point.recall}"
+    )
+    setting = EfSearchSetting(
+        table_name=table_name,
+        vec_column_name=vec_column_name,
+        ef_search=high,
+        target_recall=target_recall,
+        holdout_recall=holdout_point.recall,
+        met_target=met_target,
+        k=k,
+        distance=backend.distance,
+        tuned_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+    return EfSearchTuning(setting=setting, tried=list(tried.values()), holdout=holdout_point)
+
+
+class EfSearchStore:
+    """
+    Tuned ef_search of each vector column, saved as JSON at `path` per connection profile.
+    Kept in memory after the first read, the vector search tools look it up on every call.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._settings: Optional[Dict[str, Dict[str, dict]]] = None
+
+    @staticmethod
+    def _key(table_name: str, vec_column_name: str) -> str:
+        return f"{table_name}.{vec_column_name}"
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        if self._settings is None:
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    self._settings = json.load(f)
+            else:
+                self._settings = {}
+        return self._settings
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._settings, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, profile: str, table_name: str, vec_column_name: str) -> Optional[EfSearchSetting]:
+        with self._lock:
+            entry = self._load().get(profile, {}).get(self._key(table_name, vec_column_name))
+        return EfSearchSetting(**entry) if entry else None
+
+    def put(self, profile: str, setting: EfSearchSetting) -> None:
+        with self._lock:
+            key = self._key(setting.table_name, setting.vec_column_name)
+            self._load().setdefault(profile, {})[key] = setting.model_dump()
+            self._save()
+
+    def remove(self, profile: str, table_name: str, vec_column_name: str) -> bool:
+        with self._lock:
+            removed = (
+                self._load().get(profile, {}).pop(self._key(table_name, vec_column_name), None)
+            )
+            if removed is not None:
+                self._save()
+        return removed is not None
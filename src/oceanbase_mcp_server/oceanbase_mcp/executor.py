@@ -0,0 +1,56 @@
+from __future__ import annotations
+import asyncio
+import functools
+import inspect
+import logging
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+
+class BlockingCallExecutor:
+    """
+    Runs blocking tool functions on a bounded thread pool so the FastMCP event loop
+    keeps serving other clients while a query or a report is in flight.
+    At most `max_workers` calls run at the same time, further calls wait in the queue.
+    """
+
+    def __init__(self, max_workers: int):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="oceanbase_mcp"
+        )
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def wrap(self, fn: Callable) -> Callable:
+        """
+        Return an async function with the name, docstring and signature of `fn`
+        that runs `fn` on the thread pool.
+        """
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await self.run(fn, *args, **kwargs)
+
+        # FastMCP resolves string annotations against the wrapper's globals,
+        # so hand it a signature whose annotations are already evaluated.
+        hints = typing.get_type_hints(fn)
+        signature = inspect.signature(fn)
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                param.replace(annotation=hints.get(param.name, param.annotation))
+                for param in signature.parameters.values()
+            ],
+            return_annotation=hints.get("return", signature.return_annotation),
+        )
+        return wrapper
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
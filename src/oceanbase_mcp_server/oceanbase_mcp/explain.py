@@ -0,0 +1,298 @@
+from __future__ import annotations
+import json
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+EXPLAIN_FORMATS = {
+    "extended": "EXPLAIN EXTENDED",
+    "basic": "EXPLAIN",
+    "json": "EXPLAIN FORMAT=JSON",
+}
+
+_TREE_CHARS = " \u2502\u251c\u2514\u2500"
+_CALL_RE = re.compile(r"(\w+)\(")
+_DETAIL_START_RE = re.compile(r"^\s*(\d+)\s+-\s+(.*)$")
+_FLAG_RE = re.compile(r"(\w+)=(\w+)")
+_NAME_INDEX_RE = re.compile(r"^(?P<table>[^()]+?)(?:\((?P<index>[^()]+)\))?$")
+# `always true` or `always false` printed right after the parentheses of range(...).
+_RANGE_SUFFIX_RE = re.compile(r"\s*(always (?:true|false))", re.IGNORECASE)
+# MIN ; MAX, or MIN,MIN ; MAX,MAX for a composite key: the range covers the whole table.
+_FULL_RANGE_RE = re.compile(r"^\(?\s*MIN(\s*,\s*MIN)*\s*;\s*MAX(\s*,\s*MAX)*\s*\)?$", re.IGNORECASE)
+
+
+class PlanNode(BaseModel):
+    id: int
+    operator: str
+    name: Optional[str] = None
+    est_rows: Optional[float] = None
+    # EST.TIME(us) on OceanBase 4.x, COST on older versions.
+    cost: Optional[float] = None
+    table: Optional[str] = None
+    index: Optional[str] = None
+    # full_scan, range_scan or get for table access operators.
+    access_path: Optional[str] = None
+    is_index_back: Optional[bool] = None
+    partitions: Optional[str] = None
+    range: Optional[str] = None
+    output: Optional[str] = None
+    filter: Optional[str] = None
+    access: Optional[str] = None
+    children: List["PlanNode"] = []
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+PlanNode.model_rebuild()
+
+
+def _number(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _call_arguments(text: str) -> Dict[str, str]:
+    """
+    Split `output([t1.c1]), filter(nil), range(MIN ; MAX)always true` into name -> argument
+    text. The `always true` or `always false` suffix of a range is kept in its argument.
+    """
+    arguments = {}
+    i = 0
+    while i < len(text):
+        match = _CALL_RE.search(text, i)
+        if not match:
+            break
+        depth, j = 1, match.end()
+        while j < len(text) and depth:
+            depth += {"(": 1, ")": -1}.get(text[j], 0)
+            j += 1
+        argument = text[match.end() : j - 1].strip()
+        suffix = _RANGE_SUFFIX_RE.match(text, j)
+        if suffix:
+            argument = f"{argument} {suffix.group(1)}"
+            j = suffix.end()
+        arguments.setdefault(match.group(1).lower(), argument)
+        i = j
+    return arguments
+
+
+def _classify(node: PlanNode) -> None:
+    operator = node.operator.upper()
+    if "TABLE" not in operator and "INDEX" not in operator:
+        return
+    if "FULL SCAN" in operator:
+        node.access_path = "full_scan"
+    elif "RANGE SCAN" in operator or "SKIP SCAN" in operator:
+        node.access_path = "range_scan"
+    elif operator.endswith("GET"):
+        node.access_path = "get"
+    elif operator.endswith("TABLE SCAN"):
+        # Older versions name every access TABLE SCAN, a full scan has an always-true range
+        # or one from MIN to MAX.
+        full = (
+            node.range is None
+            or "always true" in node.range.lower()
+            or _FULL_RANGE_RE.match(node.range) is not None
+        )
+        node.access_path = "full_scan" if full else "range_scan"
+    else:
+        return
+    match = _NAME_INDEX_RE.match(node.name or "")
+    if match:
+        node.table = match.group("table").strip() or None
+        node.index = match.group("index")
+
+
+def _apply_details(node: PlanNode, details: str) -> None:
+    arguments = _call_arguments(details)
+    for field in ("output", "filter", "access", "partitions", "range"):
+        if field in arguments:
+            setattr(node, field, arguments[field])
+    flags = dict(_FLAG_RE.findall(details))
+    if "is_index_back" in flags:
+        node.is_index_back = flags["is_index_back"].lower() == "true"
+
+
+def _build_tree(nodes: List[Tuple[int, PlanNode]]) -> Optional[PlanNode]:
+    """Link (depth, node) pairs in plan order into a tree."""
+    root = None
+    stack: List[Tuple[int, PlanNode]] = []
+    for depth, node in nodes:
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if stack:
+            stack[-1][1].children.append(node)
+        elif root is None:
+            root = node
+        stack.append((depth, node))
+    return root
+
+
+def parse_text_plan(text: str) -> Optional[PlanNode]:
+    """
+    Parse the table and the "Outputs & filters" section of EXPLAIN or EXPLAIN EXTENDED output.
+    The depth of an operator is the indentation of its OPERATOR cell, drawn with spaces on
+    older versions and with box-drawing characters on OceanBase 4.x.
+    """
+    header = None
+    nodes: List[Tuple[int, PlanNode]] = []
+    by_id: Dict[int, PlanNode] = {}
+    details: Dict[int, List[str]] = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("|"):
+            cells = line.strip().strip("|").split("|")
+            if header is None:
+                header = [cell.strip().upper() for cell in cells]
+                continue
+            if len(cells) != len(header):
+                continue
+            row = dict(zip(header, cells))
+            operator = row.get("OPERATOR", "").rstrip()
+            name = operator.lstrip(_TREE_CHARS)
+            node = PlanNode(
+                id=int(row["ID"]),
+                operator=name,
+                name=row.get("NAME", "").strip() or None,
+                est_rows=_number(row.get("EST.ROWS") or row.get("EST. ROWS")),
+                cost=_number(row.get("EST.TIME(US)") or row.get("COST")),
+            )
+            nodes.append((len(operator) - len(name), node))
+            by_id[node.id] = node
+            continue
+        match = _DETAIL_START_RE.match(line)
+        if match and int(match.group(1)) in by_id:
+            current = int(match.group(1))
+            details[current] = [match.group(2)]
+        elif line.startswith((" ", "\t")):
+            if current is not None and line.strip():
+                details[current].append(line.strip())
+        else:
+            # Outline Data, Used Hint and the other trailing sections.
+            current = None
+    for node_id, lines in details.items():
+        _apply_details(by_id[node_id], " ".join(lines))
+    for _, node in nodes:
+        _classify(node)
+    return _build_tree(nodes)
+
+
+def _json_node(data: dict) -> PlanNode:
+    fields = {
+        key.upper(): value for key, value in data.items() if not key.upper().startswith("CHILD")
+    }
+    node = PlanNode(
+        id=int(fields.get("ID", 0)),
+        operator=str(fields.get("OPERATOR", "")).strip(),
+        name=str(fields.get("NAME") or "").strip() or None,
+        est_rows=_number(fields.get("EST.ROWS", fields.get("EST_ROWS"))),
+        cost=_number(fields.get("EST.TIME(US)", fields.get("COST"))),
+    )
+    details = ", ".join(
+        f"{key.lower()}({value})"
+        for key, value in fields.items()
+        if key in ("OUTPUT", "FILTER", "ACCESS", "PARTITIONS", "RANGE") and value is not None
+    )
+    _apply_details(node, details)
+    if "IS_INDEX_BACK" in fields:
+        node.is_index_back = str(fields["IS_INDEX_BACK"]).lower() == "true"
+    children = sorted(
+        (key for key in data if key.upper().startswith("CHILD")),
+        key=lambda key: int(re.sub(r"\D", "", key) or 0),
+    )
+    node.children = [_json_node(data[key]) for key in children]
+    _classify(node)
+    return node
+
+
+def parse_json_plan(text: str) -> PlanNode:
+    """Parse the output of EXPLAIN FORMAT=JSON, children are nested under CHILD_1, CHILD_2, ..."""
+    return _json_node(json.loads(text))
+
+
+def parse_plan(text: str) -> Optional[PlanNode]:
+    if text.lstrip().startswith("{"):
+        return parse_json_plan(text)
+    return parse_text_plan(text)
+
+
+def summarize(root: PlanNode) -> dict:
+    nodes = list(root.walk())
+    access = [node for node in nodes if node.access_path]
+    return {
+        "cost": root.cost,
+        "est_rows": root.est_rows,
+        "operators": len(nodes),
+        "full_scans": [
+            node.table or node.name for node in access if node.access_path == "full_scan"
+        ],
+        "table_access": [
+            {
+                "table": node.table,
+                "index": node.index,
+                "access_path": node.access_path,
+                "is_index_back": node.is_index_back,
+                "est_rows": node.est_rows,
+                "partitions": node.partitions,
+            }
+            for node in access
+        ],
+    }
+
+
+def _access_key(access: Optional[dict]):
+    return access and (access["access_path"], access["index"])
+
+
+def diff_plans(first: PlanNode, second: PlanNode) -> dict:
+    """Compare the cost, row estimate, operators and table access paths of two plans."""
+    first_summary, second_summary = summarize(first), summarize(second)
+    cost_delta = None
+    cheaper = None
+    if first.cost is not None and second.cost is not None:
+        cost_delta = second.cost - first.cost
+        cheaper = "first" if cost_delta > 0 else "second" if cost_delta < 0 else "equal"
+    first_ops = Counter(node.operator for node in first.walk())
+    second_ops = Counter(node.operator for node in second.walk())
+    first_access = {a["table"]: a for a in first_summary["table_access"] if a["table"]}
+    second_access = {a["table"]: a for a in second_summary["table_access"] if a["table"]}
+    access_changes = []
+    for table in sorted(set(first_access) | set(second_access)):
+        before, after = first_access.get(table), second_access.get(table)
+        if _access_key(before) != _access_key(after):
+            access_changes.append({"table": table, "first": before, "second": after})
+    return {
+        "first": first_summary,
+        "second": second_summary,
+        "cost_delta": cost_delta,
+        "cheaper": cheaper,
+        "operators_only_in_first": sorted((first_ops - second_ops).elements()),
+        "operators_only_in_second": sorted((second_ops - first_ops).elements()),
+        "access_path_changes": access_changes,
+    }
+
+
+def explain(cursor, sql: str, explain_format: str = "extended") -> PlanNode:
+    if explain_format not in EXPLAIN_FORMATS:
+        raise ValueError(
+            f"Unsupported explain format: {explain_format}, expected one of {list(EXPLAIN_FORMATS)}"
+        )
+    sql = sql.strip().rstrip(";")
+    if sql.upper().startswith("EXPLAIN"):
+        raise ValueError("Pass the statement itself, without EXPLAIN")
+    cursor.execute(f"{EXPLAIN_FORMATS[explain_format]} {sql}")
+    # Depending on the version the plan is one row or one row per line.
+    text = "\n".join(str(row[0]) for row in cursor.fetchall())
+    root = parse_plan(text)
+    if root is None:
+        raise ValueError(f"Could not parse the plan:\n{text}")
+    return root
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from oceanbase_mcp.sql_utils import quote_identifier
+
+FUSION_METHODS = ("rrf", "weighted")
+RELEVANCE_COLUMN = "_text_relevance"
+
+
+class SearchHit(BaseModel):
+    key: Any
+    row: tuple
+    score: float
+
+
+class FusedHit(BaseModel):
+    key: Any
+    row: tuple
+    score: float
+    text_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+    text_score: Optional[float] = None
+    distance: Optional[float] = None
+
+
+def text_search_sql(
+    table_name: str,
+    match_columns: Sequence[str],
+    output_columns: Optional[Sequence[str]] = None,
+    filters: Optional[Sequence[str]] = None,
+) -> str:
+    """
+    MATCH ... AGAINST query returning the output columns, all columns by default, followed by
+    the relevance score, best first. Takes the search text twice and the limit as parameters.
+    """
+    match = (
+        f"MATCH ({', '.join(quote_identifier(c) for c in match_columns)}) "
+        "AGAINST (%s IN NATURAL LANGUAGE MODE)"
+    )
+    columns = ", ".join(quote_identifier(c) for c in output_columns) if output_columns else "*"
+    conditions = [match] + [f"({condition})" for condition in filters or []]
+    return (
+        f"SELECT {columns}, {match} AS {RELEVANCE_COLUMN} FROM {quote_identifier(table_name)} "
+        f"WHERE {' AND '.join(conditions)} ORDER BY {RELEVANCE_COLUMN} DESC LIMIT %s"
+    )
+
+
+def _normalize(scores: np.ndarray, higher_is_better: bool) -> np.ndarray:
+    """Min-max scale scores to [0, 1] with 1 for the best hit, all ones if they are equal."""
+    if not higher_is_better:
+        scores = -scores
+    spread = scores.max() - scores.min()
+    if spread == 0:
+        return np.ones_like(scores)
+    return (scores - scores.min()) / spread
+
+
+def fuse(
+    text_hits: List[SearchHit],
+    vector_hits: List[SearchHit],
+    method: str = "rrf",
+    topk: int = 5,
+    rrf_k: int = 60,
+    text_weight: float = 0.5,
+    vector_higher_is_better: bool = False,
+) -> List[FusedHit]:
+    """
+    Merge the ranked full-text and vector hits into one list without duplicate keys.
+
+    rrf: reciprocal rank fusion, each list adds weight / (rrf_k + rank) for the hits it contains.
+    weighted: each list's scores are min-max normalized and added with text_weight and
+    1 - text_weight. Vector scores are distances, lower is better unless
+    `vector_higher_is_better`, as for inner product.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(
+            f"Unsupported fusion method: {method}, expected one of {list(FUSION_METHODS)}"
+        )
+    if not 0 <= text_weight <= 1:
+        raise ValueError("text_weight must be between 0 and 1")
+    fused: Dict[Any, FusedHit] = {}
+    sides = (
+        (text_hits, text_weight, True, "text"),
+        (vector_hits, 1 - text_weight, vector_higher_is_better, "vector"),
+    )
+    for hits, weight, higher_is_better, side in sides:
+        if not hits:
+            continue
+        if method == "rrf":
+            contributions = weight / (rrf_k + np.arange(1, len(hits) + 1))
+        else:
+            scores = np.array([hit.score for hit in hits], dtype=np.float64)
+            contributions = weight * _normalize(scores, higher_is_better)
+        seen = set()
+        for rank, (hit, contribution) in enumerate(zip(hits, contributions), start=1):
+            if hit.key in seen:
+                # The same key twice in one list, only its best rank counts.
+                continue
+            seen.add(hit.key)
+            entry = fused.get(hit.key)
+            if entry is None:
+                entry = fused[hit.key] = FusedHit(key=hit.key, row=hit.row, score=0.0)
+            entry.score += float(contribution)
+            if side == "text":
+                entry.text_rank, entry.text_score = rank, hit.score
+            else:
+                entry.vector_rank, entry.distance = rank, hit.score
+    ranked = sorted(
+        fused.values(),
+        key=lambda hit: (-hit.score, min(hit.text_rank or 1 << 30, hit.vector_rank or 1 << 30)),
+    )
+    return ranked[:topk]
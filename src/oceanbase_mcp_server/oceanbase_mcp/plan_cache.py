@@ -0,0 +1,283 @@
+from __future__ import annotations
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+_PLAN_STAT_SQL = """
+    SELECT TENANT_ID, SVR_IP, SVR_PORT, PLAN_ID, SQL_ID, PLAN_HASH, STATEMENT, EXECUTIONS,
+        HIT_COUNT, AVG_EXE_USEC, SLOWEST_EXE_USEC, CPU_TIME, ELAPSED_TIME, FIRST_LOAD_TIME,
+        LAST_ACTIVE_TIME
+    FROM oceanbase.GV$OB_PLAN_CACHE_PLAN_STAT
+    WHERE {where}
+    ORDER BY ELAPSED_TIME DESC
+    {limit}
+"""
+# The explain view must be queried with the full key of one cached plan.
+_PLAN_EXPLAIN_SQL = """
+    SELECT PLAN_DEPTH, PLAN_LINE_ID, OPERATOR, NAME, ROWS, COST, PROPERTY
+    FROM oceanbase.GV$OB_PLAN_CACHE_PLAN_EXPLAIN
+    WHERE TENANT_ID = %s AND SVR_IP = %s AND SVR_PORT = %s AND PLAN_ID = %s
+    ORDER BY PLAN_LINE_ID
+"""
+
+
+class PlanOperator(BaseModel):
+    depth: int
+    line_id: int
+    operator: str
+    name: Optional[str] = None
+    rows: Optional[float] = None
+    cost: Optional[float] = None
+    property: Optional[str] = None
+
+
+class CachedPlan(BaseModel):
+    tenant_id: int
+    svr_ip: str
+    svr_port: int
+    plan_id: int
+    sql_id: str
+    plan_hash: str
+    statement: str
+    executions: int
+    hit_count: int
+    hit_ratio: float
+    avg_exe_usec: float
+    slowest_exe_usec: float
+    cpu_time: float
+    elapsed_time: float
+    first_load_time: Optional[str] = None
+    last_active_time: Optional[str] = None
+    operators: List[PlanOperator] = []
+
+
+class BaselinePlan(BaseModel):
+    plan_hash: str
+    avg_exe_usec: float
+    executions: int
+    recorded_at: str
+    operators: List[PlanOperator] = []
+
+
+class PlanRegression(BaseModel):
+    sql_id: str
+    current_plan_hash: str
+    current_avg_exe_usec: float
+    baseline_plan_hash: str
+    baseline_avg_exe_usec: float
+    slowdown: float
+    plan_changed: bool
+
+
+def load_plans(
+    cursor,
+    sql_id: Optional[str] = None,
+    table: Optional[str] = None,
+    tenant_id: Optional[int] = None,
+    limit: int = 20,
+    with_operators: bool = True,
+) -> List[CachedPlan]:
+    """
+    Read cached plans from GV$OB_PLAN_CACHE_PLAN_STAT, most expensive first. The view has no
+    table column, so `table` matches the parameterized statement text as a whole identifier:
+    the server narrows the rows down with LIKE, then names that merely contain `table`, such
+    as t10 for t1, are dropped here before `limit` is applied.
+    """
+    conditions, params = ["1 = 1"], []
+    if sql_id is not None:
+        conditions.append("SQL_ID = %s")
+        params.append(sql_id)
+    if table is not None:
+        conditions.append("STATEMENT LIKE %s ESCAPE '\\\\'")
+        params.append("%" + re.sub(r"([\\%_])", r"\\\1", table) + "%")
+    if tenant_id is not None:
+        conditions.append("TENANT_ID = %s")
+        params.append(tenant_id)
+    where = " AND ".join(conditions)
+    if table is None:
+        cursor.execute(_PLAN_STAT_SQL.format(where=where, limit="LIMIT %s"), params + [limit])
+        rows = cursor.fetchall()
+    else:
+        cursor.execute(_PLAN_STAT_SQL.format(where=where, limit=""), params)
+        table_re = re.compile(rf"(?<![\w$]){re.escape(table)}(?![\w$])", re.IGNORECASE)
+        rows = [row for row in cursor.fetchall() if table_re.search(row[6] or "")][:limit]
+    plans = []
+    for row in rows:
+        (
+            tenant,
+            svr_ip,
+            svr_port,
+            plan_id,
+            row_sql_id,
+            plan_hash,
+            statement,
+            executions,
+            hit_count,
+            avg_exe_usec,
+            slowest_exe_usec,
+            cpu_time,
+            elapsed_time,
+            first_load_time,
+            last_active_time,
+        ) = row
+        executions = int(executions or 0)
+        plans.append(
+            CachedPlan(
+                tenant_id=tenant,
+                svr_ip=svr_ip,
+                svr_port=svr_port,
+                plan_id=plan_id,
+                sql_id=row_sql_id,
+                plan_hash=str(plan_hash),
+                statement=statement or "",
+                executions=executions,
+                hit_count=int(hit_count or 0),
+                hit_ratio=round(int(hit_count or 0) / executions, 4) if executions else 0.0,
+                avg_exe_usec=float(avg_exe_usec or 0),
+                slowest_exe_usec=float(slowest_exe_usec or 0),
+                cpu_time=float(cpu_time or 0),
+                elapsed_time=float(elapsed_time or 0),
+                first_load_time=str(first_load_time) if first_load_time is not None else None,
+                last_active_time=str(last_active_time) if last_active_time is not None else None,
+            )
+        )
+    if with_operators:
+        for plan in plans:
+            cursor.execute(
+                _PLAN_EXPLAIN_SQL, (plan.tenant_id, plan.svr_ip, plan.svr_port, plan.plan_id)
+            )
+            plan.operators = [
+                PlanOperator(
+                    depth=depth,
+                    line_id=line_id,
+                    operator=(operator or "").strip(),
+                    name=name or None,
+                    rows=float(rows) if rows is not None else None,
+                    cost=float(cost) if cost is not None else None,
+                    property=prop or None,
+                )
+                for depth, line_id, operator, name, rows, cost, prop in cursor.fetchall()
+            ]
+    return plans
+
+
+def _by_plan_hash(plans: List[CachedPlan]) -> Dict[str, dict]:
+    """Combine the copies of a plan cached on different servers, weighting by executions."""
+    combined: Dict[str, dict] = {}
+    for plan in plans:
+        entry = combined.setdefault(
+            plan.plan_hash,
+            {"executions": 0, "total_usec": 0.0, "last_active_time": "", "plan": plan},
+        )
+        entry["executions"] += plan.executions
+        entry["total_usec"] += plan.avg_exe_usec * plan.executions
+        if (plan.last_active_time or "") >= entry["last_active_time"]:
+            entry["last_active_time"] = plan.last_active_time or ""
+            entry["plan"] = plan
+    for entry in combined.values():
+        executions = entry["executions"]
+        entry["avg_exe_usec"] = entry["total_usec"] / executions if executions else 0.0
+    return combined
+
+
+class PlanBaselineStore:
+    """
+    Known plans of each statement, saved as JSON at `path`. Baselines are kept per connection
+    profile and SQL_ID, one entry per plan hash, so a plan flip shows up as a new hash with a
+    slower average execution time than a recorded one.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._baselines: Optional[Dict[str, Dict[str, Dict[str, dict]]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, dict]]]:
+        if self._baselines is None:
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    self._baselines = json.load(f)
+            else:
+                self._baselines = {}
+        return self._baselines
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._baselines, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, profile: str, sql_id: str) -> Dict[str, BaselinePlan]:
+        with self._lock:
+            entries = self._load().get(profile, {}).get(sql_id, {})
+            return {plan_hash: BaselinePlan(**entry) for plan_hash, entry in entries.items()}
+
+    def record(self, profile: str, plans: List[CachedPlan]) -> int:
+        """Save the plans as baselines, replacing the entry of a plan hash already recorded."""
+        recorded_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        by_sql_id: Dict[str, List[CachedPlan]] = {}
+        for plan in plans:
+            by_sql_id.setdefault(plan.sql_id, []).append(plan)
+        count = 0
+        with self._lock:
+            profile_baselines = self._load().setdefault(profile, {})
+            for sql_id, sql_plans in by_sql_id.items():
+                for plan_hash, entry in _by_plan_hash(sql_plans).items():
+                    if not entry["executions"]:
+                        continue
+                    profile_baselines.setdefault(sql_id, {})[plan_hash] = BaselinePlan(
+                        plan_hash=plan_hash,
+                        avg_exe_usec=entry["avg_exe_usec"],
+                        executions=entry["executions"],
+                        recorded_at=recorded_at,
+                        operators=entry["plan"].operators,
+                    ).model_dump()
+                    count += 1
+            self._save()
+        return count
+
+
+def detect_regressions(
+    plans: List[CachedPlan], store: PlanBaselineStore, profile: str, threshold: float = 1.5
+) -> List[PlanRegression]:
+    """
+    Compare the most recently used plan of each SQL_ID with its fastest recorded baseline and
+    report it if it is `threshold` times slower or more.
+    """
+    by_sql_id: Dict[str, List[CachedPlan]] = {}
+    for plan in plans:
+        by_sql_id.setdefault(plan.sql_id, []).append(plan)
+    regressions = []
+    for sql_id, sql_plans in by_sql_id.items():
+        baselines = store.get(profile, sql_id)
+        if not baselines:
+            continue
+        combined = _by_plan_hash(sql_plans)
+        current_hash = max(combined, key=lambda plan_hash: combined[plan_hash]["last_active_time"])
+        current = combined[current_hash]
+        best = min(baselines.values(), key=lambda baseline: baseline.avg_exe_usec)
+        if best.avg_exe_usec <= 0 or not current["executions"]:
+            continue
+        slowdown = current["avg_exe_usec"] / best.avg_exe_usec
+        if slowdown >= threshold:
+            regressions.append(
+                PlanRegression(
+                    sql_id=sql_id,
+                    current_plan_hash=current_hash,
+                    current_avg_exe_usec=round(current["avg_exe_usec"], 3),
+                    baseline_plan_hash=best.plan_hash,
+                    baseline_avg_exe_usec=round(best.avg_exe_usec, 3),
+                    slowdown=round(slowdown, 2),
+                    plan_changed=current_hash != best.plan_hash,
+                )
+            )
+    return regressions
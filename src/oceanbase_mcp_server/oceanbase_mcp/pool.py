@@ -0,0 +1,144 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from mysql.connector import Error, connect
+from mysql.connector.errors import PoolError
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+
+class OBConnectionPool:
+    """
+    A process-wide pool of OceanBase connections.
+
+    Idle connections are kept in a LIFO stack so the warmest one is handed out first.
+    Connections idle for longer than `idle_timeout` seconds are closed, every connection
+    is pinged before it is handed out, and its session state is reset when it is returned.
+    """
+
+    def __init__(
+        self,
+        conn_info: dict,
+        size: int = 5,
+        idle_timeout: float = 300,
+        acquire_timeout: float = 30,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._conn_info = conn_info
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self._idle = deque()  # (connection, returned_at)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _new_connection(self):
+        logger.info(f"Opening new pooled connection to {self._conn_info.get('host')}")
+        return connect(**self._conn_info)
+
+    @staticmethod
+    def _discard(conn) -> None:
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def _evict_idle(self, now: float) -> None:
+        """Close idle connections that have exceeded idle_timeout. Caller holds the lock."""
+        # The oldest connections sit at the left end of the deque.
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            logger.info("Evicting idle pooled connection")
+            self._discard(conn)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                self._evict_idle(time.monotonic())
+                if not self._idle:
+                    break
+                conn, _ = self._idle.pop()
+            # Health check outside the lock, a dead connection is dropped and the next one tried.
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except Error as e:
+                logger.warning(f"Dropping unhealthy pooled connection: {e}")
+                self._discard(conn)
+        return self._new_connection()
+
+    def _checkin(self, conn) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            # Drop user variables, temporary tables and session variables set by the caller.
+            conn.reset_session()
+        except Error as e:
+            logger.warning(f"Failed to reset pooled connection, discarding it: {e}")
+            self._discard(conn)
+            return
+        with self._lock:
+            if self._closed:
+                self._discard(conn)
+                return
+            self._idle.append((conn, time.monotonic()))
+
+    def acquire(self):
+        """Take a healthy connection out of the pool, opening a new one if none is idle."""
+        if self._closed:
+            raise PoolError("Connection pool is closed")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise PoolError(
+                f"Timed out after {self.acquire_timeout}s waiting for a free connection "
+                f"(pool size {self.size})"
+            )
+        try:
+            return self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Return a connection taken with acquire() to the pool."""
+        try:
+            if discard:
+                self._discard(conn)
+            else:
+                self._checkin(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator:
+        """Context manager form of acquire()/release()."""
+        conn = self.acquire()
+        discard = False
+        try:
+            yield conn
+        except Error:
+            # The connection may be in an unknown state after a driver error,
+            # let the health check decide on the next checkout.
+            discard = not conn.is_connected()
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def close(self) -> None:
+        """Close all idle connections and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+
+    def stats(self) -> dict:
+        with self._lock:
+            idle = len(self._idle)
+        return {"size": self.size, "idle": idle}
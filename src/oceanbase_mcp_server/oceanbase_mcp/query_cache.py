@@ -0,0 +1,223 @@
+from __future__ import annotations
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+READ_ONLY_PREFIXES = ("SELECT", "SHOW", "DESCRIBE", "DESC")
+DDL_PREFIXES = ("CREATE", "ALTER", "DROP", "RENAME", "TRUNCATE")
+
+# Results of these statements change on their own, they are never cached.
+_VOLATILE_RE = re.compile(
+    r"\b(?:NOW|SYSDATE|CURDATE|CURTIME|CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|"
+    r"UNIX_TIMESTAMP|UTC_TIMESTAMP|RAND|UUID|UUID_SHORT|LAST_INSERT_ID|FOUND_ROWS|"
+    r"ROW_COUNT|CONNECTION_ID|SLEEP|NEXTVAL|CURRVAL)\b|@|"
+    r"\bFOR\s+UPDATE\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\b|"
+    r"\bG?V\$|\b__ALL_VIRTUAL|\bINFORMATION_SCHEMA\s*\.\s*PROCESSLIST\b|"
+    r"^SHOW\s+(?:FULL\s+)?PROCESSLIST\b|^SHOW\s+(?:GLOBAL\s+|SESSION\s+)?STATUS\b|"
+    r"^SHOW\s+TRACE\b|^SHOW\s+ENGINE\b|^SHOW\s+WARNINGS\b|^SHOW\s+ERRORS\b",
+    re.IGNORECASE,
+)
+_TOKEN_RE = re.compile(r"`([^`]+)`|([A-Za-z_][\w$]*)")
+_STRING_OR_SPACE_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|`[^`]*`|\s+")
+_IDENT = r"(?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?"
+_WRITE_TARGET_RES = [
+    re.compile(
+        r"^(?:INSERT|REPLACE)\s+(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE)\s+)*"
+        rf"(?:INTO\s+)?(?P<tables>{_IDENT})",
+        re.IGNORECASE,
+    ),
+    re.compile(r"^UPDATE\s+(?P<tables>.+?)\s+SET\b", re.IGNORECASE | re.DOTALL),
+    re.compile(
+        r"^DELETE\s+(?P<tables>.+?)(?:\s+WHERE\b|\s+ORDER\s+BY\b|\s+LIMIT\b|$)",
+        re.IGNORECASE | re.DOTALL,
+    ),
+    re.compile(
+        rf"^LOAD\s+DATA\b.*?\bINTO\s+TABLE\s+(?P<tables>{_IDENT})", re.IGNORECASE | re.DOTALL
+    ),
+]
+# Keywords that may appear between the statement verb and its target tables.
+_NON_TABLE_TOKENS = {
+    "from",
+    "join",
+    "inner",
+    "left",
+    "right",
+    "outer",
+    "cross",
+    "straight_join",
+    "natural",
+    "on",
+    "as",
+    "using",
+    "and",
+    "or",
+    "low_priority",
+    "quick",
+    "ignore",
+    "partition",
+}
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside of quoted literals and drop trailing semicolons."""
+
+    def collapse(match: re.Match) -> str:
+        token = match.group(0)
+        return " " if token.isspace() else token
+
+    return _STRING_OR_SPACE_RE.sub(collapse, sql).strip().rstrip(";").strip()
+
+
+def _tokens(text: str) -> set:
+    return {(quoted or bare).lower() for quoted, bare in _TOKEN_RE.findall(text)}
+
+
+def is_read_only(sql: str) -> bool:
+    return normalize_sql(sql).upper().startswith(READ_ONLY_PREFIXES)
+
+
+def is_cacheable(sql: str) -> bool:
+    normalized = normalize_sql(sql)
+    return (
+        normalized.upper().startswith(READ_ONLY_PREFIXES)
+        and ";" not in normalized
+        and not _VOLATILE_RE.search(normalized)
+    )
+
+
+def written_tables(sql: str) -> Optional[set]:
+    """
+    Return the lower-cased names of the tables a DML statement writes to,
+    or None if they cannot be determined.
+    """
+    normalized = normalize_sql(sql)
+    for pattern in _WRITE_TARGET_RES:
+        match = pattern.match(normalized)
+        if match:
+            tables = _tokens(match.group("tables")) - _NON_TABLE_TOKENS
+            return tables or None
+    return None
+
+
+class _CacheEntry:
+    __slots__ = ("value", "tokens", "expires_at", "size")
+
+    def __init__(self, value: Any, tokens: set, expires_at: float, size: int):
+        self.value = value
+        self.tokens = tokens
+        self.expires_at = expires_at
+        self.size = size
+
+
+class QueryResultCache:
+    """
+    LRU + TTL cache of formatted results of read-only statements, keyed by the normalized statement.
+
+    The cache holds at most `max_bytes` of results, least recently used entries are evicted first.
+    A write drops every entry that mentions one of the tables it touched, DDL and writes whose
+    target tables cannot be determined drop the whole cache. Reads through views of a written
+    table are not tracked and stay cached until their TTL passes.
+    """
+
+    def __init__(self, ttl: float = 30, max_bytes: int = 32 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, sql: str) -> Optional[Any]:
+        """Return the cached result for `sql`, or None on a miss."""
+        if not self.enabled or not is_cacheable(sql):
+            return None
+        key = normalize_sql(sql)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, sql: str, value: Any) -> None:
+        if not self.enabled or not is_cacheable(sql):
+            return
+        key = normalize_sql(sql)
+        # Length of the text, the interpreter's per-object overhead is not counted.
+        size = len(key) + len(str(value))
+        if size > self.max_bytes:
+            return
+        entry = _CacheEntry(value, _tokens(key), time.monotonic() + self.ttl, size)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_statement(self, sql: str) -> None:
+        """Drop the entries a successfully executed non read-only statement may have made stale."""
+        normalized = normalize_sql(sql)
+        if normalized.upper().startswith(DDL_PREFIXES):
+            self.clear()
+            return
+        tables = written_tables(normalized)
+        if tables is None:
+            self.clear()
+            return
+        self.invalidate_tables(tables)
+
+    def invalidate_tables(self, tables: set) -> None:
+        tables = {table.lower() for table in tables}
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.tokens & tables]
+            for key in stale:
+                self._remove(key)
+            self.invalidations += len(stale)
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached results for tables {sorted(tables)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+
+class _OpenCursor:
+    def __init__(self, cursor, on_close: Callable[[bool], None], expires_at: float):
+        self.cursor = cursor
+        self.columns = [desc[0] for desc in cursor.description or []]
+        self.on_close = on_close
+        self.expires_at = expires_at
+        # One row read ahead of the current page so the last page is detected without an extra call.
+        self.lookahead = []
+        self.lock = threading.Lock()
+
+
+class ResultCursorStore:
+    """
+    Server-held, unbuffered cursors for paging through large result sets.
+
+    Each open cursor is identified by an opaque continuation token and keeps its
+    connection until the result is exhausted, it is closed, or it has not been read
+    for `ttl` seconds. At most `max_open` cursors are kept, the least recently used
+    one is dropped when the limit is reached. `on_close` is called with True when
+    the result was read to the end and the connection can be reused.
+    """
+
+    def __init__(self, ttl: float = 300, max_open: int = 4):
+        self.ttl = ttl
+        self.max_open = max_open
+        self._cursors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, cursor, on_close: Callable[[bool], None]) -> str:
+        token = secrets.token_urlsafe(16)
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_expired(time.monotonic()))
+            while len(self._cursors) >= self.max_open:
+                _, entry = self._cursors.popitem(last=False)
+                logger.warning("Too many open result cursors, dropping the least recently used")
+                evicted.append(entry)
+            self._cursors[token] = _OpenCursor(cursor, on_close, time.monotonic() + self.ttl)
+        for entry in evicted:
+            self._close_entry(entry, exhausted=False)
+        return token
+
+    def fetch(self, token: str, page_size: int) -> Tuple[List[str], list, Optional[str]]:
+        """
+        Read the next page for `token`.
+        Returns the column names, the rows and the token for the next page, or None on the last page.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.reap()
+        with self._lock:
+            entry = self._cursors.get(token)
+            if entry is None:
+                raise ValueError("Unknown or expired continuation token")
+            self._cursors.move_to_end(token)
+        with entry.lock:
+            try:
+                rows = entry.lookahead + entry.cursor.fetchmany(
+                    page_size + 1 - len(entry.lookahead)
+                )
+            except Exception:
+                self.close(token, exhausted=False)
+                raise
+            entry.lookahead = rows[page_size:]
+            rows = rows[:page_size]
+            entry.expires_at = time.monotonic() + self.ttl
+        if not entry.lookahead:
+            self.close(token, exhausted=True)
+            return entry.columns, rows, None
+        return entry.columns, rows, token
+
+    def close(self, token: str, exhausted: bool = False) -> None:
+        with self._lock:
+            entry = self._cursors.pop(token, None)
+        if entry is not None:
+            self._close_entry(entry, exhausted)
+
+    def reap(self) -> None:
+        """Close every cursor whose TTL has passed."""
+        with self._lock:
+            expired = self._pop_expired(time.monotonic())
+        for entry in expired:
+            logger.info("Closing expired result cursor")
+            self._close_entry(entry, exhausted=False)
+
+    def _pop_expired(self, now: float) -> list:
+        expired = [token for token, entry in self._cursors.items() if entry.expires_at <= now]
+        return [self._cursors.pop(token) for token in expired]
+
+    @staticmethod
+    def _close_entry(entry: _OpenCursor, exhausted: bool) -> None:
+        try:
+            entry.on_close(exhausted)
+        except Exception as e:
+            logger.warning(f"Failed to close result cursor: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cursors)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+import re
+from typing import List, Optional
+
+from oceanbase_mcp.sql_utils import quote_identifier
+
+# Column types left out of the default projection, they make samples of wide tables huge.
+_WIDE_TYPE_RE = re.compile(r"blob|text|json|vector|binary|geometry|point|polygon", re.IGNORECASE)
+# Sample a few times more rows than needed, so LIMIT still has a random subset to pick from.
+_OVERSAMPLE = 3
+
+
+def choose_percent(rows: int, limit: int) -> float:
+    """
+    Pick a SAMPLE percentage expected to return about `limit` of the table's `rows` rows.
+    Tables that fit in `limit` are read whole, any larger table is sampled.
+    """
+    if rows <= limit:
+        return 100.0
+    percent = limit * _OVERSAMPLE * 100.0 / rows
+    if percent >= 100:
+        # Too few rows to oversample, sample about `limit` of them instead.
+        percent = limit * 100.0 / rows
+    # Stay below 100 once rounded to the 6 decimals of build_sample_sql.
+    return min(max(percent, 0.000001), 99.999999)
+
+
+def build_count_sql(table: str) -> str:
+    return f"SELECT COUNT(*) FROM {quote_identifier(table)}"
+
+
+def default_projection(columns: List[tuple], max_columns: int) -> List[str]:
+    """
+    Columns to sample when the caller did not choose any, given (name, type) pairs.
+    Wide types are skipped unless nothing else is left, and at most `max_columns` are kept.
+    """
+    narrow = [name for name, col_type in columns if not _WIDE_TYPE_RE.search(col_type)]
+    return (narrow or [name for name, _ in columns])[:max_columns]
+
+
+def build_sample_sql(
+    table: str, columns: Optional[List[str]], percent: float, limit: int, block: bool = False
+) -> str:
+    if not 0 < percent <= 100:
+        raise ValueError("percent must be in (0, 100]")
+    projection = ", ".join(quote_identifier(c) for c in columns) if columns else "*"
+    sql = f"SELECT {projection} FROM {quote_identifier(table)}"
+    if percent < 100:
+        # Percentages like 1e-05 must not be written in scientific notation.
+        sql += f" SAMPLE {'BLOCK ' if block else ''}({percent:.6f})"
+    return sql + f" LIMIT {int(limit)}"
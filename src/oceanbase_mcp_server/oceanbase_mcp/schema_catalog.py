@@ -0,0 +1,208 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from mysql.connector import Error
+from pydantic import BaseModel
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+
+class ColumnInfo(BaseModel):
+    name: str
+    type: str
+    nullable: str
+    key: str = ""
+    default: Optional[str] = None
+    extra: str = ""
+    comment: str = ""
+
+
+class IndexInfo(BaseModel):
+    name: str
+    unique: bool
+    columns: List[str]
+
+
+class TableInfo(BaseModel):
+    name: str
+    type: str
+    comment: str = ""
+    ddl_time: Optional[str] = None
+    estimated_rows: Optional[int] = None
+    columns: List[ColumnInfo] = []
+    indexes: List[IndexInfo] = []
+
+
+# OceanBase records the last DDL time of every object, plain MySQL only has CREATE_TIME.
+_PROBE_SQL_OB = """
+    SELECT t.TABLE_NAME, t.TABLE_TYPE, t.TABLE_COMMENT, MAX(o.LAST_DDL_TIME), t.TABLE_ROWS
+    FROM information_schema.TABLES t
+    LEFT JOIN oceanbase.DBA_OBJECTS o
+        ON o.OWNER = t.TABLE_SCHEMA AND o.OBJECT_NAME = t.TABLE_NAME
+        AND o.OBJECT_TYPE IN ('TABLE', 'VIEW')
+    WHERE t.TABLE_SCHEMA = %s
+    GROUP BY t.TABLE_NAME, t.TABLE_TYPE, t.TABLE_COMMENT, t.TABLE_ROWS
+"""
+_PROBE_SQL_FALLBACK = """
+    SELECT TABLE_NAME, TABLE_TYPE, TABLE_COMMENT, CREATE_TIME, TABLE_ROWS
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = %s
+"""
+_COLUMNS_SQL = """
+    SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT,
+        EXTRA, COLUMN_COMMENT
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = %s{table_filter}
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+"""
+_INDEXES_SQL = """
+    SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = %s{table_filter}
+    ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+"""
+# Above this many changed tables, reload the whole schema instead of filtering by name.
+_MAX_FILTERED_TABLES = 200
+
+
+class SchemaCatalog:
+    """
+    In-memory catalog of the tables, columns and indexes of one database.
+
+    The first access loads information_schema in bulk. Afterwards a single probe of
+    table DDL timestamps runs at most every `refresh_interval` seconds, and only tables
+    whose timestamp changed are reloaded. mark_stale() forces a full reload, call it
+    after DDL whose effect the timestamps might not show.
+    """
+
+    def __init__(self, pool, database: str, refresh_interval: float = 60):
+        self._pool = pool
+        self.database = database
+        self.refresh_interval = refresh_interval
+        self._tables: Dict[str, TableInfo] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._use_ob_probe = True
+        self._lock = threading.Lock()
+
+    def mark_stale(self) -> None:
+        self._stale = True
+
+    def tables(self) -> List[TableInfo]:
+        self._ensure_fresh()
+        return sorted(self._tables.values(), key=lambda table: table.name)
+
+    def table(self, name: str) -> Optional[TableInfo]:
+        self._ensure_fresh()
+        table = self._tables.get(name)
+        if table is None:
+            # Table names are case-insensitive on most OceanBase MySQL mode tenants.
+            matches = [t for t in self._tables.values() if t.name.lower() == name.lower()]
+            table = matches[0] if len(matches) == 1 else None
+        return table
+
+    def _is_fresh(self) -> bool:
+        return (
+            not self._stale
+            and self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.refresh_interval
+        )
+
+    def _ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+        with self._lock:
+            if not self._is_fresh():
+                self.refresh(full=self._stale)
+
+    def refresh(self, full: bool = False) -> None:
+        """Probe DDL timestamps and reload the tables that changed, or everything if `full`."""
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                current = self._probe(cursor)
+                if full:
+                    changed = list(current)
+                else:
+                    changed = [
+                        name
+                        for name, table in current.items()
+                        if name not in self._tables or self._tables[name].ddl_time != table.ddl_time
+                    ]
+                if changed:
+                    self._load_details(cursor, current, changed, full or not self._tables)
+        reloaded = set(changed)
+        for name, table in current.items():
+            if name not in reloaded:
+                table.columns = self._tables[name].columns
+                table.indexes = self._tables[name].indexes
+        logger.info(
+            f"Schema catalog of {self.database} refreshed, {len(changed)} of {len(current)} tables reloaded"
+        )
+        self._tables = current
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def _probe(self, cursor) -> Dict[str, TableInfo]:
+        if self._use_ob_probe:
+            try:
+                cursor.execute(_PROBE_SQL_OB, (self.database,))
+                return self._tables_from_rows(cursor.fetchall())
+            except Error as e:
+                logger.info(f"DBA_OBJECTS is not available, falling back to CREATE_TIME: {e}")
+                self._use_ob_probe = False
+        cursor.execute(_PROBE_SQL_FALLBACK, (self.database,))
+        return self._tables_from_rows(cursor.fetchall())
+
+    @staticmethod
+    def _tables_from_rows(rows) -> Dict[str, TableInfo]:
+        return {
+            name: TableInfo(
+                name=name,
+                type=table_type,
+                comment=comment or "",
+                ddl_time=str(ddl_time) if ddl_time is not None else None,
+                estimated_rows=estimated_rows,
+            )
+            for name, table_type, comment, ddl_time, estimated_rows in rows
+        }
+
+    def _load_details(
+        self, cursor, tables: Dict[str, TableInfo], names: List[str], all_tables: bool
+    ):
+        params = [self.database]
+        table_filter = ""
+        if not all_tables and len(names) <= _MAX_FILTERED_TABLES:
+            table_filter = " AND TABLE_NAME IN (" + ", ".join(["%s"] * len(names)) + ")"
+            params.extend(names)
+        wanted = set(names)
+        for table in tables.values():
+            if table.name in wanted:
+                table.columns = []
+                table.indexes = []
+
+        cursor.execute(_COLUMNS_SQL.format(table_filter=table_filter), params)
+        for table_name, name, col_type, nullable, key, default, extra, comment in cursor.fetchall():
+            if table_name in wanted and table_name in tables:
+                tables[table_name].columns.append(
+                    ColumnInfo(
+                        name=name,
+                        type=col_type,
+                        nullable=nullable,
+                        key=key or "",
+                        default=str(default) if default is not None else None,
+                        extra=extra or "",
+                        comment=comment or "",
+                    )
+                )
+
+        cursor.execute(_INDEXES_SQL.format(table_filter=table_filter), params)
+        for table_name, index_name, non_unique, column_name in cursor.fetchall():
+            if table_name not in wanted or table_name not in tables:
+                continue
+            indexes = tables[table_name].indexes
+            if not indexes or indexes[-1].name != index_name:
+                indexes.append(IndexInfo(name=index_name, unique=not int(non_unique), columns=[]))
+            indexes[-1].columns.append(column_name)
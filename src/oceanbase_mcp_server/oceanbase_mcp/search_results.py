@@ -0,0 +1,98 @@
+from __future__ import annotations
+import datetime
+import decimal
+import json
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from oceanbase_mcp.vector_codec import encode_vector, parse_vector
+
+try:
+    # orjson encodes large result sets several times faster, use it when installed.
+    import orjson
+except ImportError:
+    orjson = None
+
+SEARCH_OUTPUT_FORMATS = ("json", "jsonl")
+DISTANCE_COLUMN = "distance"
+
+
+def _default(value: Any):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON, non-ASCII text is kept as is."""
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def _vector_value(value: Any, encode: bool, dtype: str):
+    if value is None:
+        return None
+    vector = parse_vector(value)
+    if encode:
+        return encode_vector(vector, dtype)
+    return vector.tolist()
+
+
+def search_payload(
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    vector_columns: Sequence[str] = (),
+    exclude_columns: Optional[Sequence[str]] = None,
+    encode_vectors: bool = False,
+    vector_dtype: str = "float32",
+) -> dict:
+    """
+    Build {"columns": [...], "rows": [[...], ...]} from result rows in one pass. Column names
+    are listed once, excluded columns are dropped and vector columns are converted to lists
+    of floats, or to base64 with `encode_vectors`.
+    """
+    excluded = set(exclude_columns or ())
+    keep = [i for i, column in enumerate(columns) if column not in excluded]
+    vectors = {i for i in keep if columns[i] in vector_columns}
+    payload_rows: List[list] = []
+    for row in rows:
+        payload_rows.append(
+            [
+                _vector_value(row[i], encode_vectors, vector_dtype) if i in vectors else row[i]
+                for i in keep
+            ]
+        )
+    return {"columns": [columns[i] for i in keep], "rows": payload_rows}
+
+
+def check_output_format(output_format: str) -> None:
+    if output_format not in SEARCH_OUTPUT_FORMATS:
+        raise ValueError(
+            f"Unsupported output format: {output_format}, "
+            f"expected one of {list(SEARCH_OUTPUT_FORMATS)}"
+        )
+
+
+def format_search_results(payload: dict, output_format: str = "json") -> str:
+    """
+    Serialize a search payload as one JSON object, or as JSON Lines: the column names on the
+    first line and one row array per line after it.
+    """
+    check_output_format(output_format)
+    if output_format == "json":
+        return dumps(payload)
+    lines = [dumps({"columns": payload["columns"]})]
+    lines.extend(dumps(row) for row in payload["rows"])
+    return "\n".join(lines)
@@ -3,19 +3,48 @@ import logging
 import os
 import time
 from typing import Optional, List, Tuple
-from urllib import request, error
+from concurrent.futures import ThreadPoolExecutor, wait
 import json
 import argparse
+import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from mysql.connector import Error, connect
-from bs4 import BeautifulSoup
 import certifi
 import ssl
 from pydantic import BaseModel
-from pyobvector import ObVecClient, MatchAgainst, l2_distance, inner_product, cosine_distance
+from pyobvector import MatchAgainst, l2_distance, inner_product, cosine_distance
 from sqlalchemy import text
-import ast
+from sqlalchemy.exc import SQLAlchemyError
+import re
+import tempfile
+
+from oceanbase_mcp import ash_reports
+from oceanbase_mcp import bulk_load as bulk_load_files
+from oceanbase_mcp import doc_index, doc_text
+from oceanbase_mcp import explain
+from oceanbase_mcp import sampling
+from oceanbase_mcp import sql_audit
+from oceanbase_mcp.doc_cache import DocCache
+from oceanbase_mcp.ef_search import EfSearchStore, tune_ef_search
+from oceanbase_mcp.executor import BlockingCallExecutor
+from oceanbase_mcp import fusion
+from oceanbase_mcp.plan_cache import PlanBaselineStore, detect_regressions, load_plans
+from oceanbase_mcp.pool import OBConnectionPool
+from oceanbase_mcp.query_cache import DDL_PREFIXES, QueryResultCache, is_read_only, normalize_sql
+from oceanbase_mcp.result_cursors import ResultCursorStore
+from oceanbase_mcp.schema_catalog import SchemaCatalog
+from oceanbase_mcp.search_results import (
+    DISTANCE_COLUMN,
+    check_output_format,
+    dumps as dump_search_json,
+    format_search_results,
+    search_payload,
+)
+from oceanbase_mcp.session_context import SessionContextCache
+from oceanbase_mcp.vec_clients import ObVecClientRegistry
+from oceanbase_mcp.vector_codec import query_vector
+from oceanbase_mcp import vector_bench, vector_index
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +60,85 @@ ENABLE_MEMORY = int(os.getenv("ENABLE_MEMORY", 0))
 
 TABLE_NAME_MEMORY = os.getenv("TABLE_NAME_MEMORY", "ob_mcp_memory")
 
+# Connection pool shared by all SQL-issuing tools and resources.
+OB_POOL_SIZE = int(os.getenv("OB_POOL_SIZE", 5))
+OB_POOL_IDLE_TIMEOUT = float(os.getenv("OB_POOL_IDLE_TIMEOUT", 300))
+OB_POOL_ACQUIRE_TIMEOUT = float(os.getenv("OB_POOL_ACQUIRE_TIMEOUT", 30))
+
+# Server-held cursors used by paged execute_sql calls.
+OB_CURSOR_TTL = float(os.getenv("OB_CURSOR_TTL", 300))
+OB_CURSOR_MAX_OPEN = int(os.getenv("OB_CURSOR_MAX_OPEN", 2))
+
+# Cache of read-only execute_sql results, off unless OB_QUERY_CACHE_TTL is set above 0. Cached
+# results can be up to that many seconds older than writes made outside this server.
+OB_QUERY_CACHE_TTL = float(os.getenv("OB_QUERY_CACHE_TTL", 0))
+OB_QUERY_CACHE_MAX_BYTES = int(os.getenv("OB_QUERY_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+# Seconds between checks for DDL changes in the schema catalog.
+OB_SCHEMA_REFRESH_INTERVAL = float(os.getenv("OB_SCHEMA_REFRESH_INTERVAL", 60))
+
+# oceanbase://sample/{table} settings. OB_SAMPLE_PERCENT=0 picks the percentage from the table size.
+OB_SAMPLE_PERCENT = float(os.getenv("OB_SAMPLE_PERCENT", 0))
+OB_SAMPLE_BLOCK = bool(int(os.getenv("OB_SAMPLE_BLOCK", 0)))
+OB_SAMPLE_ROWS = int(os.getenv("OB_SAMPLE_ROWS", 100))
+OB_SAMPLE_MAX_COLUMNS = int(os.getenv("OB_SAMPLE_MAX_COLUMNS", 30))
+OB_SAMPLE_CACHE_TTL = float(os.getenv("OB_SAMPLE_CACHE_TTL", 600))
+
+# Seconds the tenant, version and privileges of the connection are cached.
+OB_SESSION_CONTEXT_TTL = float(os.getenv("OB_SESSION_CONTEXT_TTL", 600))
+
+# ASH reports run as background jobs, finished reports are also kept in OB_ASH_REPORT_DIR if set.
+OB_ASH_MAX_JOBS = int(os.getenv("OB_ASH_MAX_JOBS", 2))
+OB_ASH_MAX_REPORTS = int(os.getenv("OB_ASH_MAX_REPORTS", 32))
+OB_ASH_REPORT_DIR = os.getenv("OB_ASH_REPORT_DIR")
+# Seconds before ASH samples are visible to reports, reports of newer windows are not kept.
+OB_ASH_FLUSH_LAG = float(os.getenv("OB_ASH_FLUSH_LAG", 60))
+
+# Rows fetched per round trip when top_sql has to aggregate GV$OB_SQL_AUDIT in process.
+OB_SQL_AUDIT_BATCH_SIZE = int(os.getenv("OB_SQL_AUDIT_BATCH_SIZE", 10000))
+
+# Where inspect_plan_cache keeps the recorded baseline plans.
+OB_PLAN_BASELINE_PATH = os.getenv(
+    "OB_PLAN_BASELINE_PATH", os.path.join("~", ".oceanbase_mcp", "plan_baselines.json")
+)
+
+# Disk cache of search_oceanbase_document results, OB_DOC_CACHE_TTL=0 disables it.
+# With OB_DOC_OFFLINE=1 documents are only served from the cache, the API is never called.
+OB_DOC_CACHE_DIR = os.getenv("OB_DOC_CACHE_DIR", os.path.join("~", ".oceanbase_mcp", "doc_cache"))
+OB_DOC_CACHE_TTL = float(os.getenv("OB_DOC_CACHE_TTL", 86400))
+OB_DOC_CACHE_MAX_BYTES = int(os.getenv("OB_DOC_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+OB_DOC_OFFLINE = bool(int(os.getenv("OB_DOC_OFFLINE", 0)))
+
+# Documentation API requests: timeout of one request, number of documents fetched at the same
+# time, and how long search_oceanbase_document waits for them before returning what it has.
+OB_DOC_TIMEOUT = float(os.getenv("OB_DOC_TIMEOUT", 5))
+OB_DOC_FETCH_WORKERS = int(os.getenv("OB_DOC_FETCH_WORKERS", 5))
+OB_DOC_FETCH_DEADLINE = float(os.getenv("OB_DOC_FETCH_DEADLINE", 8))
+
+# Characters of content returned per document, chosen as the passages of about
+# OB_DOC_PASSAGE_CHARS characters that best match the search keyword.
+OB_DOC_CHAR_BUDGET = int(os.getenv("OB_DOC_CHAR_BUDGET", 4000))
+OB_DOC_PASSAGE_CHARS = int(os.getenv("OB_DOC_PASSAGE_CHARS", 600))
+
+# Local documentation index built with oceanbase_mcp_doc_index. When set, it is searched first
+# and the remote API is only called if OB_DOC_REMOTE_FALLBACK is 1 and nothing matched.
+OB_DOC_INDEX_DIR = os.getenv("OB_DOC_INDEX_DIR")
+OB_DOC_REMOTE_FALLBACK = bool(int(os.getenv("OB_DOC_REMOTE_FALLBACK", 1)))
+
+# Maximum number of query vectors per oceanbase_vector_search_batch call.
+OB_VECTOR_BATCH_MAX = int(os.getenv("OB_VECTOR_BATCH_MAX", 64))
+
+# Where tune_vector_ef_search keeps the ef_search chosen for each vector column.
+OB_EF_SEARCH_PATH = os.getenv(
+    "OB_EF_SEARCH_PATH", os.path.join("~", ".oceanbase_mcp", "ef_search.json")
+)
+
+# If set, bulk_load only reads files below this directory.
+OB_BULK_LOAD_DIR = os.getenv("OB_BULK_LOAD_DIR")
+
+# Maximum number of blocking tool calls (SQL, search, ASH) running at the same time.
+OB_MAX_CONCURRENT_CALLS = int(os.getenv("OB_MAX_CONCURRENT_CALLS", OB_POOL_SIZE))
+
 logger.info(
     f" ENABLE_MEMORY: {ENABLE_MEMORY},EMBEDDING_MODEL_NAME: {EMBEDDING_MODEL_NAME}, EMBEDDING_MODEL_PROVIDER: {EMBEDDING_MODEL_PROVIDER}"
 )
@@ -59,108 +167,633 @@ db_conn_info = OBConnection(
     database=os.getenv("OB_DATABASE"),
 )
 
+db_pool = OBConnectionPool(
+    db_conn_info.model_dump(),
+    size=OB_POOL_SIZE,
+    idle_timeout=OB_POOL_IDLE_TIMEOUT,
+    acquire_timeout=OB_POOL_ACQUIRE_TIMEOUT,
+)
+
+# ObVecClients (SQLAlchemy engines) shared by the search and memory tools.
+vec_clients = ObVecClientRegistry(pool_size=OB_POOL_SIZE, pool_pre_ping=True)
+
+# Runs the searches of oceanbase_vector_search_batch and oceanbase_fused_search, bounded like
+# the ObVecClient engine pool.
+vector_search_executor = ThreadPoolExecutor(
+    max_workers=OB_POOL_SIZE, thread_name_prefix="ob_vector"
+)
+
+result_cursors = ResultCursorStore(ttl=OB_CURSOR_TTL, max_open=OB_CURSOR_MAX_OPEN)
+
+query_cache = QueryResultCache(ttl=OB_QUERY_CACHE_TTL, max_bytes=OB_QUERY_CACHE_MAX_BYTES)
+
+sample_cache = QueryResultCache(ttl=OB_SAMPLE_CACHE_TTL, max_bytes=OB_QUERY_CACHE_MAX_BYTES)
+
+schema_catalog = SchemaCatalog(
+    db_pool, db_conn_info.database, refresh_interval=OB_SCHEMA_REFRESH_INTERVAL
+)
+
+plan_baselines = PlanBaselineStore(OB_PLAN_BASELINE_PATH)
+
+ef_search_settings = EfSearchStore(OB_EF_SEARCH_PATH)
+
+local_doc_index = doc_index.open_index(OB_DOC_INDEX_DIR)
+
+doc_cache = DocCache(OB_DOC_CACHE_DIR, ttl=OB_DOC_CACHE_TTL, max_bytes=OB_DOC_CACHE_MAX_BYTES)
+
+# One session context per connection profile, shared by every tool that gates on the tenant.
+session_context = SessionContextCache(db_pool, ttl=OB_SESSION_CONTEXT_TTL)
+
+_DESCRIBE_RE = re.compile(
+    r"^(?P<verb>DESCRIBE|DESC|SHOW\s+COLUMNS\s+(?:FROM|IN))\s+"
+    r"(?:(?P<database>`[^`]+`|\w+)\s*\.\s*)?(?P<table>`[^`]+`|\w+)$",
+    re.IGNORECASE,
+)
+
 # Initialize server
 app = FastMCP("oceanbase_mcp_server")
 
+blocking_executor = BlockingCallExecutor(max_workers=OB_MAX_CONCURRENT_CALLS)
+
+
+def blocking_tool(*args, **kwargs):
+    """
+    Like app.tool(), but the tool runs on the blocking executor instead of the event loop.
+    The plain function is returned so other tools can still call it directly.
+    """
+
+    def decorator(fn):
+        app.add_tool(blocking_executor.wrap(fn), *args, **kwargs)
+        return fn
 
-@app.resource("oceanbase://sample/{table}", description="table sample")
+    return decorator
+
+
+def blocking_resource(uri: str, **kwargs):
+    """Like app.resource(), but the resource is read on the blocking executor."""
+
+    def decorator(fn):
+        app.resource(uri, **kwargs)(blocking_executor.wrap(fn))
+        return fn
+
+    return decorator
+
+
+def _sample_table(
+    table: str,
+    columns: Optional[list[str]] = None,
+    percent: Optional[float] = None,
+    limit: int = OB_SAMPLE_ROWS,
+    block: bool = OB_SAMPLE_BLOCK,
+) -> str:
+    """Sample random rows of `table` with the SAMPLE clause, cached per table for OB_SAMPLE_CACHE_TTL."""
+    table_info = schema_catalog.table(table)
+    if table_info is not None:
+        table = table_info.name
+        if not columns:
+            columns = sampling.default_projection(
+                [(col.name, col.type) for col in table_info.columns], OB_SAMPLE_MAX_COLUMNS
+            )
+    if percent is None:
+        percent = OB_SAMPLE_PERCENT or sampling.choose_percent(
+            (table_info and table_info.estimated_rows) or _count_rows(table), limit
+        )
+    sql = sampling.build_sample_sql(table, columns, percent, limit, block)
+    cached = sample_cache.get(sql)
+    if cached is not None:
+        return cached
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+    result = [",".join(map(str, row)) for row in rows]
+    output = "\n".join([",".join(columns)] + result)
+    sample_cache.put(sql, output)
+    return output
+
+
+def _count_rows(table: str) -> int:
+    """COUNT(*) of a table whose statistics have no row count, cached like the samples."""
+    sql = sampling.build_count_sql(table)
+    cached = sample_cache.get(sql)
+    if cached is not None:
+        return int(cached)
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            count = int(cursor.fetchall()[0][0])
+    sample_cache.put(sql, str(count))
+    return count
+
+
+@blocking_resource("oceanbase://sample/{table}", description="table sample")
 def table_sample(table: str) -> str:
     try:
-        with connect(**db_conn_info.model_dump()) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT * FROM `%s` LIMIT 100", params=(table,))
-                columns = [desc[0] for desc in cursor.description]
-                rows = cursor.fetchall()
-                result = [",".join(map(str, row)) for row in rows]
-                return "\n".join([",".join(columns)] + result)
-
+        return _sample_table(table)
     except Error:
         return f"Failed to sample table: {table}"
 
 
-@app.resource("oceanbase://tables", description="list all tables")
+@blocking_tool()
+def sample_table(
+    table_name: str,
+    columns: Optional[list[str]] = None,
+    percent: Optional[float] = None,
+    limit: int = 100,
+    block: bool = False,
+) -> str:
+    """
+    Get a random sample of rows from a table using OceanBase's SAMPLE clause.
+    Samples are cached per table for a while, so repeated calls are cheap.
+
+    Args:
+        table_name: Name of the table to sample.
+        columns: Columns to return. Defaults to the table's columns without large text, blob, json
+            and vector columns.
+        percent: Percentage of rows to sample, in (0, 100]. Chosen from the estimated table size
+            if not given, tables of at most limit rows are returned whole.
+        limit: Maximum number of rows to return.
+        block: Sample whole data blocks (SAMPLE BLOCK), faster on very large tables but less random.
+    """
+    logger.info(f"Calling tool: sample_table  with arguments: {table_name}, {columns}, {percent}")
+    try:
+        return _sample_table(table_name, columns, percent, limit, block)
+    except Error as e:
+        logger.error(f"Failed to sample table {table_name}: {e}")
+        return f"Failed to sample table: {table_name}, {str(e)}"
+
+
+@blocking_resource("oceanbase://tables", description="list all tables")
 def list_tables() -> str:
     """List OceanBase tables as resources."""
     try:
-        with connect(**db_conn_info.model_dump()) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SHOW TABLES")
+        tables = schema_catalog.tables()
+        logger.info(f"Found tables: {[table.name for table in tables]}")
+        resp_header = "Tables of this table: \n"
+        result = [f"Tables_in_{db_conn_info.database}"] + [table.name for table in tables]
+        return resp_header + "\n".join(result)
+    except Error as e:
+        logger.error(f"Failed to list tables: {str(e)}")
+        return "Failed to list tables"
+
+
+@blocking_resource("oceanbase://schema/{table}", description="table columns and indexes")
+def table_schema(table: str) -> str:
+    """Get the columns and indexes of a table as JSON."""
+    try:
+        table_info = schema_catalog.table(table)
+    except Error as e:
+        logger.error(f"Failed to load schema of table {table}: {str(e)}")
+        return f"Failed to load schema of table: {table}"
+    if table_info is None:
+        return f"Table not found: {table}"
+    return table_info.model_dump_json()
+
+
+def _describe_from_catalog(sql: str) -> Optional[str]:
+    """Answer a plain DESCRIBE/SHOW COLUMNS from the schema catalog, None if it does not apply."""
+    match = _DESCRIBE_RE.match(normalize_sql(sql))
+    if not match:
+        return None
+    database, table = match.group("database"), match.group("table")
+    if database and database.strip("`") != db_conn_info.database:
+        return None
+    table_info = schema_catalog.table(table.strip("`"))
+    if table_info is None:
+        # Let the server produce its usual error message.
+        return None
+    if match.group("verb").upper().startswith("SHOW"):
+        resp_header = "Columns info of this table: \n"
+    else:
+        resp_header = "Description of this table: \n"
+    result = [
+        ",".join(map(str, [col.name, col.type, col.nullable, col.key, col.default, col.extra]))
+        for col in table_info.columns
+    ]
+    return resp_header + "\n".join(["Field,Type,Null,Key,Default,Extra"] + result)
+
+
+def _invalidate_caches(sql: str) -> None:
+    """Drop cached results and metadata that a successfully executed write may have made stale."""
+    query_cache.invalidate_statement(sql)
+    sample_cache.invalidate_statement(sql)
+    if sql.strip().upper().startswith(DDL_PREFIXES):
+        # Table definitions may have changed, reflect them again on next use.
+        vec_clients.forget_tables()
+        schema_catalog.mark_stale()
+    elif sql.strip().upper().startswith(("GRANT", "REVOKE", "SET ROLE", "SET DEFAULT ROLE")):
+        session_context.mark_stale()
+
+
+def _format_page(columns: list, rows: list, continuation_token: Optional[str]) -> str:
+    result = [",".join(map(str, row)) for row in rows]
+    output = "\n".join([",".join(columns)] + result)
+    if continuation_token:
+        output += (
+            f"\n[More rows available. Call fetch_sql_page with continuation_token="
+            f"'{continuation_token}' to get the next page, the token expires after "
+            f"{int(OB_CURSOR_TTL)}s without use.]"
+        )
+    return output
+
+
+def _execute_sql_paged(sql: str, page_size: int) -> str:
+    """Run a SELECT on an unbuffered cursor and return its first page."""
+    conn = db_pool.acquire()
+    try:
+        cursor = conn.cursor(buffered=False)
+        cursor.execute(sql)
+    except BaseException:
+        db_pool.release(conn, discard=not conn.is_connected())
+        raise
+
+    def on_close(exhausted: bool):
+        if exhausted:
+            cursor.close()
+            db_pool.release(conn)
+        else:
+            # Draining the rest of an abandoned result could take as long as the full query,
+            # drop the connection instead.
+            conn.shutdown()
+            db_pool.release(conn, discard=True)
+
+    token = result_cursors.open(cursor, on_close)
+    columns, rows, token = result_cursors.fetch(token, page_size)
+    return _format_page(columns, rows, token)
+
+
+def _run_sql(sql: str):
+    """Execute `sql` on a pooled connection and format its result."""
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+
+            # Special handling for SHOW TABLES
+            if sql.strip().upper().startswith("SHOW TABLES"):
                 tables = cursor.fetchall()
-                logger.info(f"Found tables: {tables}")
-                resp_header = "Tables of this table: \n"
+                result = [f"Tables in {db_conn_info.database}: "]  # Header
+                result.extend([table[0] for table in tables])
+                return "\n".join(result)
+
+            elif sql.strip().upper().startswith("SHOW COLUMNS"):
+                resp_header = "Columns info of this table: \n"
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
+                result = [",".join(map(str, row)) for row in rows]
+                return resp_header + ("\n".join([",".join(columns)] + result))
+
+            elif sql.strip().upper().startswith("DESCRIBE"):
+                resp_header = "Description of this table: \n"
                 columns = [desc[0] for desc in cursor.description]
                 rows = cursor.fetchall()
                 result = [",".join(map(str, row)) for row in rows]
                 return resp_header + ("\n".join([",".join(columns)] + result))
-    except Error as e:
-        logger.error(f"Failed to list tables: {str(e)}")
-        return "Failed to list tables"
 
+            # Regular SELECT queries
+            elif sql.strip().upper().startswith("SELECT"):
+                columns = [desc[0] for desc in cursor.description]
+                rows = cursor.fetchall()
+                result = [",".join(map(str, row)) for row in rows]
+                return "\n".join([",".join(columns)] + result)
 
-@app.tool()
-def execute_sql(sql: str) -> str:
-    """Execute an SQL on the OceanBase server."""
+            # Regular SHOW queries
+            elif sql.strip().upper().startswith("SHOW"):
+                rows = cursor.fetchall()
+                return "\n".join(",".join(map(str, row)) for row in rows)
+            # process procedural invoke
+            elif sql.strip().upper().startswith("CALL"):
+                rows = cursor.fetchall()
+                if not rows:
+                    return "No result return."
+                # the first column contains the report text
+                return ",".join(map(str, rows[0]))
+            # Non-SELECT queries
+            else:
+                conn.commit()
+                return f"Sql executed successfully. Rows affected: {cursor.rowcount}"
+
+
+@blocking_tool()
+def execute_sql(sql: str, page_size: Optional[int] = None) -> str:
+    """
+    Execute an SQL on the OceanBase server.
+
+    Args:
+        sql: The SQL statement to execute.
+        page_size: Only for SELECT. Stream the result in pages of this many rows instead of
+            returning all rows at once. If more rows are available, the page ends with a
+            continuation token to pass to fetch_sql_page.
+    """
     logger.info(f"Calling tool: execute_sql  with arguments: {sql}")
+    if page_size is not None and page_size < 1:
+        return "Error executing sql: page_size must be at least 1"
 
+    # Give back the connections held by abandoned paged results.
+    result_cursors.reap()
     try:
-        with connect(**db_conn_info.model_dump()) as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(sql)
-
-                # Special handling for SHOW TABLES
-                if sql.strip().upper().startswith("SHOW TABLES"):
-                    tables = cursor.fetchall()
-                    result = [f"Tables in {db_conn_info.database}: "]  # Header
-                    result.extend([table[0] for table in tables])
-                    return "\n".join(result)
-
-                elif sql.strip().upper().startswith("SHOW COLUMNS"):
-                    resp_header = "Columns info of this table: \n"
-                    columns = [desc[0] for desc in cursor.description]
-                    rows = cursor.fetchall()
-                    result = [",".join(map(str, row)) for row in rows]
-                    return resp_header + ("\n".join([",".join(columns)] + result))
-
-                elif sql.strip().upper().startswith("DESCRIBE"):
-                    resp_header = "Description of this table: \n"
-                    columns = [desc[0] for desc in cursor.description]
-                    rows = cursor.fetchall()
-                    result = [",".join(map(str, row)) for row in rows]
-                    return resp_header + ("\n".join([",".join(columns)] + result))
-
-                # Regular SELECT queries
-                elif sql.strip().upper().startswith("SELECT"):
-                    columns = [desc[0] for desc in cursor.description]
-                    rows = cursor.fetchall()
-                    result = [",".join(map(str, row)) for row in rows]
-                    return "\n".join([",".join(columns)] + result)
-
-                # Regular SHOW queries
-                elif sql.strip().upper().startswith("SHOW"):
-                    rows = cursor.fetchall()
-                    return rows
-                # process procedural invoke
-                elif sql.strip().upper().startswith("CALL"):
-                    rows = cursor.fetchall()
-                    if not rows:
-                        return "No result return."
-                    # the first column contains the report text
-                    return rows[0]
-                # Non-SELECT queries
-                else:
-                    conn.commit()
-                    return f"Sql executed successfully. Rows affected: {cursor.rowcount}"
+        if page_size is not None and sql.strip().upper().startswith("SELECT"):
+            return _execute_sql_paged(sql, page_size)
+        described = _describe_from_catalog(sql)
+        if described is not None:
+            return described
+        cached = query_cache.get(sql)
+        if cached is not None:
+            logger.info("execute_sql served from the query cache")
+            return cached
+        result = _run_sql(sql)
 
     except Error as e:
         logger.error(f"Error executing SQL '{sql}': {e}")
         return f"Error executing sql: {str(e)}"
 
+    if is_read_only(sql):
+        query_cache.put(sql, result)
+    else:
+        _invalidate_caches(sql)
+    return result
+
+
+@blocking_tool()
+def execute_sql_batch(
+    statements: list[str],
+    params: Optional[list[Optional[list]]] = None,
+    transaction: bool = True,
+    stop_on_error: bool = True,
+    max_rows: int = 100,
+) -> str:
+    """
+    Execute several SQL statements on one connection and return per-statement results and timings.
+    Prefer this over many execute_sql calls when running a sequence of small statements.
+
+    Args:
+        statements: SQL statements to execute in order.
+        params: Optional parameters for each statement, matched by position. Use %s placeholders
+            in the statement and null for statements without parameters.
+        transaction: Run all statements in one transaction that is committed at the end and rolled
+            back on the first error. If false, every statement is committed on its own.
+        stop_on_error: Only when transaction is false. Skip the remaining statements after an error.
+        max_rows: Maximum number of rows returned for each statement that produces a result set.
+    """
+    logger.info(f"Calling tool: execute_sql_batch  with {len(statements)} statements")
+    if params is not None and len(params) != len(statements):
+        raise ValueError("params must have one entry per statement")
+    params = params or [None] * len(statements)
+    results = [{"index": i, "status": "skipped"} for i in range(len(statements))]
+    pending_writes = []
+    rolled_back = False
+    batch_start = time.perf_counter()
+    result_cursors.reap()
+    try:
+        with db_pool.connection() as conn:
+            conn.autocommit = not transaction
+            try:
+                for i, (sql, sql_params) in enumerate(zip(statements, params)):
+                    results[i] = _execute_batch_statement(conn, i, sql, sql_params, max_rows)
+                    if results[i]["status"] == "error":
+                        if transaction or stop_on_error:
+                            break
+                    elif not is_read_only(sql):
+                        pending_writes.append(sql)
+                if transaction:
+                    if any(result["status"] == "error" for result in results):
+                        conn.rollback()
+                        rolled_back = True
+                    else:
+                        conn.commit()
+            finally:
+                conn.autocommit = False
+    except Error as e:
+        logger.error(f"Error executing SQL batch: {e}")
+        return f"Error executing sql batch: {str(e)}"
+
+    if not rolled_back:
+        for sql in pending_writes:
+            _invalidate_caches(sql)
+    return json.dumps(
+        {
+            "transaction": transaction,
+            "rolled_back": rolled_back,
+            "elapsed_ms": round((time.perf_counter() - batch_start) * 1000, 3),
+            "results": results,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _execute_batch_statement(conn, index: int, sql: str, sql_params, max_rows: int) -> dict:
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, sql_params)
+            result = {"index": index, "status": "ok"}
+            if cursor.with_rows:
+                rows = cursor.fetchall()
+                result["columns"] = [desc[0] for desc in cursor.description]
+                result["rows"] = [list(map(str, row)) for row in rows[:max_rows]]
+                result["truncated"] = len(rows) > max_rows
+            else:
+                result["rows_affected"] = cursor.rowcount
+    except Error as e:
+        logger.error(f"Error executing SQL '{sql}' in batch: {e}")
+        result = {"index": index, "status": "error", "error": str(e)}
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+@blocking_tool()
+def bulk_load(
+    file_path: str,
+    table_name: str,
+    file_format: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+    batch_size: int = 1000,
+    method: str = "executemany",
+    start_row: int = 0,
+    delimiter: Optional[str] = None,
+    has_header: bool = True,
+) -> str:
+    """
+    Load a local CSV, JSON Lines or Parquet file into an OceanBase table in batches.
+    Use this instead of generating INSERT statements for more than a few rows.
+    Every batch is committed on its own. If a batch fails, the result contains resume_from_row,
+    call the tool again with start_row set to it to continue after the last committed batch.
+
+    Args:
+        file_path: Path of the file on the machine running this server.
+        table_name: Target table, it must already exist.
+        file_format: csv, jsonl or parquet. Detected from the file extension if not given.
+        columns: Target columns in file order. Defaults to the CSV header, the keys of the first
+            JSON object or the Parquet schema.
+        batch_size: Number of rows per batch.
+        method: executemany sends multi-row INSERT statements, load_data sends every batch with
+            LOAD DATA LOCAL INFILE, which is faster but needs local_infile enabled on the server.
+        start_row: Number of data rows to skip, used to resume a failed load.
+        delimiter: Field delimiter of CSV files, a tab for .tsv files and a comma otherwise.
+        has_header: Whether the first row of a CSV file is a header. Empty CSV fields are loaded as NULL.
+    """
+    logger.info(
+        f"Calling tool: bulk_load  with arguments: {file_path}, {table_name}, {file_format}, {method}"
+    )
+    file_path = os.path.realpath(file_path)
+    if OB_BULK_LOAD_DIR and os.path.commonpath(
+        [file_path, os.path.realpath(OB_BULK_LOAD_DIR)]
+    ) != os.path.realpath(OB_BULK_LOAD_DIR):
+        raise ValueError(f"bulk_load can only read files below {OB_BULK_LOAD_DIR}")
+    if method not in ("executemany", "load_data"):
+        raise ValueError("method must be executemany or load_data")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    file_format = file_format or bulk_load_files.detect_format(file_path)
+    columns, batches = bulk_load_files.read_batches(
+        file_path,
+        file_format,
+        batch_size,
+        columns=columns,
+        start_row=start_row,
+        delimiter=delimiter,
+        has_header=has_header,
+    )
+
+    summary = {
+        "table": table_name,
+        "file": file_path,
+        "format": file_format,
+        "method": method,
+        "start_row": start_row,
+        "rows_loaded": 0,
+        "batches": 0,
+    }
+    start = time.perf_counter()
+    try:
+        if method == "executemany":
+            _bulk_load_executemany(table_name, columns, batches, summary)
+        else:
+            _bulk_load_load_data(table_name, columns, batches, summary)
+        summary["status"] = "completed"
+    except (Error, ValueError, TypeError) as e:
+        # ValueError and TypeError come from a malformed row in the file, the rows before it
+        # are committed like on a database error.
+        logger.error(f"bulk_load into {table_name} failed after {summary['rows_loaded']} rows: {e}")
+        summary["status"] = "failed"
+        summary["error"] = str(e)
+        summary["resume_from_row"] = start_row + summary["rows_loaded"]
+    elapsed = time.perf_counter() - start
+    summary["elapsed_s"] = round(elapsed, 3)
+    summary["rows_per_second"] = round(summary["rows_loaded"] / elapsed, 1) if elapsed else 0.0
+    if summary["rows_loaded"]:
+        query_cache.invalidate_tables({table_name})
+        sample_cache.invalidate_tables({table_name})
+    return json.dumps(summary, ensure_ascii=False)
+
+
+def _bulk_load_executemany(table_name: str, columns: list, batches, summary: dict) -> None:
+    sql = bulk_load_files.insert_sql(table_name, columns)
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            for batch in batches:
+                try:
+                    # mysql-connector rewrites this into one multi-row INSERT per batch.
+                    cursor.executemany(sql, batch)
+                    conn.commit()
+                except Error:
+                    conn.rollback()
+                    raise
+                summary["rows_loaded"] += len(batch)
+                summary["batches"] += 1
+
+
+def _bulk_load_load_data(table_name: str, columns: list, batches, summary: dict) -> None:
+    with tempfile.TemporaryDirectory(prefix="oceanbase_mcp_load_") as chunk_dir:
+        chunk_path = os.path.join(chunk_dir, "chunk.csv")
+        # A dedicated connection, LOAD DATA LOCAL is only allowed from the chunk directory.
+        with connect(**db_conn_info.model_dump(), allow_local_infile_in_path=chunk_dir) as conn:
+            with conn.cursor() as cursor:
+                for batch in batches:
+                    with open(chunk_path, "w", encoding="utf-8", newline="") as chunk:
+                        bulk_load_files.write_csv_chunk(batch, chunk)
+                    try:
+                        cursor.execute(
+                            bulk_load_files.load_data_sql(table_name, columns, chunk_path)
+                        )
+                        conn.commit()
+                    except Error:
+                        conn.rollback()
+                        raise
+                    summary["rows_loaded"] += len(batch)
+                    summary["batches"] += 1
+
+
+@blocking_tool()
+def fetch_sql_page(continuation_token: str, page_size: int = 100) -> str:
+    """
+    Fetch the next page of a result streamed by execute_sql with page_size.
+
+    Args:
+        continuation_token: The token returned at the end of the previous page.
+        page_size: Maximum number of rows to return.
+    """
+    logger.info("Calling tool: fetch_sql_page")
+    try:
+        columns, rows, token = result_cursors.fetch(continuation_token, page_size)
+        return _format_page(columns, rows, token)
+    except Error as e:
+        logger.error(f"Error fetching page: {e}")
+        return f"Error fetching page: {str(e)}"
+
 
 @app.tool()
+def get_query_cache_stats() -> str:
+    """
+    Get the hit, miss, eviction and invalidation counters of the execute_sql result cache.
+    """
+    logger.info("Calling tool: get_query_cache_stats")
+    return json.dumps(query_cache.stats())
+
+
+def _run_ash_report(start_time: str, end_time: str, tenant_id: Optional[str]) -> str:
+    with db_pool.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "CALL DBMS_WORKLOAD_REPOSITORY.ASH_REPORT(%s, %s, NULL, NULL, NULL, 'TEXT', NULL, NULL, %s)",
+                (start_time, end_time, tenant_id),
+            )
+            rows = cursor.fetchall()
+    return "\n".join(str(row[0]) for row in rows if row and row[0] is not None)
+
+
+ash_jobs = ash_reports.AshReportJobs(
+    _run_ash_report,
+    ash_reports.AshReportStore(OB_ASH_REPORT_DIR, max_reports=OB_ASH_MAX_REPORTS),
+    max_workers=OB_ASH_MAX_JOBS,
+    flush_lag=OB_ASH_FLUSH_LAG,
+)
+
+
+def _ash_job_status(job: ash_reports.AshReportJob) -> str:
+    status = job.model_dump(exclude={"submitted_at", "started_at", "finished_at"})
+    status["elapsed_seconds"] = round((job.finished_at or time.time()) - job.submitted_at, 1)
+    report = ash_jobs.report(job) if job.status == "done" else None
+    if report is not None:
+        status["sections"] = {title: len(rows) for title, rows in report.tables.items()}
+    return json.dumps(status)
+
+
+def _cached_ash_report(start_time: str, end_time: str, tenant_id: Optional[str]):
+    report = ash_jobs.store.get(ash_reports.report_key(start_time, end_time, tenant_id))
+    if report is None:
+        raise ValueError(
+            f"No ASH report for {start_time} - {end_time}, generate it with get_ob_ash_report first"
+        )
+    return report
+
+
+@blocking_tool()
 def get_ob_ash_report(
     start_time: str,
     end_time: str,
     tenant_id: Optional[str] = None,
+    wait_seconds: float = 30,
 ) -> str:
     """
     Get OceanBase Active Session History report.
@@ -170,29 +803,257 @@ def get_ob_ash_report(
         Wait time and wait parameters
         The module where the SESSION is located during sampling (PARSE, EXECUTE, PL, etc.)
         SESSION status records, such as SESSION MODULE, ACTION, CLIENT ID
-    This will be very useful when you perform performance analysis.RetryClaude can make mistakes. Please double-check responses.
+    This will be very useful when you perform performance analysis.
+
+    The report is generated in the background. If it is not ready within `wait_seconds`, the job
+    status is returned instead, poll it with get_ash_report_job. Finished reports are cached by
+    tenant and time window, use get_ash_report_section and compare_ash_reports to read them.
 
     Args:
         start_time: Sample Start Time,Format: yyyy-MM-dd HH:mm:ss.
         end_time: Sample End Time,Format: yyyy-MM-dd HH:mm:ss.
         tenant_id: Used to specify the tenant ID for generating the ASH Report. Leaving this field blank or setting it to NULL indicates no restriction on the TENANT_ID.
+        wait_seconds: How long to wait for the report before returning the job status, 0 returns at once.
     """
     logger.info(
         f"Calling tool: get_ob_ash_report  with arguments: {start_time}, {end_time}, {tenant_id}"
     )
-    if tenant_id is None:
-        tenant_id = "NULL"
-    # Construct the SQL query
-    sql_query = f"""
-        CALL DBMS_WORKLOAD_REPOSITORY.ASH_REPORT('{start_time}','{end_time}', NULL, NULL, NULL, 'TEXT', NULL, NULL, {tenant_id});
+    job = ash_jobs.wait(ash_jobs.submit(start_time, end_time, tenant_id).job_id, wait_seconds)
+    if job.status == "failed":
+        return f"Error get ASH report,{job.error}"
+    report = ash_jobs.report(job) if job.status == "done" else None
+    if report is None:
+        return _ash_job_status(job)
+    return report.text
+
+
+@app.tool()
+def get_ash_report_job(job_id: str) -> str:
+    """
+    Get the status and estimated progress of an ASH report job started by get_ob_ash_report.
+
+    Args:
+        job_id: The job_id returned by get_ob_ash_report.
+    """
+    logger.info(f"Calling tool: get_ash_report_job  with arguments: {job_id}")
+    return _ash_job_status(ash_jobs.get(job_id))
+
+
+@app.tool()
+def get_ash_report_section(
+    start_time: str,
+    end_time: str,
+    section: str = "top_sql",
+    tenant_id: Optional[str] = None,
+    limit: int = 20,
+) -> str:
+    """
+    Get one section of a cached ASH report as JSON rows.
+
+    Args:
+        start_time: Start time of the report window, as passed to get_ob_ash_report.
+        end_time: End time of the report window, as passed to get_ob_ash_report.
+        section: top_sql, top_wait_events, top_sessions, or the title of any table in the report.
+        tenant_id: Tenant ID the report was generated for.
+        limit: Maximum number of rows to return.
+    """
+    logger.info(
+        f"Calling tool: get_ash_report_section  with arguments: {start_time}, {end_time}, {section}"
+    )
+    report = _cached_ash_report(start_time, end_time, tenant_id)
+    rows = report.sections.get(section)
+    if rows is None:
+        rows = report.tables.get(section)
+    if rows is None:
+        raise ValueError(
+            f"Unknown section {section}, expected one of {list(report.sections) + list(report.tables)}"
+        )
+    return json.dumps({"section": section, "rows": rows[:limit], "total_rows": len(rows)})
+
+
+@app.tool()
+def compare_ash_reports(
+    base_start_time: str,
+    base_end_time: str,
+    target_start_time: str,
+    target_end_time: str,
+    section: str = "top_wait_events",
+    tenant_id: Optional[str] = None,
+) -> str:
+    """
+    Compare one section of two cached ASH reports, for example a slow window against a normal one.
+    Rows are matched by SQL ID, event name or session ID, numeric columns are returned as
+    target minus base.
+
+    Args:
+        base_start_time: Start time of the baseline window.
+        base_end_time: End time of the baseline window.
+        target_start_time: Start time of the window to compare.
+        target_end_time: End time of the window to compare.
+        section: top_sql, top_wait_events or top_sessions.
+        tenant_id: Tenant ID both reports were generated for.
+    """
+    logger.info(
+        f"Calling tool: compare_ash_reports  with arguments: {base_start_time}, {base_end_time}, "
+        f"{target_start_time}, {target_end_time}, {section}"
+    )
+    if section not in ash_reports.SECTION_TITLES:
+        raise ValueError(
+            f"Unknown section {section}, expected one of {list(ash_reports.SECTION_TITLES)}"
+        )
+    base = _cached_ash_report(base_start_time, base_end_time, tenant_id)
+    target = _cached_ash_report(target_start_time, target_end_time, tenant_id)
+    return json.dumps(ash_reports.compare_section(base.sections[section], target.sections[section]))
+
+
+@blocking_tool()
+def top_sql(
+    order_by: str = "elapsed",
+    limit: int = 10,
+    minutes: float = 30,
+    tenant_id: Optional[int] = None,
+    database: Optional[str] = None,
+    include_inner_sql: bool = False,
+) -> str:
+    """
+    Find the most expensive SQL statements of a recent time window from GV$OB_SQL_AUDIT.
+    Returns one JSON entry per SQL_ID with executions, total and average elapsed time, CPU time,
+    logical reads, retries and p50/p95/p99 elapsed time, all times in microseconds.
+    Prefer this tool to querying GV$OB_SQL_AUDIT with execute_sql, the view can hold millions of rows.
+
+    Args:
+        order_by: Rank statements by total elapsed, cpu, logical_reads or retries.
+        limit: Number of statements to return.
+        minutes: Length of the time window, ending now.
+        tenant_id: Only include requests of this tenant, only useful in the sys tenant.
+        database: Only include requests run in this database.
+        include_inner_sql: Include SQL issued internally by OceanBase.
+    """
+    logger.info(f"Calling tool: top_sql  with arguments: {order_by}, {limit}, {minutes}")
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                entries = sql_audit.top_sql(
+                    cursor,
+                    order_by=order_by,
+                    limit=limit,
+                    minutes=minutes,
+                    tenant_id=tenant_id,
+                    database=database,
+                    include_inner_sql=include_inner_sql,
+                    batch_size=OB_SQL_AUDIT_BATCH_SIZE,
+                )
+        return json.dumps([entry.model_dump() for entry in entries])
+    except Error as e:
+        logger.error(f"Error reading GV$OB_SQL_AUDIT: {e}")
+        return f"Error executing query: {str(e)}"
+
+
+@blocking_tool()
+def explain_sql(
+    sql: str,
+    compare_sql: Optional[str] = None,
+    explain_format: str = "extended",
+) -> str:
+    """
+    Explain a query and return its plan as a JSON operator tree with estimated rows, cost,
+    table access paths (full_scan, range_scan, get), indexes and partitions, plus a summary
+    listing the full table scans.
+    Pass compare_sql to explain a rewrite of the same query as well and get a diff of the two
+    plans: cost difference, operators only in one plan and tables whose access path changed.
+
+    Args:
+        sql: The statement to explain, without EXPLAIN.
+        compare_sql: An alternative statement to compare with.
+        explain_format: extended (EXPLAIN EXTENDED), basic (EXPLAIN) or json (EXPLAIN FORMAT=JSON).
     """
+    logger.info(f"Calling tool: explain_sql  with arguments: {sql}, {compare_sql}")
     try:
-        result = execute_sql(sql_query)
-        logger.info(f"ASH report result: {result}")
-        return result
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                plan = explain.explain(cursor, sql, explain_format)
+                other = (
+                    explain.explain(cursor, compare_sql, explain_format) if compare_sql else None
+                )
     except Error as e:
-        logger.error(f"Error get ASH report,executing SQL '{sql_query}': {e}")
-        return f"Error get ASH report,{str(e)}"
+        logger.error(f"Error explaining SQL: {e}")
+        return f"Error executing query: {str(e)}"
+    result = {"plan": plan.model_dump(exclude_none=True), "summary": explain.summarize(plan)}
+    if other is not None:
+        result["compare_plan"] = other.model_dump(exclude_none=True)
+        result["diff"] = explain.diff_plans(plan, other)
+    return json.dumps(result)
+
+
+def _baseline_profile() -> str:
+    return f"{db_conn_info.user}@{db_conn_info.host}:{db_conn_info.port}"
+
+
+@blocking_tool()
+def inspect_plan_cache(
+    sql_id: Optional[str] = None,
+    table: Optional[str] = None,
+    tenant_id: Optional[int] = None,
+    limit: int = 20,
+    with_operators: bool = True,
+    regression_threshold: float = 1.5,
+) -> str:
+    """
+    Show the cached execution plans of a statement or table from GV$OB_PLAN_CACHE_PLAN_STAT,
+    with their hit ratio, average execution time and plan operators.
+    Plans whose statement is now `regression_threshold` times slower than its fastest plan
+    recorded with record_plan_baseline are listed under "regressions", "plan_changed" tells
+    whether the plan flipped.
+
+    Args:
+        sql_id: Only show plans of this SQL_ID.
+        table: Only show plans whose statement mentions this table name.
+        tenant_id: Only show plans of this tenant, only useful in the sys tenant.
+        limit: Maximum number of plans to return, most expensive first.
+        with_operators: Also read the plan operators from GV$OB_PLAN_CACHE_PLAN_EXPLAIN.
+        regression_threshold: Slowdown factor reported as a regression.
+    """
+    logger.info(f"Calling tool: inspect_plan_cache  with arguments: {sql_id}, {table}, {tenant_id}")
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                plans = load_plans(cursor, sql_id, table, tenant_id, limit, with_operators)
+    except Error as e:
+        logger.error(f"Error reading the plan cache: {e}")
+        return f"Error executing query: {str(e)}"
+    regressions = detect_regressions(
+        plans, plan_baselines, _baseline_profile(), regression_threshold
+    )
+    return json.dumps(
+        {
+            "plans": [plan.model_dump() for plan in plans],
+            "regressions": [regression.model_dump() for regression in regressions],
+        }
+    )
+
+
+@blocking_tool()
+def record_plan_baseline(sql_id: str, tenant_id: Optional[int] = None) -> str:
+    """
+    Record the currently cached plans of a statement as its known-good baseline.
+    inspect_plan_cache compares later plans of the statement against the fastest recorded one.
+
+    Args:
+        sql_id: SQL_ID of the statement.
+        tenant_id: Only record plans of this tenant, only useful in the sys tenant.
+    """
+    logger.info(f"Calling tool: record_plan_baseline  with arguments: {sql_id}, {tenant_id}")
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                plans = load_plans(cursor, sql_id=sql_id, tenant_id=tenant_id, limit=100)
+    except Error as e:
+        logger.error(f"Error reading the plan cache: {e}")
+        return f"Error executing query: {str(e)}"
+    if not plans:
+        return f"No cached plan found for SQL_ID {sql_id}"
+    count = plan_baselines.record(_baseline_profile(), plans)
+    return f"Recorded {count} baseline plan(s) for SQL_ID {sql_id}"
 
 
 @app.tool(name="get_current_time", description="Get current time")
@@ -203,23 +1064,36 @@ def get_current_time() -> str:
     return formatted_time
 
 
-@app.tool()
+@blocking_tool()
 def get_current_tenant() -> str:
     """
     Get the current tenant name from oceanbase.
     """
     logger.info("Calling tool: get_current_tenant")
-    sql_query = "show tenant"
     try:
-        result = ast.literal_eval(execute_sql(sql_query))
-        logger.info(f"Current tenant: {result}")
-        return result[0][0]
+        tenant = session_context.get().tenant_name
+        logger.info(f"Current tenant: {tenant}")
+        return tenant
     except Error as e:
-        logger.error(f"Error executing SQL '{sql_query}': {e}")
+        logger.error(f"Error loading session context: {e}")
         return f"Error executing query: {str(e)}"
 
 
-@app.tool()
+@blocking_tool()
+def get_session_context() -> str:
+    """
+    Get the tenant name, tenant id, compatibility mode, OceanBase version, user and privileges
+    of the current connection.
+    """
+    logger.info("Calling tool: get_session_context")
+    try:
+        return session_context.get().model_dump_json()
+    except Error as e:
+        logger.error(f"Error loading session context: {e}")
+        return f"Error executing query: {str(e)}"
+
+
+@blocking_tool()
 def get_all_server_nodes():
     """
     Get all server nodes from oceanbase.
@@ -238,7 +1112,7 @@ def get_all_server_nodes():
         return f"Error executing query: {str(e)}"
 
 
-@app.tool()
+@blocking_tool()
 def get_resource_capacity():
     """
     Get resource capacity from oceanbase.
@@ -256,7 +1130,111 @@ def get_resource_capacity():
         return f"Error executing query: {str(e)}"
 
 
-@app.tool()
+_DOC_SEARCH_URL = (
+    "https://cn-wan-api.oceanbase.com/wanApi/forum/docCenter/productDocFile/v3/searchDocList"
+)
+_DOC_DETAILS_URL = (
+    "https://cn-wan-api.oceanbase.com/wanApi/forum/docCenter/productDocFile/v4/docDetails"
+)
+_DOC_API_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+    "Origin": "https://www.oceanbase.com",
+    "Referer": "https://www.oceanbase.com/",
+}
+
+
+# One keep-alive client for all documentation API calls. The SSL context uses certifi to fix
+# HTTPS errors and is built once instead of on every request.
+doc_http_client = httpx.Client(
+    headers=_DOC_API_HEADERS,
+    timeout=OB_DOC_TIMEOUT,
+    verify=ssl.create_default_context(cafile=certifi.where()),
+    limits=httpx.Limits(max_connections=OB_DOC_FETCH_WORKERS + 1, keepalive_expiry=60),
+)
+
+# Fetches document details concurrently, see search_oceanbase_document.
+doc_fetch_executor = ThreadPoolExecutor(
+    max_workers=OB_DOC_FETCH_WORKERS, thread_name_prefix="ob_doc"
+)
+
+
+def _post_doc_api(url: str, payload: dict):
+    """POST to the documentation API and return the data field of the response."""
+    response = doc_http_client.post(url, json=payload)
+    response.raise_for_status()
+    # In the results, we mainly need the content in the data field.
+    return response.json()["data"]
+
+
+def _cached_doc_api(namespace: str, key: str, fetch):
+    """
+    Return fetch() through the documentation cache. Expired entries are still served when the
+    API is unreachable, and are the only source in offline mode, where None means not cached.
+    """
+    cached = doc_cache.get(namespace, key)
+    if cached is not None:
+        return cached
+    if OB_DOC_OFFLINE:
+        return doc_cache.get(namespace, key, allow_stale=True)
+    try:
+        value = fetch()
+    except httpx.HTTPError as e:
+        stale = doc_cache.get(namespace, key, allow_stale=True)
+        if stale is None:
+            raise
+        logger.warning(f"Documentation API unavailable, serving cached {namespace} {key}: {e}")
+        return stale
+    doc_cache.put(namespace, key, value)
+    return value
+
+
+def _search_doc_list(keyword: str) -> list:
+    qeury_param = {
+        "pageNo": 1,
+        "pageSize": 5,  # Search for 5 results at a time.
+        "query": keyword,
+    }
+    data_array = _post_doc_api(_DOC_SEARCH_URL, qeury_param)
+    return [{"id": item["id"], "urlCode": item["urlCode"]} for item in data_array]
+
+
+def _fetch_doc(doc_url: str, doc_id: str) -> dict:
+    data = _post_doc_api(_DOC_DETAILS_URL, {"id": doc_id, "url": doc_url})
+    # The docContent field has HTML text.
+    text = doc_text.html_to_text(data["docContent"])
+    # Reorganize the final result. The tdkInfo field should include the document's title, description, and keywords.
+    tdkInfo = data["tdkInfo"]
+    return {
+        "title": tdkInfo["title"],
+        "description": tdkInfo["description"],
+        "keyword": tdkInfo["keyword"],
+        "content": text,
+        "oceanbase_version": data["version"],
+        "content_updatetime": data["docGmtModified"],
+    }
+
+
+def _search_local_docs(keyword: str, limit: int = 5) -> list:
+    results = []
+    for doc_id, score in local_doc_index.search(keyword, limit):
+        doc = local_doc_index.document(doc_id)
+        content = doc_text.select_passages(
+            doc["content"], keyword, OB_DOC_CHAR_BUDGET, OB_DOC_PASSAGE_CHARS
+        )
+        results.append(
+            {
+                "title": doc["title"],
+                "source": doc["path"],
+                "score": round(score, 3),
+                "content": content,
+            }
+        )
+    return results
+
+
+@blocking_tool()
 def search_oceanbase_document(keyword: str) -> str:
     """
     This tool is designed to provide context-specific information about OceanBase to a large language model (LLM) to enhance the accuracy and relevance of its responses.
@@ -267,104 +1245,68 @@ def search_oceanbase_document(keyword: str) -> str:
     This tool ensures that when the LLM’s internal documentation is insufficient to generate high-quality responses, it dynamically retrieves necessary OceanBase information, thereby maintaining a high level of response accuracy and expertise.
     """
     logger.info(f"Calling tool: search_oceanbase_document,keyword:{keyword}")
-    search_api_url = (
-        "https://cn-wan-api.oceanbase.com/wanApi/forum/docCenter/productDocFile/v3/searchDocList"
-    )
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json",
-        "Origin": "https://www.oceanbase.com",
-        "Referer": "https://www.oceanbase.com/",
-    }
-    qeury_param = {
-        "pageNo": 1,
-        "pageSize": 5,  # Search for 5 results at a time.
-        "query": keyword,
-    }
-    # Turn the dictionary into a JSON string, then change it to bytes
-    qeury_param = json.dumps(qeury_param).encode("utf-8")
-    req = request.Request(search_api_url, data=qeury_param, headers=headers, method="POST")
-    # Create an SSL context using certifi to fix HTTPS errors.
-    context = ssl.create_default_context(cafile=certifi.where())
+    if local_doc_index is not None:
+        local_results = _search_local_docs(keyword)
+        if local_results:
+            return json.dumps(local_results, ensure_ascii=False)
+        if not OB_DOC_REMOTE_FALLBACK:
+            return "No results were found"
     try:
-        with request.urlopen(req, timeout=5, context=context) as response:
-            response_body = response.read().decode("utf-8")
-            json_data = json.loads(response_body)
-            # In the results, we mainly need the content in the data field.
-            data_array = json_data["data"]  # Parse JSON response
-            result_list = []
-            for item in data_array:
-                doc_url = "https://www.oceanbase.com/docs/" + item["urlCode"] + "-" + item["id"]
-                logger.info(f"doc_url:${doc_url}")
-                content = get_ob_doc_content(doc_url, item["id"])
-                result_list.append(content)
-            return json.dumps(result_list, ensure_ascii=False)
-    except error.HTTPError as e:
-        logger.error(f"HTTP Error: {e.code} - {e.reason}")
+        cache_key = " ".join(keyword.lower().split())
+        items = _cached_doc_api("search", cache_key, lambda: _search_doc_list(keyword))
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP Error: {e.response.status_code} - {e.response.reason_phrase}")
         return "No results were found"
-    except error.URLError as e:
-        logger.error(f"URL Error: {e.reason}")
+    except httpx.HTTPError as e:
+        logger.error(f"URL Error: {e}")
         return "No results were found"
-
-
-def get_ob_doc_content(doc_url: str, doc_id: str) -> dict:
-    doc_param = {"id": doc_id, "url": doc_url}
-    doc_param = json.dumps(doc_param).encode("utf-8")
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/json",
-        "Origin": "https://www.oceanbase.com",
-        "Referer": "https://www.oceanbase.com/",
-    }
-    doc_api_url = (
-        "https://cn-wan-api.oceanbase.com/wanApi/forum/docCenter/productDocFile/v4/docDetails"
-    )
-    req = request.Request(doc_api_url, data=doc_param, headers=headers, method="POST")
-    # Make an SSL context with certifi to fix HTTPS errors.
-    context = ssl.create_default_context(cafile=certifi.where())
+    if items is None:
+        return "No results were found"
+    doc_urls = [
+        "https://www.oceanbase.com/docs/" + item["urlCode"] + "-" + item["id"] for item in items
+    ]
+    futures = [
+        doc_fetch_executor.submit(get_ob_doc_content, doc_url, item["id"], keyword)
+        for doc_url, item in zip(doc_urls, items)
+    ]
+    # A slow document must not hold up the others. It keeps loading in the background and
+    # lands in the cache for the next search.
+    wait(futures, timeout=OB_DOC_FETCH_DEADLINE)
+    result_list = []
+    for doc_url, future in zip(doc_urls, futures):
+        if future.done():
+            result_list.append(future.result())
+        else:
+            logger.warning(f"Document {doc_url} was not fetched within {OB_DOC_FETCH_DEADLINE}s")
+            result_list.append({"result": "Document not loaded in time", "url": doc_url})
+    return json.dumps(result_list, ensure_ascii=False)
+
+
+def get_ob_doc_content(doc_url: str, doc_id: str, keyword: Optional[str] = None) -> dict:
+    """
+    Get a document with its content cut to OB_DOC_CHAR_BUDGET characters. If a keyword is
+    given, the content is made of the passages that match it best instead of the beginning.
+    """
     try:
-        with request.urlopen(req, timeout=5, context=context) as response:
-            response_body = response.read().decode("utf-8")
-            json_data = json.loads(response_body)
-            # In the results, we mainly need the content in the data field.
-            data = json_data["data"]
-            # The docContent field has HTML text.
-            soup = BeautifulSoup(data["docContent"], "html.parser")
-            # Remove script, style, nav, header, and footer elements.
-            for element in soup(["script", "style", "nav", "header", "footer"]):
-                element.decompose()
-            # Remove HTML tags and keep only the text.
-            text = soup.get_text()
-            # Remove spaces at the beginning and end of each line.
-            lines = (line.strip() for line in text.splitlines())
-            # Remove empty lines.
-            text = "\n".join(line for line in lines if line)
-            logger.info(f"text length:{len(text)}")
-            # If the text is too long, only keep the first 8000 characters.
-            if len(text) > 8000:
-                text = text[:8000] + "... [content truncated]"
-            # Reorganize the final result. The tdkInfo field should include the document's title, description, and keywords.
-            tdkInfo = data["tdkInfo"]
-            final_result = {
-                "title": tdkInfo["title"],
-                "description": tdkInfo["description"],
-                "keyword": tdkInfo["keyword"],
-                "content": text,
-                "oceanbase_version": data["version"],
-                "content_updatetime": data["docGmtModified"],
-            }
-            return final_result
-    except error.HTTPError as e:
-        logger.error(f"HTTP Error: {e.code} - {e.reason}")
+        doc = _cached_doc_api("doc", str(doc_id), lambda: _fetch_doc(doc_url, doc_id))
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP Error: {e.response.status_code} - {e.response.reason_phrase}")
         return {"result": "No results were found"}
-    except error.URLError as e:
-        logger.error(f"URL Error: {e.reason}")
+    except httpx.HTTPError as e:
+        logger.error(f"URL Error: {e}")
         return {"result": "No results were found"}
+    if doc is None:
+        return {"result": "No results were found"}
+    text = doc["content"]
+    logger.info(f"text length:{len(text)}")
+    if keyword:
+        text = doc_text.select_passages(text, keyword, OB_DOC_CHAR_BUDGET, OB_DOC_PASSAGE_CHARS)
+    elif len(text) > OB_DOC_CHAR_BUDGET:
+        text = text[:OB_DOC_CHAR_BUDGET] + "... [content truncated]"
+    return dict(doc, content=text)
 
 
-@app.tool()
+@blocking_tool()
 def oceanbase_text_search(
     table_name: str,
     full_text_search_column_name: list[str],
@@ -372,9 +1314,12 @@ def oceanbase_text_search(
     other_where_clause: Optional[list[str]] = None,
     limit: int = 5,
     output_column_name: Optional[list[str]] = None,
+    exclude_columns: Optional[list[str]] = None,
+    output_format: str = "json",
 ) -> str:
     """
     Search for documents using full text search in an OceanBase table.
+    Returns {"columns": [...], "rows": [[...], ...]} with the column names listed once.
 
     Args:
         table_name: Name of the table to search.
@@ -383,17 +1328,14 @@ def oceanbase_text_search(
         other_where_clause: Other WHERE condition query statements except full-text search.
         limit: Maximum number of results to return.
         output_column_name: columns to include in results.
+        exclude_columns: Columns to leave out of the results, for example large text or vector columns.
+        output_format: json for one JSON object, jsonl for the column names on the first line and one row per line.
     """
     logger.info(
         f"Calling tool: oceanbase_text_search  with arguments: {table_name}, {full_text_search_column_name}, {full_text_search_expr}"
     )
-    config = db_conn_info.model_dump()
-    client = ObVecClient(
-        uri=config["host"] + ":" + str(config["port"]),
-        user=config["user"],
-        password=config.get("password", ""),
-        db_name=config.get("database", ""),
-    )
+    check_output_format(output_format)
+    client = vec_clients.get(db_conn_info, table_name)
     where_clause = [MatchAgainst(full_text_search_expr, *full_text_search_column_name)]
     for item in other_where_clause or []:
         where_clause.append(text(item))
@@ -404,137 +1346,602 @@ def oceanbase_text_search(
         output_column_name=output_column_name,
         n_limits=limit,
     )
-    output = f"Search results for '{full_text_search_expr}'"
-    if other_where_clause:
-        output += " and " + ",".join(other_where_clause)
-    output += f" in table '{table_name}':\n\n"
-    for result in results:
-        output += str(result) + "\n\n"
-    return output
+    payload = search_payload(list(results.keys()), results, exclude_columns=exclude_columns)
+    return format_search_results(payload, output_format)
 
 
-@app.tool()
+def _distance_function(name: Optional[str]):
+    match (name or "l2").lower():
+        case "l2":
+            return l2_distance
+        case "inner product":
+            return inner_product
+        case "cosine":
+            return cosine_distance
+        case _:
+            raise ValueError("Unkown distance function")
+
+
+def _vector_search_payload(
+    results, vec_column_name, with_distance, exclude_columns, encode_vectors, vector_dtype
+) -> dict:
+    columns = list(results.keys())
+    if with_distance:
+        # ann_search appends the distance last, named after an expression holding the query vector.
+        columns[-1] = DISTANCE_COLUMN
+    return search_payload(
+        columns,
+        results,
+        vector_columns=[vec_column_name],
+        exclude_columns=exclude_columns,
+        encode_vectors=encode_vectors,
+        vector_dtype=vector_dtype,
+    )
+
+
+def _ef_search_session(table_name: str, vec_column_name: str, ef_search: Optional[int] = None):
+    """Search with `ef_search`, else with the value tune_vector_ef_search chose for the column."""
+    if ef_search is None:
+        setting = ef_search_settings.get(_baseline_profile(), table_name, vec_column_name)
+        ef_search = setting.ef_search if setting else None
+    return vec_clients.session_variables(ob_hnsw_ef_search=ef_search)
+
+
+@blocking_tool()
 def oceabase_vector_search(
     table_name: str,
-    vector_data: list[float],
+    vector_data: list[float] | str,
     vec_column_name: str = "vector",
     distance_func: Optional[str] = "l2",
     with_distance: Optional[bool] = True,
     topk: int = 5,
     output_column_name: Optional[list[str]] = None,
+    vector_dtype: str = "float32",
+    encode_vectors: bool = False,
+    exclude_columns: Optional[list[str]] = None,
+    output_format: str = "json",
+    ef_search: Optional[int] = None,
 ) -> str:
     """
     Perform vector similarity search on an OceanBase table.
+    Returns {"columns": [...], "rows": [[...], ...]}, the distance column is named distance.
 
     Args:
         table_name: Name of the table to search.
-        vector_data: Query vector.
+        vector_data: Query vector, as a list of floats or as base64 of little-endian floats.
         vec_column_name: column name containing vectors to search.
         distance_func: The index distance algorithm used when comparing the distance between two vectors.
         with_distance: Whether to output distance data.
         topk: Number of results returned.
         output_column_name: Returned table fields.
+        vector_dtype: Float type of base64 vectors, float32 or float16.
+        encode_vectors: Whether to return vector columns as base64 of vector_dtype instead of lists.
+        exclude_columns: Columns to leave out of the results, for example the vector column or distance.
+        output_format: json for one JSON object, jsonl for the column names on the first line and one row per line.
+        ef_search: ob_hnsw_ef_search of this search, by default the value tuned for the column, if any.
     """
     logger.info(
         f"Calling tool: oceabase_vector_search  with arguments: {table_name}, {vector_data[:10]}, {vec_column_name}"
     )
-    config = db_conn_info.model_dump()
-    client = ObVecClient(
-        uri=config["host"] + ":" + str(config["port"]),
-        user=config["user"],
-        password=config.get("password", ""),
-        db_name=config.get("database", ""),
-    )
-    match distance_func:
-        case "l2":
-            search_distance_func = l2_distance
-        case "inner product":
-            search_distance_func = inner_product
-        case "cosine":
-            search_distance_func = cosine_distance
-        case _:
-            raise ValueError("Unkown distance function")
-
-    results = client.ann_search(
-        table_name=table_name,
-        vec_data=vector_data,
-        vec_column_name=vec_column_name,
-        distance_func=search_distance_func,
-        with_dist=with_distance,
-        topk=topk,
-        output_column_names=output_column_name,
+    check_output_format(output_format)
+    client = vec_clients.get(db_conn_info, table_name)
+    search_distance_func = _distance_function(distance_func)
+    with _ef_search_session(table_name, vec_column_name, ef_search):
+        results = client.ann_search(
+            table_name=table_name,
+            vec_data=query_vector(vector_data, vector_dtype),
+            vec_column_name=vec_column_name,
+            distance_func=search_distance_func,
+            with_dist=with_distance,
+            topk=topk,
+            output_column_names=output_column_name,
+        )
+    payload = _vector_search_payload(
+        results, vec_column_name, with_distance, exclude_columns, encode_vectors, vector_dtype
     )
-    output = f"Vector search results for '{table_name}:\n\n'"
-    for result in results:
-        output += str(result) + "\n\n"
-    return output
+    return format_search_results(payload, output_format)
 
 
-@app.tool()
+@blocking_tool()
 def oceanbase_hybrid_search(
     table_name: str,
-    vector_data: list[float],
+    vector_data: list[float] | str,
     vec_column_name: str = "vector",
     distance_func: Optional[str] = "l2",
     with_distance: Optional[bool] = True,
     filter_expr: Optional[list[str]] = None,
     topk: int = 5,
     output_column_name: Optional[list[str]] = None,
+    vector_dtype: str = "float32",
+    encode_vectors: bool = False,
+    exclude_columns: Optional[list[str]] = None,
+    output_format: str = "json",
+    ef_search: Optional[int] = None,
 ) -> str:
     """
     Perform hybird search combining relational condition filtering(that is, scalar) and vector search.
+    Returns {"columns": [...], "rows": [[...], ...]}, the distance column is named distance.
 
     Args:
         table_name: Name of the table to search.
-        vector_data: Query vector.
+        vector_data: Query vector, as a list of floats or as base64 of little-endian floats.
         vec_column_name: column name containing vectors to search.
         distance_func: The index distance algorithm used when comparing the distance between two vectors.
         with_distance: Whether to output distance data.
         filter_expr: Scalar conditions requiring filtering in where clause.
         topk: Number of results returned.
         output_column_name: Returned table fields,unless explicitly requested, please do not provide.
+        vector_dtype: Float type of base64 vectors, float32 or float16.
+        encode_vectors: Whether to return vector columns as base64 of vector_dtype instead of lists.
+        exclude_columns: Columns to leave out of the results, for example the vector column or distance.
+        output_format: json for one JSON object, jsonl for the column names on the first line and one row per line.
+        ef_search: ob_hnsw_ef_search of this search, by default the value tuned for the column, if any.
     """
     logger.info(
         f"""Calling tool: oceanbase_hybrid_search  with arguments: {table_name}, {vector_data[:10]}, {vec_column_name}
         ,{filter_expr}"""
     )
-    config = db_conn_info.model_dump()
-    client = ObVecClient(
-        uri=config["host"] + ":" + str(config["port"]),
-        user=config["user"],
-        password=config.get("password", ""),
-        db_name=config.get("database", ""),
-    )
-    match distance_func.lower():
-        case "l2":
-            search_distance_func = l2_distance
-        case "inner product":
-            search_distance_func = inner_product
-        case "cosine":
-            search_distance_func = cosine_distance
-        case _:
-            raise ValueError("Unkown distance function")
+    check_output_format(output_format)
+    client = vec_clients.get(db_conn_info, table_name)
+    search_distance_func = _distance_function(distance_func)
     where_clause = []
     for item in filter_expr or []:
         where_clause.append(text(item))
-    results = client.ann_search(
-        table_name=table_name,
-        vec_data=vector_data,
-        vec_column_name=vec_column_name,
-        distance_func=search_distance_func,
-        with_dist=with_distance,
-        where_clause=where_clause,
+    with _ef_search_session(table_name, vec_column_name, ef_search):
+        results = client.ann_search(
+            table_name=table_name,
+            vec_data=query_vector(vector_data, vector_dtype),
+            vec_column_name=vec_column_name,
+            distance_func=search_distance_func,
+            with_dist=with_distance,
+            where_clause=where_clause,
+            topk=topk,
+            output_column_names=output_column_name,
+        )
+    payload = _vector_search_payload(
+        results, vec_column_name, with_distance, exclude_columns, encode_vectors, vector_dtype
+    )
+    return format_search_results(payload, output_format)
+
+
+@blocking_tool()
+def oceanbase_vector_search_batch(
+    table_name: str,
+    vectors: list[list[float] | str],
+    vec_column_name: str = "vector",
+    distance_func: Optional[str] = "l2",
+    with_distance: Optional[bool] = True,
+    filter_expr: Optional[list[str]] = None,
+    topk: int = 5,
+    output_column_name: Optional[list[str]] = None,
+    vector_dtype: str = "float32",
+    encode_vectors: bool = False,
+    exclude_columns: Optional[list[str]] = None,
+    output_format: str = "json",
+    ef_search: Optional[int] = None,
+) -> str:
+    """
+    Perform several vector similarity searches on an OceanBase table in one call.
+    The searches run concurrently, so N query vectors take about as long as one.
+    Returns {"queries": [...]} with the {"columns": [...], "rows": [...]} or {"error": ...} of each
+    query vector, in the order the vectors were given. With jsonl, one line per query vector.
+
+    Args:
+        table_name: Name of the table to search.
+        vectors: Query vectors, each a list of floats or base64 of little-endian floats.
+        vec_column_name: column name containing vectors to search.
+        distance_func: The index distance algorithm used when comparing the distance between two vectors.
+        with_distance: Whether to output distance data.
+        filter_expr: Scalar conditions requiring filtering in where clause, applied to every query.
+        topk: Number of results returned per query vector.
+        output_column_name: Returned table fields.
+        vector_dtype: Float type of base64 vectors, float32 or float16.
+        encode_vectors: Whether to return vector columns as base64 of vector_dtype instead of lists.
+        exclude_columns: Columns to leave out of the results, for example the vector column or distance.
+        output_format: json for one JSON object, jsonl for the column names on the first line and one row per line.
+        ef_search: ob_hnsw_ef_search of every search, by default the value tuned for the column, if any.
+    """
+    logger.info(
+        f"Calling tool: oceanbase_vector_search_batch  with arguments: {table_name}, {len(vectors)} vectors, {vec_column_name}"
+    )
+    if not vectors:
+        raise ValueError("vectors must not be empty")
+    if len(vectors) > OB_VECTOR_BATCH_MAX:
+        raise ValueError(f"At most {OB_VECTOR_BATCH_MAX} query vectors are allowed per call")
+    # Decode every vector first, so that a malformed one fails the call before any search runs.
+    vectors = [query_vector(vector, vector_dtype) for vector in vectors]
+    check_output_format(output_format)
+    client = vec_clients.get(db_conn_info, table_name)
+    search_distance_func = _distance_function(distance_func)
+
+    def search(vector):
+        with _ef_search_session(table_name, vec_column_name, ef_search):
+            return client.ann_search(
+                table_name=table_name,
+                vec_data=vector,
+                vec_column_name=vec_column_name,
+                distance_func=search_distance_func,
+                with_dist=with_distance,
+                where_clause=[text(item) for item in filter_expr or []],
+                topk=topk,
+                output_column_names=output_column_name,
+            )
+
+    futures = [vector_search_executor.submit(search, vector) for vector in vectors]
+    queries = []
+    for i, future in enumerate(futures):
+        try:
+            queries.append(
+                _vector_search_payload(
+                    future.result(),
+                    vec_column_name,
+                    with_distance,
+                    exclude_columns,
+                    encode_vectors,
+                    vector_dtype,
+                )
+            )
+        except Exception as e:
+            logger.error(f"Vector search {i} on {table_name} failed: {e}")
+            queries.append({"error": str(e)})
+    if output_format == "jsonl":
+        return "\n".join(dump_search_json({"query": i, **query}) for i, query in enumerate(queries))
+    return dump_search_json({"queries": queries})
+
+
+@blocking_tool()
+def oceanbase_fused_search(
+    table_name: str,
+    query_text: str,
+    vector_data: list[float] | str,
+    full_text_search_column_name: list[str],
+    vec_column_name: str = "vector",
+    id_column_name: str = "id",
+    distance_func: Optional[str] = "l2",
+    filter_expr: Optional[list[str]] = None,
+    topk: int = 5,
+    candidates: int = 20,
+    fusion_method: str = "rrf",
+    text_weight: float = 0.5,
+    rrf_k: int = 60,
+    output_column_name: Optional[list[str]] = None,
+    vector_dtype: str = "float32",
+    encode_vectors: bool = False,
+    exclude_columns: Optional[list[str]] = None,
+    output_format: str = "json",
+    ef_search: Optional[int] = None,
+) -> str:
+    """
+    Hybrid retrieval on one OceanBase table: runs a full text search and a vector similarity
+    search concurrently and merges them into one top-k without duplicate rows. Prefer this over
+    calling oceanbase_text_search and oceabase_vector_search and merging the results.
+    Returns {"columns": [...], "rows": [[...], ...]}, each row followed by its fused score,
+    text_rank, vector_rank, text_score and distance (null when a search did not find the row).
+
+    Args:
+        table_name: Name of the table to search.
+        query_text: Keywords or phrases for the full text search.
+        vector_data: Query vector, as a list of floats or as base64 of little-endian floats.
+        full_text_search_column_name: Columns with a full text index to search.
+        vec_column_name: column name containing vectors to search.
+        id_column_name: Column identifying a row, used to merge the hits of both searches.
+        distance_func: The index distance algorithm used when comparing the distance between two vectors.
+        filter_expr: Scalar conditions requiring filtering in where clause, applied to both searches.
+        topk: Number of results returned.
+        candidates: Number of hits fetched from each search before fusion, at least topk.
+        fusion_method: rrf for reciprocal rank fusion, weighted for normalized scores weighted by text_weight.
+        text_weight: Weight of the full text search between 0 and 1, the vector search gets 1 - text_weight.
+        rrf_k: Rank constant of reciprocal rank fusion, larger values flatten the ranks.
+        output_column_name: Returned table fields, id_column_name is always included.
+        vector_dtype: Float type of base64 vectors, float32 or float16.
+        encode_vectors: Whether to return vector columns as base64 of vector_dtype instead of lists.
+        exclude_columns: Columns to leave out of the results, for example the vector column.
+        output_format: json for one JSON object, jsonl for the column names on the first line and one row per line.
+        ef_search: ob_hnsw_ef_search of the vector search, by default the value tuned for the column, if any.
+    """
+    logger.info(
+        f"Calling tool: oceanbase_fused_search  with arguments: {table_name}, {query_text}, {vec_column_name}, {fusion_method}"
+    )
+    if fusion_method not in fusion.FUSION_METHODS:
+        raise ValueError(
+            f"Unsupported fusion method: {fusion_method}, expected one of {list(fusion.FUSION_METHODS)}"
+        )
+    check_output_format(output_format)
+    vector = query_vector(vector_data, vector_dtype)
+    search_distance_func = _distance_function(distance_func)
+    if output_column_name and id_column_name not in output_column_name:
+        output_column_name = [id_column_name] + list(output_column_name)
+    candidates = max(candidates, topk)
+
+    def text_search():
+        sql = fusion.text_search_sql(
+            table_name, full_text_search_column_name, output_column_name, filter_expr
+        )
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, (query_text, query_text, candidates))
+                columns = [desc[0] for desc in cursor.description][:-1]
+                return columns, cursor.fetchall()
+
+    def vector_search():
+        client = vec_clients.get(db_conn_info, table_name)
+        with _ef_search_session(table_name, vec_column_name, ef_search):
+            results = client.ann_search(
+                table_name=table_name,
+                vec_data=vector,
+                vec_column_name=vec_column_name,
+                distance_func=search_distance_func,
+                with_dist=True,
+                where_clause=[text(item) for item in filter_expr or []],
+                topk=candidates,
+                output_column_names=output_column_name,
+            )
+        return list(results.keys())[:-1], list(results)
+
+    text_future = vector_search_executor.submit(text_search)
+    vector_future = vector_search_executor.submit(vector_search)
+    # The full text search fails with mysql-connector errors, ann_search with SQLAlchemy errors.
+    try:
+        text_columns, text_rows = text_future.result()
+        vector_columns, vector_rows = vector_future.result()
+    except (Error, SQLAlchemyError) as e:
+        logger.error(f"Error executing fused search on {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    if id_column_name not in text_columns:
+        raise ValueError(f"Column {id_column_name} is not in the results of table {table_name}")
+    key = text_columns.index(id_column_name)
+    hits = fusion.fuse(
+        [fusion.SearchHit(key=row[key], row=row[:-1], score=row[-1]) for row in text_rows],
+        [fusion.SearchHit(key=row[key], row=row[:-1], score=row[-1]) for row in vector_rows],
+        method=fusion_method,
         topk=topk,
-        output_column_names=output_column_name,
+        rrf_k=rrf_k,
+        text_weight=text_weight,
+        vector_higher_is_better=search_distance_func is inner_product,
     )
-    output = f"Hybrid search results for '{table_name}:\n\n'"
-    for result in results:
-        output += str(result) + "\n\n"
-    return output
+    extra_columns = ["score", "text_rank", "vector_rank", "text_score", DISTANCE_COLUMN]
+    payload = search_payload(
+        (text_columns or vector_columns) + extra_columns,
+        [
+            hit.row + (hit.score, hit.text_rank, hit.vector_rank, hit.text_score, hit.distance)
+            for hit in hits
+        ],
+        vector_columns=[vec_column_name],
+        exclude_columns=exclude_columns,
+        encode_vectors=encode_vectors,
+        vector_dtype=vector_dtype,
+    )
+    return format_search_results(payload, output_format)
+
+
+@blocking_tool()
+def create_vector_index(
+    table_name: str,
+    index_name: str,
+    vec_column_name: str = "vector",
+    index_type: str = "hnsw",
+    distance_func: Optional[str] = "l2",
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    nlist: Optional[int] = None,
+    replace: bool = False,
+) -> str:
+    """
+    Create a vector index, or rebuild it with new parameters when replace is true. The call
+    returns when the build is done, use inspect_vector_indexes from another session to follow it.
+    While an index is rebuilt, searches on the column run without it.
+
+    Args:
+        table_name: Name of the table.
+        index_name: Name of the vector index.
+        vec_column_name: Vector column to index.
+        index_type: hnsw, hnsw_sq, ivf_flat, ivf_sq8 or ivf_pq.
+        distance_func: l2, inner product or cosine, must match the distance_func used to search.
+        m: Neighbors per node for HNSW (5 to 128, default 16), subvectors for ivf_pq.
+        ef_construction: Candidate list size while building HNSW (5 to 1000, default 200).
+        nlist: Number of clusters of IVF indexes (default 128).
+        replace: Drop an existing index of the same name first.
+    """
+    logger.info(
+        f"Calling tool: create_vector_index  with arguments: {table_name}, {index_name}, {vec_column_name}, {index_type}"
+    )
+    params = vector_index.index_params(index_type, distance_func, m, ef_construction, nlist)
+    statements = [vector_index.create_index_sql(table_name, vec_column_name, index_name, params)]
+    start = time.perf_counter()
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                rows, dim = vector_index.table_stats(cursor, table_name, vec_column_name)
+                existing = {index.name for index in vector_index.list_indexes(cursor, table_name)}
+                if replace and index_name in existing:
+                    statements.insert(0, vector_index.drop_index_sql(table_name, index_name))
+                for sql in statements:
+                    cursor.execute(sql)
+                    _invalidate_caches(sql)
+    except Error as e:
+        logger.error(f"Error creating vector index {index_name} on {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    return json.dumps(
+        {
+            "statements": statements,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+            "rows": rows,
+            "dim": dim,
+            "estimated_memory_bytes": vector_index.estimate_memory(
+                rows, dim, index_type, m or 16, nlist or 128
+            ),
+        }
+    )
+
+
+@blocking_tool()
+def drop_vector_index(table_name: str, index_name: str) -> str:
+    """
+    Drop a vector index. Searches on the column keep working without it, by brute force.
+
+    Args:
+        table_name: Name of the table.
+        index_name: Name of the vector index.
+    """
+    logger.info(f"Calling tool: drop_vector_index  with arguments: {table_name}, {index_name}")
+    sql = vector_index.drop_index_sql(table_name, index_name)
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql)
+    except Error as e:
+        logger.error(f"Error dropping vector index {index_name} on {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    _invalidate_caches(sql)
+    return f"Dropped vector index {index_name} on {table_name}"
+
+
+@blocking_tool()
+def inspect_vector_indexes(
+    table_name: str,
+    vec_column_name: str = "vector",
+    m: int = 16,
+    nlist: int = 128,
+) -> str:
+    """
+    Show the vector indexes of a table, index builds in progress on it, vector index memory per server
+    and the estimated memory of each index type for the table, to size a tenant before creating one.
+
+    Args:
+        table_name: Name of the table.
+        vec_column_name: Vector column the estimates are made for.
+        m: HNSW m assumed by the estimates.
+        nlist: IVF nlist assumed by the estimates.
+    """
+    logger.info(
+        f"Calling tool: inspect_vector_indexes  with arguments: {table_name}, {vec_column_name}"
+    )
+    try:
+        with db_pool.connection() as conn:
+            with conn.cursor() as cursor:
+                rows, dim = vector_index.table_stats(cursor, table_name, vec_column_name)
+                indexes = vector_index.list_indexes(cursor, table_name)
+                builds = vector_index.build_progress(cursor, table_name)
+                memory = vector_index.vector_memory(cursor)
+    except Error as e:
+        logger.error(f"Error inspecting vector indexes of {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    return json.dumps(
+        {
+            "rows": rows,
+            "dim": dim,
+            "indexes": [index.model_dump() for index in indexes],
+            "builds_in_progress": None if builds is None else [b.model_dump() for b in builds],
+            "vector_memory": memory,
+            "estimated_memory_bytes": {
+                index_type: vector_index.estimate_memory(rows, dim, index_type, m, nlist)
+                for index_type in vector_index.INDEX_TYPES
+            },
+        },
+        default=str,
+    )
+
+
+@blocking_tool()
+def benchmark_vector_search(
+    table_name: str,
+    vec_column_name: str = "vector",
+    id_column_name: str = "id",
+    distance_func: Optional[str] = "l2",
+    k: int = 10,
+    queries: int = 100,
+    ef_search_values: Optional[list[int]] = None,
+) -> str:
+    """
+    Measure what approximate vector search gives up in recall for speed on a table. Samples
+    query vectors from the table, searches their exact nearest neighbors without the vector
+    index and compares them with the ANN results at each ob_hnsw_ef_search value.
+    Returns recall@k, QPS and p50/p99 latency per ef_search.
+
+    Args:
+        table_name: Name of the table.
+        vec_column_name: column name containing vectors to search.
+        id_column_name: Column identifying a row.
+        distance_func: l2, inner product or cosine, as used by the vector index.
+        k: Number of neighbors per query.
+        queries: Number of query vectors sampled.
+        ef_search_values: ob_hnsw_ef_search values to compare, 16, 32, 64, 128 and 256 by default.
+    """
+    logger.info(
+        f"Calling tool: benchmark_vector_search  with arguments: {table_name}, {vec_column_name}, {k}, {ef_search_values}"
+    )
+    backend = vector_bench.OceanBaseBackend(
+        db_pool, table_name, vec_column_name, id_column_name, distance_func
+    )
+    try:
+        report = vector_bench.run_benchmark(
+            backend,
+            k=k,
+            queries=queries,
+            ef_search_values=ef_search_values or vector_bench.DEFAULT_EF_SEARCH,
+        )
+    except Error as e:
+        logger.error(f"Error benchmarking vector search on {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    return json.dumps(report)
+
+
+@blocking_tool()
+def tune_vector_ef_search(
+    table_name: str,
+    vec_column_name: str = "vector",
+    id_column_name: str = "id",
+    distance_func: Optional[str] = "l2",
+    target_recall: float = 0.95,
+    k: int = 10,
+    queries: int = 100,
+    max_ef_search: int = 1000,
+    reset: bool = False,
+) -> str:
+    """
+    Find the smallest ob_hnsw_ef_search that reaches a target recall@k on a table, by binary
+    search over ANN searches compared with exact ones, and check it on held-out queries.
+    The value is saved for the column and used by the vector search tools from then on.
+
+    Args:
+        table_name: Name of the table.
+        vec_column_name: column name containing vectors to search.
+        id_column_name: Column identifying a row.
+        distance_func: l2, inner product or cosine, as used by the vector index.
+        target_recall: Recall@k to reach, between 0 and 1.
+        k: Number of neighbors the recall is measured for, use the usual topk of searches.
+        queries: Number of query vectors used to tune, as many again are held out to check.
+        max_ef_search: Largest ef_search tried, at most 1000.
+        reset: Forget the tuned value of the column instead, searches use the default again.
+    """
+    logger.info(
+        f"Calling tool: tune_vector_ef_search  with arguments: {table_name}, {vec_column_name}, {target_recall}, {k}"
+    )
+    if reset:
+        removed = ef_search_settings.remove(_baseline_profile(), table_name, vec_column_name)
+        return json.dumps({"reset": removed})
+    backend = vector_bench.OceanBaseBackend(
+        db_pool, table_name, vec_column_name, id_column_name, distance_func
+    )
+    try:
+        tuning = tune_ef_search(
+            backend,
+            table_name,
+            vec_column_name,
+            target_recall=target_recall,
+            k=k,
+            queries=queries,
+            max_ef_search=max_ef_search,
+        )
+    except Error as e:
+        logger.error(f"Error tuning ef_search on {table_name}: {e}")
+        return f"Error executing query: {str(e)}"
+    ef_search_settings.put(_baseline_profile(), tuning.setting)
+    return tuning.model_dump_json()
 
 
 if ENABLE_MEMORY:
-    from pyobvector import ObVecClient, l2_distance, VECTOR
+    from pyobvector import l2_distance, VECTOR
     from sqlalchemy import Column, Integer, JSON, String, text
 
     class OBMemory:
@@ -543,12 +1950,7 @@ if ENABLE_MEMORY:
             self.embedding_dimension = len(self.embedding_client.embed_query("test"))
             logger.info(f"embedding_dimension: {self.embedding_dimension}")
 
-            self.client = ObVecClient(
-                uri=db_conn_info.host + ":" + str(db_conn_info.port),
-                user=db_conn_info.user,
-                password=db_conn_info.password,
-                db_name=db_conn_info.database,
-            )
+            self.client = vec_clients.get(db_conn_info)
             self._init_obvector()
 
         def gen_embedding(self, text: str) -> List[float]:
@@ -576,12 +1978,7 @@ if ENABLE_MEMORY:
             """
             Initialize the OBVector.
             """
-            client = ObVecClient(
-                uri=db_conn_info.host + ":" + str(db_conn_info.port),
-                user=db_conn_info.user,
-                password=db_conn_info.password,
-                db_name=db_conn_info.database,
-            )
+            client = self.client
             if not client.check_table_exists(TABLE_NAME_MEMORY):
                 # Get embedding dimension dynamically from model config
                 cols = [
@@ -650,12 +2047,7 @@ if ENABLE_MEMORY:
         🔥 CATEGORY ANALYSIS RULE: Find ALL related memories by category for smart merging!
         """
 
-        client = ObVecClient(
-            uri=db_conn_info.host + ":" + str(db_conn_info.port),
-            user=db_conn_info.user,
-            password=db_conn_info.password,
-            db_name=db_conn_info.database,
-        )
+        client = vec_clients.get(db_conn_info, TABLE_NAME_MEMORY)
         res = client.ann_search(
             TABLE_NAME_MEMORY,
             vec_data=ob_memory.gen_embedding(query),
@@ -724,12 +2116,7 @@ if ENABLE_MEMORY:
         🎯 GOLDEN RULE: Same category = UPDATE existing! Different category = CREATE separate!
         """
 
-        client = ObVecClient(
-            uri=db_conn_info.host + ":" + str(db_conn_info.port),
-            user=db_conn_info.user,
-            password=db_conn_info.password,
-            db_name=db_conn_info.database,
-        )
+        client = vec_clients.get(db_conn_info, TABLE_NAME_MEMORY)
         client.insert(
             TABLE_NAME_MEMORY,
             OBMemoryItem(
@@ -761,12 +2148,7 @@ if ENABLE_MEMORY:
         🔒 SAFETY RULE: Only delete when explicitly requested by user!
         """
 
-        client = ObVecClient(
-            uri=db_conn_info.host + ":" + str(db_conn_info.port),
-            user=db_conn_info.user,
-            password=db_conn_info.password,
-            db_name=db_conn_info.database,
-        )
+        client = vec_clients.get(db_conn_info, TABLE_NAME_MEMORY)
         client.delete(table_name=TABLE_NAME_MEMORY, ids=mem_id)
         return "Deleted successfully"
 
@@ -800,12 +2182,7 @@ if ENABLE_MEMORY:
         🔥 CONSISTENCY RULE: Maintain English storage format for all updates!
         """
 
-        client = ObVecClient(
-            uri=db_conn_info.host + ":" + str(db_conn_info.port),
-            user=db_conn_info.user,
-            password=db_conn_info.password,
-            db_name=db_conn_info.database,
-        )
+        client = vec_clients.get(db_conn_info, TABLE_NAME_MEMORY)
         client.update(
             table_name=TABLE_NAME_MEMORY,
             values_clause=[
@@ -820,10 +2197,10 @@ if ENABLE_MEMORY:
         )
         return "Updated successfully"
 
-    app.add_tool(ob_memory_query)
-    app.add_tool(ob_memory_insert)
-    app.add_tool(ob_memory_delete)
-    app.add_tool(ob_memory_update)
+    app.add_tool(blocking_executor.wrap(ob_memory_query))
+    app.add_tool(blocking_executor.wrap(ob_memory_insert))
+    app.add_tool(blocking_executor.wrap(ob_memory_delete))
+    app.add_tool(blocking_executor.wrap(ob_memory_update))
 
 
 def main():
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from mysql.connector import Error
+from pydantic import BaseModel
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+_CONTEXT_SQL = """
+    SELECT t.TENANT_NAME, t.TENANT_ID, t.COMPATIBILITY_MODE, OB_VERSION(), CURRENT_USER()
+    FROM oceanbase.DBA_OB_TENANTS t
+    WHERE t.TENANT_ID = EFFECTIVE_TENANT_ID()
+"""
+
+
+class SessionContext(BaseModel):
+    tenant_name: str
+    tenant_id: Optional[int] = None
+    compatibility_mode: Optional[str] = None
+    ob_version: Optional[str] = None
+    user: Optional[str] = None
+    privileges: List[str] = []
+
+
+class SessionContextCache:
+    """
+    Tenant name, tenant id, compatibility mode, OceanBase version and privileges of the sessions
+    opened by one connection profile. Loaded on first use and reloaded once it is older
+    than `ttl` seconds or marked stale, e.g. after GRANT or REVOKE.
+    """
+
+    def __init__(self, pool, ttl: float = 600):
+        self._pool = pool
+        self.ttl = ttl
+        self._context: Optional[SessionContext] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def mark_stale(self) -> None:
+        self._context = None
+
+    def get(self) -> SessionContext:
+        context = self._context
+        if context is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return context
+        with self._lock:
+            if self._context is None or time.monotonic() - self._loaded_at >= self.ttl:
+                self._context = self._load()
+                self._loaded_at = time.monotonic()
+            return self._context
+
+    def _load(self) -> SessionContext:
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(_CONTEXT_SQL)
+                    row = cursor.fetchone()
+                except Error as e:
+                    logger.info(
+                        f"DBA_OB_TENANTS is not available, falling back to SHOW TENANT: {e}"
+                    )
+                    row = None
+                if row:
+                    tenant_name, tenant_id, mode, version, user = row
+                else:
+                    cursor.execute("SHOW TENANT")
+                    tenant_name = cursor.fetchall()[0][0]
+                    cursor.execute("SELECT VERSION(), CURRENT_USER()")
+                    version, user = cursor.fetchone()
+                    tenant_id = mode = None
+                cursor.execute("SHOW GRANTS")
+                privileges = [grant[0] for grant in cursor.fetchall()]
+        context = SessionContext(
+            tenant_name=tenant_name,
+            tenant_id=tenant_id,
+            compatibility_mode=mode,
+            ob_version=str(version) if version is not None else None,
+            user=user,
+            privileges=privileges,
+        )
+        logger.info(f"Loaded session context: {context.tenant_name}, {context.ob_version}")
+        return context
@@ -0,0 +1,245 @@
+from __future__ import annotations
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from mysql.connector import Error
+from pydantic import BaseModel
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+# Per-request metrics read from GV$OB_SQL_AUDIT, in the order of METRICS.
+# CPU time is execution time minus waits, logical reads are cache hits plus disk reads.
+_METRIC_EXPRESSIONS = (
+    "ELAPSED_TIME",
+    "GREATEST(EXECUTE_TIME - TOTAL_WAIT_TIME_MICRO, 0)",
+    "ROW_CACHE_HIT + BLOOM_FILTER_CACHE_HIT + BLOCK_CACHE_HIT + DISK_READS",
+    "RETRY_CNT",
+)
+METRICS = ("elapsed", "cpu", "logical_reads", "retries")
+PERCENTILES = (50, 95, 99)
+
+_AGGREGATE_SQL = """
+    SELECT SQL_ID, COUNT(*), {sums}, MIN(SUBSTR(QUERY_SQL, 1, 500))
+    FROM oceanbase.GV$OB_SQL_AUDIT
+    WHERE {where}
+    GROUP BY SQL_ID
+    ORDER BY {order_by} DESC
+    LIMIT %s
+"""
+_ROWS_SQL = """
+    SELECT SQL_ID, {metrics}
+    FROM oceanbase.GV$OB_SQL_AUDIT
+    WHERE {where}
+"""
+_TEXT_SQL = """
+    SELECT SQL_ID, MIN(SUBSTR(QUERY_SQL, 1, 500))
+    FROM oceanbase.GV$OB_SQL_AUDIT
+    WHERE {where}
+    GROUP BY SQL_ID
+"""
+
+
+class TopSqlEntry(BaseModel):
+    sql_id: str
+    executions: int
+    total_elapsed_us: float
+    avg_elapsed_us: float
+    total_cpu_us: float
+    logical_reads: float
+    retries: float
+    p50_elapsed_us: Optional[float] = None
+    p95_elapsed_us: Optional[float] = None
+    p99_elapsed_us: Optional[float] = None
+    sql_text: Optional[str] = None
+
+
+def build_where(
+    minutes: float,
+    tenant_id: Optional[int] = None,
+    database: Optional[str] = None,
+    include_inner_sql: bool = False,
+) -> Tuple[str, list]:
+    # REQUEST_TIME is a Unix timestamp in microseconds.
+    conditions = ["REQUEST_TIME >= (UNIX_TIMESTAMP() - %s) * 1000000", "SQL_ID <> ''"]
+    params: list = [int(minutes * 60)]
+    if not include_inner_sql:
+        conditions.append("IS_INNER_SQL = 0")
+    if tenant_id is not None:
+        conditions.append("TENANT_ID = %s")
+        params.append(tenant_id)
+    if database is not None:
+        conditions.append("DB_NAME = %s")
+        params.append(database)
+    return " AND ".join(conditions), params
+
+
+def group_percentiles(
+    codes: np.ndarray, values: np.ndarray, groups: int, percentiles: Sequence[float] = PERCENTILES
+) -> np.ndarray:
+    """
+    Percentiles of `values` within each group, with the same linear interpolation as
+    np.percentile. `codes` holds the group number, 0 to `groups` - 1, of every value.
+    Returns a (groups, len(percentiles)) array, NaN for groups without values.
+    """
+    result = np.full((groups, len(percentiles)), np.nan)
+    if len(values) == 0:
+        return result
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    counts = np.bincount(codes, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    for i, q in enumerate(percentiles):
+        position = (counts[present] - 1) * (q / 100.0)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        base = starts[present]
+        low_values = values[base + low]
+        high_values = values[base + high]
+        result[present, i] = low_values + (high_values - low_values) * (position - low)
+    return result
+
+
+def _stream(cursor, sql: str, params: list, batch_size: int):
+    cursor.execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _read_columns(cursor, sql: str, params: list, batch_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Stream (sql_id, metric...) rows into an array of ids and a float array of metrics."""
+    ids: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    for rows in _stream(cursor, sql, params, batch_size):
+        ids.append(np.array([row[0] for row in rows], dtype=object))
+        values.append(np.array([row[1:] for row in rows], dtype=np.float64))
+    if not ids:
+        return np.array([], dtype=object), np.empty((0, 0))
+    return np.concatenate(ids), np.concatenate(values)
+
+
+def _pushdown_top(cursor, where: str, params: list, order_by: str, limit: int) -> List[TopSqlEntry]:
+    sums = ", ".join(f"SUM({expression})" for expression in _METRIC_EXPRESSIONS)
+    order_column = f"SUM({_METRIC_EXPRESSIONS[METRICS.index(order_by)]})"
+    cursor.execute(
+        _AGGREGATE_SQL.format(sums=sums, where=where, order_by=order_column), params + [limit]
+    )
+    entries = []
+    for sql_id, executions, elapsed, cpu, reads, retries, sql_text in cursor.fetchall():
+        entries.append(
+            TopSqlEntry(
+                sql_id=sql_id,
+                executions=int(executions),
+                total_elapsed_us=float(elapsed or 0),
+                avg_elapsed_us=float(elapsed or 0) / max(int(executions), 1),
+                total_cpu_us=float(cpu or 0),
+                logical_reads=float(reads or 0),
+                retries=float(retries or 0),
+                sql_text=sql_text,
+            )
+        )
+    return entries
+
+
+def _streamed_top(
+    cursor, where: str, params: list, order_by: str, limit: int, batch_size: int
+) -> List[TopSqlEntry]:
+    """Aggregate every audit row of the window in process, for when GROUP BY on the view fails."""
+    sql = _ROWS_SQL.format(metrics=", ".join(_METRIC_EXPRESSIONS), where=where)
+    ids, values = _read_columns(cursor, sql, params, batch_size)
+    if len(ids) == 0:
+        return []
+    sql_ids, codes = np.unique(ids.astype(str), return_inverse=True)
+    executions = np.bincount(codes, minlength=len(sql_ids))
+    totals = np.stack(
+        [
+            np.bincount(codes, weights=values[:, i], minlength=len(sql_ids))
+            for i in range(len(METRICS))
+        ],
+        axis=1,
+    )
+    top = np.argsort(-totals[:, METRICS.index(order_by)], kind="stable")[:limit]
+    return [
+        TopSqlEntry(
+            sql_id=str(sql_ids[g]),
+            executions=int(executions[g]),
+            total_elapsed_us=float(totals[g, 0]),
+            avg_elapsed_us=float(totals[g, 0] / executions[g]),
+            total_cpu_us=float(totals[g, 1]),
+            logical_reads=float(totals[g, 2]),
+            retries=float(totals[g, 3]),
+        )
+        for g in top
+    ]
+
+
+def _id_filter(where: str, entries: List[TopSqlEntry]) -> str:
+    return f"{where} AND SQL_ID IN ({', '.join(['%s'] * len(entries))})"
+
+
+def _add_sql_text(cursor, entries: List[TopSqlEntry], where: str, params: list):
+    if not entries:
+        return
+    cursor.execute(
+        _TEXT_SQL.format(where=_id_filter(where, entries)), params + [e.sql_id for e in entries]
+    )
+    texts = dict(cursor.fetchall())
+    for entry in entries:
+        entry.sql_text = texts.get(entry.sql_id)
+
+
+def _add_percentiles(cursor, entries: List[TopSqlEntry], where: str, params: list, batch_size: int):
+    """Stream only the elapsed times of the top statements and compute their percentiles."""
+    if not entries:
+        return
+    sql = _ROWS_SQL.format(metrics="ELAPSED_TIME", where=_id_filter(where, entries))
+    ids, values = _read_columns(cursor, sql, params + [e.sql_id for e in entries], batch_size)
+    index: Dict[str, int] = {entry.sql_id: i for i, entry in enumerate(entries)}
+    codes = np.array([index[str(sql_id)] for sql_id in ids], dtype=np.int64)
+    elapsed = values[:, 0] if len(ids) else np.empty(0)
+    for entry, (p50, p95, p99) in zip(entries, group_percentiles(codes, elapsed, len(entries))):
+        if not np.isnan(p50):
+            entry.p50_elapsed_us, entry.p95_elapsed_us, entry.p99_elapsed_us = (
+                float(p50),
+                float(p95),
+                float(p99),
+            )
+
+
+def top_sql(
+    cursor,
+    order_by: str = "elapsed",
+    limit: int = 10,
+    minutes: float = 30,
+    tenant_id: Optional[int] = None,
+    database: Optional[str] = None,
+    include_inner_sql: bool = False,
+    batch_size: int = 10000,
+) -> List[TopSqlEntry]:
+    """
+    Top `limit` statements of the last `minutes` by total elapsed time, CPU time, logical
+    reads or retries, with p50/p95/p99 elapsed time per SQL_ID.
+
+    Totals are aggregated by the server with GROUP BY. If that fails, audit rows are streamed
+    in batches of `batch_size` and aggregated with NumPy instead. Percentiles are always
+    computed in process, from the elapsed times of the top statements only.
+    """
+    if order_by not in METRICS:
+        raise ValueError(f"Unsupported order_by: {order_by}, expected one of {METRICS}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    where, params = build_where(minutes, tenant_id, database, include_inner_sql)
+    try:
+        entries = _pushdown_top(cursor, where, params, order_by, limit)
+    except Error as e:
+        logger.warning(
+            f"Aggregating GV$OB_SQL_AUDIT on the server failed, streaming rows instead: {e}"
+        )
+        entries = _streamed_top(cursor, where, params, order_by, limit, batch_size)
+        _add_sql_text(cursor, entries, where, params)
+    _add_percentiles(cursor, entries, where, params, batch_size)
+    return entries
@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name with backticks for use in MySQL mode SQL."""
+    return "`" + name.replace("`", "``") + "`"
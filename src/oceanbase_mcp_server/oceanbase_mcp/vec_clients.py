@@ -0,0 +1,137 @@
+from __future__ import annotations
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from pyobvector import ObVecClient
+from sqlalchemy import Table, event
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+# Session variables session_variables() may set, with integer values only.
+SESSION_VARIABLES = ("ob_hnsw_ef_search",)
+
+
+class ObVecClientRegistry:
+    """
+    Lazily created, process-wide ObVecClient instances keyed by connection profile.
+
+    Every ObVecClient owns a SQLAlchemy engine, its connection pool and the reflected
+    table metadata, so sharing one client per profile keeps connections warm and
+    avoids reflecting the same tables on every search.
+    """
+
+    def __init__(self, **engine_kwargs):
+        self._engine_kwargs = engine_kwargs
+        self._clients = {}
+        self._metadata_locks = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @staticmethod
+    def _profile_key(conn_info) -> tuple:
+        return (
+            conn_info.host,
+            int(conn_info.port),
+            conn_info.user,
+            conn_info.password,
+            conn_info.database,
+        )
+
+    def get(self, conn_info, table_name: Optional[str] = None) -> ObVecClient:
+        """
+        Return the shared client for `conn_info`, creating it on first use.
+
+        If `table_name` is given, its metadata is reflected once under a lock so
+        concurrent searches never reflect the same table in parallel.
+        """
+        key = self._profile_key(conn_info)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    logger.info(
+                        f"Creating ObVecClient for {conn_info.user}@{conn_info.host}:{conn_info.port}"
+                    )
+                    client = ObVecClient(
+                        uri=conn_info.host + ":" + str(conn_info.port),
+                        user=conn_info.user,
+                        password=conn_info.password or "",
+                        db_name=conn_info.database or "",
+                        **self._engine_kwargs,
+                    )
+                    event.listen(client.engine, "before_cursor_execute", self._apply_session)
+                    self._metadata_locks[key] = threading.Lock()
+                    self._clients[key] = client
+        if table_name is not None and table_name not in client.metadata_obj.tables:
+            with self._metadata_locks[key]:
+                if table_name not in client.metadata_obj.tables:
+                    Table(table_name, client.metadata_obj, autoload_with=client.engine)
+        return client
+
+    @contextmanager
+    def session_variables(self, **variables: Optional[int]):
+        """
+        Run the statements this thread executes through any client with the given session
+        variables, None meaning the server default. ann_search checks out a pooled connection
+        of its own, so the variables are set on it right before the statement runs, and only
+        when the connection does not have these values yet.
+        """
+        for name, value in variables.items():
+            if name not in SESSION_VARIABLES:
+                raise ValueError(f"Unsupported session variable: {name}")
+            if value is not None and not isinstance(value, int):
+                raise ValueError(f"{name} must be an integer")
+        previous = getattr(self._local, "variables", None)
+        self._local.variables = {**(previous or {}), **variables}
+        try:
+            yield
+        finally:
+            self._local.variables = previous
+
+    def _apply_session(self, conn, cursor, statement, parameters, context, executemany):
+        wanted: Dict[str, Optional[int]] = getattr(self._local, "variables", None) or {}
+        applied = conn.info.setdefault("ob_session_variables", {})
+        # A variable set for an earlier search goes back to the default if this one has none.
+        for name in set(wanted) | set(applied):
+            value = wanted.get(name)
+            if applied.get(name) == value:
+                continue
+            dbapi_cursor = conn.connection.cursor()
+            try:
+                dbapi_cursor.execute(
+                    f"SET SESSION {name} = {'DEFAULT' if value is None else int(value)}"
+                )
+            finally:
+                dbapi_cursor.close()
+            if value is None:
+                applied.pop(name, None)
+            else:
+                applied[name] = value
+
+    def forget_tables(self, table_names: Optional[list[str]] = None) -> None:
+        """
+        Drop cached table metadata so it is reflected again on next use.
+        Call this after DDL. Without `table_names` all cached tables are dropped.
+        """
+        with self._lock:
+            items = [(key, client) for key, client in self._clients.items()]
+        for key, client in items:
+            with self._metadata_locks[key]:
+                if table_names is None:
+                    client.metadata_obj.clear()
+                    continue
+                for name in table_names:
+                    table = client.metadata_obj.tables.get(name)
+                    if table is not None:
+                        client.metadata_obj.remove(table)
+
+    def dispose(self) -> None:
+        """Close the connection pools of all clients."""
+        with self._lock:
+            for client in self._clients.values():
+                client.engine.dispose()
+            self._clients.clear()
+            self._metadata_locks.clear()
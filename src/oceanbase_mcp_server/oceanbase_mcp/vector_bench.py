@@ -0,0 +1,291 @@
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from oceanbase_mcp.sql_utils import quote_identifier
+from oceanbase_mcp.vector_codec import parse_vector
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+# distance_func of the vector search tools -> SQL function whose ascending order is best first.
+SQL_DISTANCES = {
+    "l2": "l2_distance",
+    "cosine": "cosine_distance",
+    "inner product": "negative_inner_product",
+}
+DEFAULT_EF_SEARCH = (16, 32, 64, 128, 256)
+
+
+class BenchmarkPoint(BaseModel):
+    # None when the search ran with the session's ef_search.
+    ef_search: Optional[int] = None
+    recall: float
+    qps: float
+    p50_ms: float
+    p99_ms: float
+
+
+def _check_distance(distance: str) -> str:
+    distance = (distance or "l2").lower()
+    if distance not in SQL_DISTANCES:
+        raise ValueError(f"Unsupported distance: {distance}, expected one of {list(SQL_DISTANCES)}")
+    return distance
+
+
+def exact_distances(vectors: np.ndarray, queries: np.ndarray, distance: str) -> np.ndarray:
+    """(queries, rows) matrix of distances, smaller is closer for every distance."""
+    distance = _check_distance(distance)
+    if distance == "inner product":
+        return -(queries @ vectors.T)
+    if distance == "cosine":
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(queries, axis=1)[:, None]
+        return 1 - (queries @ vectors.T) / np.maximum(norms, np.finfo(np.float32).tiny)
+    # |q - v|^2 = |q|^2 - 2 q.v + |v|^2, one matrix product instead of a loop over rows.
+    squared = (
+        (queries**2).sum(axis=1)[:, None] - 2 * (queries @ vectors.T) + (vectors**2).sum(axis=1)
+    )
+    return np.sqrt(np.maximum(squared, 0))
+
+
+def exact_topk(vectors: np.ndarray, queries: np.ndarray, k: int, distance: str) -> np.ndarray:
+    """Row positions of the k nearest vectors of each query, nearest first."""
+    distances = exact_distances(vectors, queries, distance)
+    k = min(k, vectors.shape[0])
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1, kind="stable")
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def _literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(map(repr, vector.astype(float).tolist())) + "]"
+
+
+class OceanBaseBackend:
+    """
+    Benchmarks a vector table through a connection pool. The ef_search session variable and
+    the ANN query run on one connection, so each search sees its own setting.
+    """
+
+    def __init__(
+        self, pool, table_name: str, vec_column_name: str, id_column_name: str, distance: str
+    ):
+        self.pool = pool
+        self.table = quote_identifier(table_name)
+        self.vec_column = quote_identifier(vec_column_name)
+        self.id_column = quote_identifier(id_column_name)
+        self.distance = _check_distance(distance)
+
+    def count(self) -> int:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT({self.vec_column}) FROM {self.table}")
+                return int(cursor.fetchall()[0][0])
+
+    def sample(self, size: int, seed: int) -> Tuple[list, np.ndarray]:
+        # One scan that keeps only the `size` rows ranked first, the table is never fetched.
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {self.id_column}, {self.vec_column} FROM {self.table} "
+                    f"WHERE {self.vec_column} IS NOT NULL ORDER BY RAND(%s) LIMIT %s",
+                    (seed, size),
+                )
+                rows = cursor.fetchall()
+        if not rows:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return [row[0] for row in rows], np.stack([parse_vector(row[1]) for row in rows])
+
+    def exact(self, vector: np.ndarray, k: int) -> list:
+        # Without APPROXIMATE the vector index is not used, every row is scored on the server.
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {self.id_column} FROM {self.table} "
+                    f"ORDER BY {SQL_DISTANCES[self.distance]}({self.vec_column}, %s) LIMIT %s",
+                    (_literal(vector), k),
+                )
+                return [row[0] for row in cursor.fetchall()]
+
+    def search(self, vector: np.ndarray, k: int, ef_search: Optional[int]) -> list:
+        literal = _literal(vector)
+        sql = (
+            f"SELECT {self.id_column} FROM {self.table} "
+            f"ORDER BY {SQL_DISTANCES[self.distance]}({self.vec_column}, %s) APPROXIMATE LIMIT %s"
+        )
+        with self.pool.connection() as conn:
+            with conn.cursor() as cursor:
+                if ef_search is None:
+                    cursor.execute(sql, (literal, k))
+                    return [row[0] for row in cursor.fetchall()]
+                cursor.execute("SET SESSION ob_hnsw_ef_search = %s", (ef_search,))
+                try:
+                    cursor.execute(sql, (literal, k))
+                    return [row[0] for row in cursor.fetchall()]
+                finally:
+                    # The connection goes back to a shared pool.
+                    cursor.execute("SET SESSION ob_hnsw_ef_search = DEFAULT")
+
+
+class LocalBackend:
+    """
+    In-process stand-in for a vector table. Its ANN search only scores a prefix of a fixed
+    random permutation of the rows, proportional to ef_search, so recall grows with ef_search
+    like a graph index, without a database.
+    """
+
+    def __init__(
+        self, ids: Sequence, vectors: np.ndarray, distance: str = "l2", rows_per_ef: int = 4
+    ):
+        self.ids = list(ids)
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+        self.distance = _check_distance(distance)
+        self.rows_per_ef = rows_per_ef
+        self._order = np.random.default_rng(0).permutation(len(self.ids))
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def sample(self, size: int, seed: int) -> Tuple[list, np.ndarray]:
+        positions = np.random.default_rng(seed).choice(
+            len(self.ids), size=min(size, len(self.ids)), replace=False
+        )
+        return [self.ids[i] for i in positions], self.vectors[positions]
+
+    def exact(self, vector: np.ndarray, k: int) -> list:
+        return [self.ids[i] for i in exact_topk(self.vectors, vector[None, :], k, self.distance)[0]]
+
+    def search(self, vector: np.ndarray, k: int, ef_search: Optional[int]) -> list:
+        scanned = self._order
+        if ef_search is not None:
+            scanned = scanned[: max(ef_search * self.rows_per_ef, k)]
+        nearest = exact_topk(self.vectors[scanned], vector[None, :], k, self.distance)[0]
+        return [self.ids[i] for i in scanned[nearest]]
+
+
+class QuerySet:
+    """Query vectors sampled from the table, with the ids of their exact neighbors."""
+
+    def __init__(self, backend, ids: list, vectors: np.ndarray, k: int):
+        self.ids = ids
+        self.vectors = vectors
+        self.k = k
+        # Each query's own row is left out, it is not a neighbor worth finding.
+        self.expected = [
+            set([row_id for row_id in backend.exact(vector, k + 1) if row_id != query_id][:k])
+            for query_id, vector in zip(ids, vectors)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def sample_queries(backend, size: int, k: int, seed: int = 0) -> Tuple[int, list, np.ndarray]:
+    """
+    Count the rows with a vector and sample `size` of them as query vectors. Only the queries
+    are held in memory, their exact neighbors are searched for on the backend.
+    """
+    total = backend.count()
+    if total <= k:
+        raise ValueError(f"The table needs more than k={k} rows with a vector, it has {total}")
+    ids, vectors = backend.sample(size, seed)
+    return total, ids, vectors
+
+
+def measure(backend, query_set: QuerySet, ef_search: Optional[int]) -> BenchmarkPoint:
+    """Run every query of the set at `ef_search`, recall@k is averaged over all queries."""
+    latencies = []
+    hits = 0
+    for query_id, vector, wanted in zip(query_set.ids, query_set.vectors, query_set.expected):
+        start = time.perf_counter()
+        found = backend.search(vector, query_set.k + 1, ef_search)
+        latencies.append(time.perf_counter() - start)
+        found = [row_id for row_id in found if row_id != query_id][: query_set.k]
+        hits += len(wanted.intersection(found))
+    latencies = np.array(latencies)
+    point = BenchmarkPoint(
+        ef_search=ef_search,
+        recall=round(hits / (query_set.k * len(query_set)), 4),
+        qps=round(len(query_set) / latencies.sum(), 1) if latencies.sum() else 0.0,
+        p50_ms=round(float(np.percentile(latencies, 50)) * 1000, 3),
+        p99_ms=round(float(np.percentile(latencies, 99)) * 1000, 3),
+    )
+    logger.info(f"ef_search={ef_search}: {point}")
+    return point
+
+
+def run_benchmark(
+    backend,
+    k: int = 10,
+    queries: int = 100,
+    ef_search_values: Sequence[Optional[int]] = DEFAULT_EF_SEARCH,
+    seed: int = 0,
+) -> dict:
+    """
+    Compare ANN results at each ef_search with exact nearest neighbors searched without the
+    vector index, for query vectors sampled from the table.
+    """
+    if k < 1 or queries < 1:
+        raise ValueError("k and queries must be at least 1")
+    total, ids, vectors = sample_queries(backend, queries, k, seed)
+    query_set = QuerySet(backend, ids, vectors, k)
+    points = [measure(backend, query_set, ef_search) for ef_search in ef_search_values]
+    return {
+        "rows": total,
+        "queries": len(query_set),
+        "k": k,
+        "distance": backend.distance,
+        "results": [point.model_dump() for point in points],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Benchmark ANN recall and latency of a vector table, connecting with the OB_* variables."""
+    from dotenv import load_dotenv
+
+    from oceanbase_mcp.pool import OBConnectionPool
+
+    parser = argparse.ArgumentParser(
+        description="Measure recall@k, QPS and latency of ANN search on an OceanBase vector table."
+    )
+    parser.add_argument("table", help="Table to benchmark")
+    parser.add_argument("--vec-column", default="vector", help="Vector column")
+    parser.add_argument("--id-column", default="id", help="Column identifying a row")
+    parser.add_argument("--distance", default="l2", help="l2, cosine or 'inner product'")
+    parser.add_argument("-k", type=int, default=10, help="Neighbors per query")
+    parser.add_argument("--queries", type=int, default=100, help="Query vectors sampled")
+    parser.add_argument(
+        "--ef-search",
+        default=",".join(map(str, DEFAULT_EF_SEARCH)),
+        help="Comma separated ob_hnsw_ef_search values",
+    )
+    args = parser.parse_args(argv)
+    load_dotenv()
+    pool = OBConnectionPool(
+        {
+            "host": os.getenv("OB_HOST", "localhost"),
+            "port": int(os.getenv("OB_PORT", 2881)),
+            "user": os.getenv("OB_USER"),
+            "password": os.getenv("OB_PASSWORD"),
+            "database": os.getenv("OB_DATABASE"),
+        },
+        size=1,
+    )
+    backend = OceanBaseBackend(pool, args.table, args.vec_column, args.id_column, args.distance)
+    report = run_benchmark(
+        backend,
+        k=args.k,
+        queries=args.queries,
+        ef_search_values=[int(value) for value in args.ef_search.split(",")],
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
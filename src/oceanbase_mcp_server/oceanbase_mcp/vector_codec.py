@@ -0,0 +1,62 @@
+from __future__ import annotations
+import base64
+import binascii
+from typing import List, Union
+
+import numpy as np
+
+# Vectors are exchanged as base64 of little-endian IEEE floats, the layout of numpy's tobytes().
+VECTOR_DTYPES = {"float32": np.dtype("<f4"), "float16": np.dtype("<f2")}
+
+
+def _dtype(name: str) -> np.dtype:
+    try:
+        return VECTOR_DTYPES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported vector dtype: {name}, expected one of {list(VECTOR_DTYPES)}"
+        ) from None
+
+
+def decode_vector(data: str, dtype: str = "float32") -> np.ndarray:
+    """
+    Decode a base64 buffer of little-endian floats. The array is a view over the decoded
+    bytes, so no value is parsed one by one.
+    """
+    dt = _dtype(dtype)
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 vector: {e}") from None
+    if not raw or len(raw) % dt.itemsize:
+        raise ValueError(
+            f"A base64 {dtype} vector must be a non-empty multiple of {dt.itemsize} bytes, "
+            f"got {len(raw)}"
+        )
+    vector = np.frombuffer(raw, dtype=dt)
+    if not np.isfinite(vector).all():
+        raise ValueError("Vector contains NaN or infinite values")
+    return vector
+
+
+def parse_vector(value) -> np.ndarray:
+    """
+    A vector column value as a float32 array. Read through the VECTOR type it is already an
+    array, read with a text query, as ann_search does, it is the text `[0.1,0.2]`.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        value = bytes(value).decode("ascii")
+    if isinstance(value, str):
+        return np.fromstring(value.strip().strip("[]"), dtype=np.float32, sep=",")
+    return np.asarray(value, dtype=np.float32)
+
+
+def encode_vector(vector, dtype: str = "float32") -> str:
+    return base64.b64encode(np.asarray(vector, dtype=_dtype(dtype)).tobytes()).decode("ascii")
+
+
+def query_vector(vector_data: Union[List[float], str], dtype: str = "float32") -> List[float]:
+    """Return a query vector as the list ann_search expects, decoding it if it is base64."""
+    if isinstance(vector_data, str):
+        return decode_vector(vector_data, dtype).tolist()
+    return vector_data
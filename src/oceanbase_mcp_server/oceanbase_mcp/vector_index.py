@@ -0,0 +1,208 @@
+from __future__ import annotations
+import logging
+import re
+from typing import Dict, List, Optional
+
+from mysql.connector import Error
+from pydantic import BaseModel
+
+from oceanbase_mcp.sql_utils import quote_identifier
+
+logger = logging.getLogger("oceanbase_mcp_server")
+
+# Index type -> (TYPE, LIB) of the vector index DDL. HNSW variants are in-memory VSAG indexes,
+# IVF variants are built by OceanBase itself and keep only their centroids in memory.
+INDEX_TYPES = {
+    "hnsw": ("HNSW", "VSAG"),
+    "hnsw_sq": ("HNSW_SQ", "VSAG"),
+    "ivf_flat": ("IVF_FLAT", "OB"),
+    "ivf_sq8": ("IVF_SQ8", "OB"),
+    "ivf_pq": ("IVF_PQ", "OB"),
+}
+# Same names as the distance_func argument of the vector search tools.
+DISTANCES = {"l2": "L2", "inner product": "INNER_PRODUCT", "cosine": "COSINE"}
+
+_VECTOR_DIM_RE = re.compile(r"vector\((\d+)\)", re.IGNORECASE)
+_LONGOPS_FIELD_RE = re.compile(r"(\w+):\s*([^,]+)")
+
+_TABLE_STATS_SQL = """
+    SELECT t.TABLE_ROWS, c.COLUMN_TYPE
+    FROM information_schema.TABLES t
+    JOIN information_schema.COLUMNS c
+        ON c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME
+    WHERE t.TABLE_SCHEMA = DATABASE() AND t.TABLE_NAME = %s AND c.COLUMN_NAME = %s
+"""
+_LONGOPS_SQL = """
+    SELECT SVR_IP, SVR_PORT, OPNAME, TARGET, START_TIME, ELAPSED_SECONDS, TIME_REMAINING, MESSAGE
+    FROM oceanbase.GV$SESSION_LONGOPS
+    WHERE OPNAME LIKE '%index%'
+"""
+_TABLE_ID_SQL = """
+    SELECT OBJECT_ID FROM oceanbase.DBA_OBJECTS
+    WHERE OWNER = DATABASE() AND OBJECT_NAME = %s AND OBJECT_TYPE = 'TABLE'
+"""
+_VECTOR_MEMORY_SQL = "SELECT * FROM oceanbase.GV$OB_VECTOR_MEMORY"
+
+
+class VectorIndex(BaseModel):
+    name: str
+    column: str
+    index_type: Optional[str] = None
+
+
+class IndexBuild(BaseModel):
+    svr_ip: str
+    svr_port: int
+    operation: str
+    target: Optional[str] = None
+    start_time: Optional[str] = None
+    elapsed_seconds: Optional[float] = None
+    time_remaining: Optional[float] = None
+    # STATUS, ROW_SCANNED, ROW_INSERTED, ... parsed from MESSAGE.
+    progress: Dict[str, str] = {}
+
+
+def index_params(
+    index_type: str,
+    distance: str,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None,
+    nlist: Optional[int] = None,
+) -> str:
+    """The WITH (...) parameters of CREATE VECTOR INDEX, validated."""
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported vector index type: {index_type}, expected one of {list(INDEX_TYPES)}"
+        )
+    distance = (distance or "l2").lower()
+    if distance not in DISTANCES:
+        raise ValueError(f"Unsupported distance: {distance}, expected one of {list(DISTANCES)}")
+    type_name, lib = INDEX_TYPES[index_type]
+    params = [f"DISTANCE={DISTANCES[distance]}", f"TYPE={type_name}", f"LIB={lib}"]
+    if index_type.startswith("hnsw"):
+        if m is not None:
+            if not 5 <= m <= 128:
+                raise ValueError("m of an HNSW index must be between 5 and 128")
+            params.append(f"M={m}")
+        if ef_construction is not None:
+            if not 5 <= ef_construction <= 1000:
+                raise ValueError("ef_construction must be between 5 and 1000")
+            params.append(f"EF_CONSTRUCTION={ef_construction}")
+    else:
+        if nlist is not None:
+            if not 1 <= nlist <= 65536:
+                raise ValueError("nlist must be between 1 and 65536")
+            params.append(f"NLIST={nlist}")
+        if index_type == "ivf_pq" and m is not None:
+            # For IVF_PQ, m is the number of subvectors each vector is split into.
+            params.append(f"M={m}")
+    return ", ".join(params)
+
+
+def create_index_sql(table_name: str, column: str, index_name: str, params: str) -> str:
+    return (
+        f"CREATE VECTOR INDEX {quote_identifier(index_name)} ON {quote_identifier(table_name)} "
+        f"({quote_identifier(column)}) WITH ({params})"
+    )
+
+
+def drop_index_sql(table_name: str, index_name: str) -> str:
+    return f"DROP INDEX {quote_identifier(index_name)} ON {quote_identifier(table_name)}"
+
+
+def estimate_memory(rows: int, dim: int, index_type: str, m: int = 16, nlist: int = 128) -> int:
+    """
+    Rough resident size of a vector index in bytes. HNSW keeps every vector, float32 or one
+    byte per dimension for HNSW_SQ, plus about 2 * m int32 neighbor ids per vector on the base
+    layer and a 1/m share of that on the upper layers. IVF indexes keep nlist float32
+    centroids, IVF_PQ also a 256 entry codebook per subvector.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported vector index type: {index_type}, expected one of {list(INDEX_TYPES)}"
+        )
+    if index_type.startswith("hnsw"):
+        value_bytes = 1 if index_type == "hnsw_sq" else 4
+        neighbors = 2 * m * 4 * (1 + 1 / m)
+        return int(rows * (dim * value_bytes + neighbors))
+    centroids = nlist * dim * 4
+    if index_type == "ivf_pq":
+        centroids += 256 * dim * 4
+    return int(centroids)
+
+
+def table_stats(cursor, table_name: str, column: str) -> tuple:
+    """Estimated row count of the table and dimension of its vector column."""
+    cursor.execute(_TABLE_STATS_SQL, (table_name, column))
+    result = cursor.fetchall()
+    if not result:
+        raise ValueError(f"Column {column} of table {table_name} does not exist")
+    rows, column_type = result[0]
+    match = _VECTOR_DIM_RE.search(str(column_type))
+    if not match:
+        raise ValueError(f"Column {column} of table {table_name} is {column_type}, not a vector")
+    return int(rows or 0), int(match.group(1))
+
+
+def list_indexes(cursor, table_name: str) -> List[VectorIndex]:
+    cursor.execute(f"SHOW INDEX FROM {quote_identifier(table_name)}")
+    columns = [desc[0].lower() for desc in cursor.description]
+    indexes = []
+    for row in cursor.fetchall():
+        entry = dict(zip(columns, row))
+        if "vector" not in str(entry.get("index_type", "")).lower():
+            continue
+        indexes.append(
+            VectorIndex(
+                name=entry["key_name"],
+                column=entry["column_name"],
+                index_type=entry.get("index_type"),
+            )
+        )
+    return indexes
+
+
+def build_progress(cursor, table_name: str) -> Optional[List[IndexBuild]]:
+    """
+    Index builds running on `table_name`, None if its table id or GV$SESSION_LONGOPS cannot be
+    read. TARGET identifies the table by id, so the id is looked up in DBA_OBJECTS first.
+    """
+    try:
+        cursor.execute(_TABLE_ID_SQL, (table_name,))
+        table_ids = cursor.fetchall()
+        if not table_ids:
+            return None
+        target_re = re.compile(rf"(?<!\d){int(table_ids[0][0])}(?!\d)")
+        cursor.execute(_LONGOPS_SQL)
+        rows = cursor.fetchall()
+    except Error as e:
+        logger.warning(f"Cannot read index build progress: {e}")
+        return None
+    builds = []
+    for svr_ip, svr_port, opname, target, start, elapsed, remaining, message in rows:
+        if not target_re.search(str(target or "")):
+            continue
+        builds.append(
+            IndexBuild(
+                svr_ip=svr_ip,
+                svr_port=svr_port,
+                operation=opname,
+                target=target,
+                start_time=str(start) if start is not None else None,
+                elapsed_seconds=elapsed,
+                time_remaining=remaining,
+                progress={k: v.strip() for k, v in _LONGOPS_FIELD_RE.findall(message or "")},
+            )
+        )
+    return builds
+
+
+def vector_memory(cursor) -> Optional[List[dict]]:
+    """Vector index memory per server, None on versions without GV$OB_VECTOR_MEMORY."""
+    try:
+        cursor.execute(_VECTOR_MEMORY_SQL)
+        columns = [desc[0].lower() for desc in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except Error as e:
+        logger.warning(f"Cannot read vector index memory: {e}")
+        return None
@@ -1,10 +1,119 @@
 # tests/conftest.py
 import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 
 import mysql.connector
 import pytest
 from mysql.connector import Error
 
+# oceanbase_mcp.server reads its connection settings from the environment at import time.
+os.environ.setdefault("OB_HOST", "127.0.0.1")
+os.environ.setdefault("OB_PORT", "2881")
+os.environ.setdefault("OB_USER", "root")
+os.environ.setdefault("OB_PASSWORD", "testpassword")
+os.environ.setdefault("OB_DATABASE", "test_db")
+# The caches and stores the server keeps on disk go to a temporary directory, never to $HOME.
+_STATE_DIR = tempfile.mkdtemp(prefix="oceanbase_mcp_test_")
+os.environ["OB_DOC_CACHE_DIR"] = os.path.join(_STATE_DIR, "doc_cache")
+os.environ["OB_PLAN_BASELINE_PATH"] = os.path.join(_STATE_DIR, "plan_baselines.json")
+os.environ["OB_EF_SEARCH_PATH"] = os.path.join(_STATE_DIR, "ef_search.json")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_STATE_DIR, ignore_errors=True)
+
+
+class FakeCursor:
+    """
+    Cursor of FakePool. A statement is answered by the first (pattern, result) response whose
+    pattern occurs in its SQL. result is a list of row tuples, a (columns, rows) pair for
+    statements read through cursor.description, an exception to raise, or a function of
+    (sql, params) returning one of those. Statements without rows report one affected row.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.description = None
+        self.with_rows = False
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.pool.executed.append((sql, params))
+        result = next(
+            (result for pattern, result in self.pool.responses if pattern in sql), None
+        )
+        if callable(result):
+            result = result(sql, params)
+        if isinstance(result, Exception):
+            raise result
+        columns = None
+        if isinstance(result, tuple):
+            columns, result = result
+        self.description = [(column,) for column in columns] if columns else None
+        self._rows = list(result or [])
+        self.with_rows = bool(columns)
+        self.rowcount = len(self._rows) if self._rows or columns else 1
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakePool:
+    """
+    Stand-in for OBConnectionPool that is also its only connection. Records every statement
+    as (sql, params) in `executed` and counts commits and rollbacks.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.executed = []
+        self.autocommit = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    @property
+    def statements(self):
+        return [sql for sql, _ in self.executed]
+
+
+@pytest.fixture
+def fake_pool():
+    """FakePool factory, takes (pattern, result) responses, see FakeCursor."""
+    return FakePool
+
 
 @pytest.fixture(scope="session")
 def oceanbase_connection():
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+
+from oceanbase_mcp import ash_reports
+from oceanbase_mcp.ash_reports import (
+    TIME_FORMAT,
+    AshReportJobs,
+    AshReportStore,
+    compare_section,
+    parse_report_tables,
+    report_key,
+)
+
+REPORT = """
+                                      ASH Report
+
+Top Foreground DB Time:
+  - this section lists top foreground db time categorized by event
++--------------------+-----------+---------------+
+|     Event Name     |Event Class|Event Samples  |
++--------------------+-----------+---------------+
+|       ON CPU       |  ON CPU   |      120      |
+|   db file data read|  USER_IO  |       30      |
++--------------------+-----------+---------------+
+
+Top Sessions:
++----------+---------------+
+|Session ID| Event Samples |
++----------+---------------+
+|  3221487 |      80       |
++----------+---------------+
+
+Top SQL with Top Events:
++----------------------------------+-------------+
+|              SQL ID              |Event Samples|
++----------------------------------+-------------+
+| 1D0BA376E273B9D622641124D8C59264 |     {sql}     |
++----------------------------------+-------------+
+"""
+
+
+def test_parse_report_tables():
+    tables = parse_report_tables(REPORT.format(sql=90))
+    assert list(tables) == [
+        "Top Foreground DB Time",
+        "Top Sessions",
+        "Top SQL with Top Events",
+    ]
+    assert tables["Top Foreground DB Time"][1] == {
+        "Event Name": "db file data read",
+        "Event Class": "USER_IO",
+        "Event Samples": "30",
+    }
+
+
+def test_compare_section():
+    base = [{"SQL ID": "A", "Samples": "10"}, {"SQL ID": "B", "Samples": "5"}]
+    target = [{"SQL ID": "A", "Samples": "25"}, {"SQL ID": "C", "Samples": "1"}]
+    result = compare_section(base, target)
+    assert result["key"] == "SQL ID"
+    assert result["changed"][0]["delta"] == {"Samples": 15.0}
+    assert result["only_in_base"] == [base[1]]
+    assert result["only_in_target"] == [target[1]]
+
+
+def test_report_key_validates_times():
+    assert report_key("2025-01-01 00:00:00", "2025-01-01 01:00:00", None)[2] == "all"
+    with pytest.raises(ValueError):
+        report_key("yesterday", "2025-01-01 01:00:00", None)
+
+
+def test_jobs_run_in_background_and_are_cached(tmp_path):
+    release = threading.Event()
+    calls = []
+
+    def run_report(start_time, end_time, tenant_id):
+        calls.append((start_time, end_time, tenant_id))
+        release.wait(5)
+        return REPORT.format(sql=90)
+
+    jobs = AshReportJobs(run_report, AshReportStore(str(tmp_path)))
+    job = jobs.submit("2025-01-01 00:00:00", "2025-01-01 01:00:00", "1002")
+    assert jobs.wait(job.job_id, 0.1).status in ("queued", "running")
+    # The same window is not generated twice while it is running.
+    assert (
+        jobs.submit("2025-01-01 00:00:00", "2025-01-01 01:00:00", "1002").job_id
+        == job.job_id
+    )
+    release.set()
+    done = jobs.wait(job.job_id, 5)
+    assert done.status == "done" and done.progress == 1.0
+    report = jobs.report(done)
+    assert report.sections["top_sessions"] == [
+        {"Session ID": "3221487", "Event Samples": "80"}
+    ]
+    assert report.sections["top_sql"][0]["SQL ID"] == "1D0BA376E273B9D622641124D8C59264"
+
+    again = jobs.submit("2025-01-01 00:00:00", "2025-01-01 01:00:00", "1002")
+    assert again.status == "done" and len(calls) == 1
+    # Reports written to the directory are found by a new store.
+    key = report_key("2025-01-01 00:00:00", "2025-01-01 01:00:00", "1002")
+    assert AshReportStore(str(tmp_path)).get(key).text == report.text
+
+
+def test_reports_of_unsettled_windows_expire(monkeypatch, tmp_path):
+    calls = []
+
+    def run_report(start_time, end_time, tenant_id):
+        calls.append(end_time)
+        return REPORT.format(sql=90)
+
+    jobs = AshReportJobs(run_report, AshReportStore(str(tmp_path)), flush_lag=60)
+    now = time.time()
+    start = time.strftime(TIME_FORMAT, time.localtime(now - 600))
+    end = time.strftime(TIME_FORMAT, time.localtime(now))
+    job = jobs.wait(jobs.submit(start, end).job_id, 5)
+    assert job.status == "done" and jobs.report(job) is not None
+    assert jobs.submit(start, end).status == "done" and len(calls) == 1
+    # Not saved, it would outlive the missing samples.
+    assert list(tmp_path.iterdir()) == []
+    monkeypatch.setattr(ash_reports.time, "time", lambda: now + 61)
+    assert jobs.store.get(report_key(start, end, None)) is None
+    jobs.wait(jobs.submit(start, end).job_id, 5)
+    assert len(calls) == 2 and len(list(tmp_path.iterdir())) == 1
+
+
+def test_failed_job_reports_error():
+    def run_report(*args):
+        raise RuntimeError("no ASH data")
+
+    jobs = AshReportJobs(run_report, AshReportStore())
+    job = jobs.wait(jobs.submit("2025-01-01 00:00:00", "2025-01-01 01:00:00").job_id, 5)
+    assert job.status == "failed" and job.error == "no ASH data"
+    with pytest.raises(ValueError):
+        jobs.get("missing")
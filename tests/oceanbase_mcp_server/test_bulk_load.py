@@ -0,0 +1,146 @@
+import io
+import json
+from contextlib import contextmanager
+
+import pytest
+from mysql.connector import Error
+
+from oceanbase_mcp import server
+from oceanbase_mcp.bulk_load import (
+    detect_format,
+    insert_sql,
+    read_batches,
+    write_csv_chunk,
+)
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_text("id,name\n1,alice\n2,\n3,carol\n4,dave\n5,erin\n")
+    return str(path)
+
+
+def test_detect_format():
+    assert detect_format("/data/x.ndjson") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("/data/x.xlsx")
+
+
+def test_csv_batches_and_resume(csv_file):
+    columns, batches = read_batches(csv_file, "csv", batch_size=2)
+    assert columns == ["id", "name"]
+    assert list(batches) == [
+        [("1", "alice"), ("2", None)],
+        [("3", "carol"), ("4", "dave")],
+        [("5", "erin")],
+    ]
+
+    _, batches = read_batches(csv_file, "csv", batch_size=10, start_row=3)
+    assert list(batches) == [[("4", "dave"), ("5", "erin")]]
+
+
+def test_jsonl_batches(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text('{"id": 1, "meta": {"a": 1}}\n\n{"id": 2}\n')
+    columns, batches = read_batches(str(path), "jsonl", batch_size=10)
+    assert columns == ["id", "meta"]
+    assert list(batches) == [[(1, '{"a": 1}'), (2, None)]]
+
+
+def test_parquet_batches(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "nums.parquet")
+    pq.write_table(pa.table({"id": [1, 2, 3], "v": [0.5, None, 1.5]}), path)
+    columns, batches = read_batches(path, "parquet", batch_size=2)
+    assert columns == ["id", "v"]
+    assert list(batches) == [[(1, 0.5), (2, None)], [(3, 1.5)]]
+
+
+def test_sql_and_chunk_layout():
+    assert (
+        insert_sql("t`1", ["a", "b"]) == "INSERT INTO `t``1` (`a`, `b`) VALUES (%s, %s)"
+    )
+    out = io.StringIO()
+    write_csv_chunk([(1, 'say "hi"'), (None, "x,y")], out)
+    assert out.getvalue() == '"1","say ""hi"""\nNULL,"x,y"\n'
+
+
+class FakeLoadConnection:
+    def __init__(self, fail_on_batch=None):
+        self.batches = []
+        self.fail_on_batch = fail_on_batch
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def executemany(self, sql, rows):
+                if len(conn.batches) == conn.fail_on_batch:
+                    raise Error("Duplicate entry")
+                conn.batches.append(rows)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def use_connection(monkeypatch, conn):
+    @contextmanager
+    def connection():
+        yield conn
+
+    monkeypatch.setattr(server.db_pool, "connection", connection)
+
+
+def test_bulk_load_reports_resume_row_on_failure(monkeypatch, csv_file):
+    conn = FakeLoadConnection(fail_on_batch=1)
+    use_connection(monkeypatch, conn)
+    summary = json.loads(server.bulk_load(csv_file, "people", batch_size=2))
+    assert summary["status"] == "failed"
+    assert summary["rows_loaded"] == 2
+    assert summary["resume_from_row"] == 2
+
+    conn = FakeLoadConnection()
+    use_connection(monkeypatch, conn)
+    summary = json.loads(
+        server.bulk_load(csv_file, "people", batch_size=2, start_row=2)
+    )
+    assert summary["status"] == "completed"
+    assert summary["rows_loaded"] == 3
+    assert conn.batches[0][0] == ("3", "carol")
+
+
+def test_tsv_defaults_to_tab_delimiter(tmp_path):
+    path = tmp_path / "people.tsv"
+    path.write_text("id\tname\n1\talice, jr\n")
+    columns, batches = read_batches(str(path), detect_format(str(path)), batch_size=10)
+    assert columns == ["id", "name"]
+    assert list(batches) == [[("1", "alice, jr")]]
+
+
+def test_bulk_load_reports_resume_row_on_malformed_jsonl(monkeypatch, tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text('{"id": 1}\n{"id": 2}\n{"id": 3\n[4]\n')
+    conn = FakeLoadConnection()
+    use_connection(monkeypatch, conn)
+    summary = json.loads(server.bulk_load(str(path), "docs", batch_size=2))
+    assert summary["status"] == "failed"
+    assert "line 3" in summary["error"]
+    assert summary["rows_loaded"] == 2
+    assert summary["resume_from_row"] == 2
+
+    path.write_text('{"id": 1}\n[2]\n')
+    with pytest.raises(ValueError, match="Line 2 is not a JSON object"):
+        list(read_batches(str(path), "jsonl", batch_size=10)[1])
@@ -0,0 +1,105 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from oceanbase_mcp import doc_cache as doc_cache_module
+from oceanbase_mcp import server
+from oceanbase_mcp.doc_cache import DocCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(doc_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_but_stay_available_as_stale(tmp_path, clock):
+    cache = DocCache(str(tmp_path), ttl=60)
+    cache.put("doc", "1", {"title": "OceanBase"})
+    assert cache.get("doc", "1") == {"title": "OceanBase"}
+    clock[0] += 61
+    assert cache.get("doc", "1") is None
+    assert cache.get("doc", "1", allow_stale=True) == {"title": "OceanBase"}
+    # A new instance reads the same file.
+    cache.close()
+    assert DocCache(str(tmp_path), ttl=60).get("doc", "1", allow_stale=True) is not None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = DocCache(str(tmp_path), max_bytes=250)
+    for key in ("1", "2"):
+        cache.put("doc", key, "x" * 100)
+        clock[0] += 1
+    cache.get("doc", "1")
+    clock[0] += 1
+    cache.put("doc", "3", "x" * 100)
+    assert cache.get("doc", "2") is None
+    assert cache.get("doc", "1") is not None
+    assert cache.stats()["bytes"] <= 250
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "doc_cache", DocCache(str(tmp_path)))
+    calls = []
+    release = threading.Event()
+
+    def post(url, payload):
+        calls.append(url)
+        if "searchDocList" in url:
+            return [{"id": "100", "urlCode": "oceanbase-doc"}]
+        if payload["id"] == "slow":
+            release.wait(5)
+        return {
+            "docContent": "<html><script>x()</script><p>Vector index</p></html>",
+            "tdkInfo": {"title": "Vector", "description": "d", "keyword": "k"},
+            "version": "V4.3.5",
+            "docGmtModified": "2025-01-01",
+        }
+
+    monkeypatch.setattr(server, "_post_doc_api", post)
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(server, "doc_fetch_executor", executor)
+    yield calls
+    release.set()
+    # A fetch still running would write to the real cache once the patches are undone.
+    executor.shutdown(wait=True)
+
+
+def test_search_is_served_from_cache(docs):
+    first = json.loads(server.search_oceanbase_document("vector index"))
+    assert first[0]["content"] == "Vector index"
+    assert len(docs) == 2
+    assert json.loads(server.search_oceanbase_document("Vector  Index")) == first
+    assert len(docs) == 2
+
+
+def test_offline_mode_and_unreachable_api_use_cache(docs, monkeypatch):
+    server.search_oceanbase_document("vector index")
+    monkeypatch.setattr(server, "OB_DOC_OFFLINE", True)
+    assert server.search_oceanbase_document("unknown") == "No results were found"
+
+    monkeypatch.setattr(server, "OB_DOC_OFFLINE", False)
+    monkeypatch.setattr(server.doc_cache, "ttl", 1e-9)
+
+    def unreachable(url, payload):
+        raise httpx.ConnectError("Name or service not known")
+
+    monkeypatch.setattr(server, "_post_doc_api", unreachable)
+    assert (
+        json.loads(server.search_oceanbase_document("vector index"))[0]["title"]
+        == "Vector"
+    )
+
+
+def test_slow_document_returns_partial_results(docs, monkeypatch):
+    monkeypatch.setattr(server, "OB_DOC_FETCH_DEADLINE", 0.5)
+    items = [{"id": "100", "urlCode": "fast"}, {"id": "slow", "urlCode": "slow"}]
+    monkeypatch.setattr(server, "_search_doc_list", lambda keyword: items)
+    fast, slow = json.loads(server.search_oceanbase_document("vector"))
+    assert fast["title"] == "Vector"
+    assert slow["result"] == "Document not loaded in time"
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from oceanbase_mcp import server
+from oceanbase_mcp.doc_index import LocalDocIndex, build_index, main, read_document
+
+
+@pytest.fixture
+def source(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "vector").mkdir(parents=True)
+    (docs / "vector" / "hnsw.md").write_text(
+        "---\nslug: hnsw\n---\n# HNSW 向量索引\n\nCreate an HNSW index with "
+        "[CREATE VECTOR INDEX](create.md). HNSW supports ef_search.\n",
+        encoding="utf-8",
+    )
+    (docs / "backup.html").write_text(
+        "<html><head><title>Backup and restore</title></head>"
+        "<body><p>Physical backup of a tenant.</p></body></html>",
+        encoding="utf-8",
+    )
+    (docs / "notes.txt").write_text("HNSW", encoding="utf-8")
+    return docs
+
+
+def test_read_markdown_document(source):
+    title, text = read_document(str(source / "vector" / "hnsw.md"))
+    assert title == "HNSW 向量索引"
+    assert (
+        "slug" not in text and "CREATE VECTOR INDEX" in text and "create.md" not in text
+    )
+
+
+def test_build_and_search(source, tmp_path):
+    meta = build_index(str(source), str(tmp_path / "index"))
+    assert meta["documents"] == 2
+    index = LocalDocIndex(str(tmp_path / "index"))
+    ((doc_id, score),) = index.search("HNSW ef_search")
+    doc = index.document(doc_id)
+    assert doc["path"].endswith("hnsw.md") and score > 0
+    assert index.document(index.search("向量索引")[0][0])["title"] == "HNSW 向量索引"
+    assert index.search("backup")[0][0] != doc_id
+    assert index.search("sharding") == []
+    index.close()
+
+
+def test_build_command(source, tmp_path, capsys):
+    main([str(source), str(tmp_path / "index")])
+    assert "Indexed 2 documents" in capsys.readouterr().out
+
+
+def test_search_tool_uses_local_index(source, tmp_path, monkeypatch):
+    build_index(str(source), str(tmp_path / "index"))
+    monkeypatch.setattr(
+        server, "local_doc_index", LocalDocIndex(str(tmp_path / "index"))
+    )
+
+    def unreachable(*args):
+        raise AssertionError("the remote API must not be called")
+
+    monkeypatch.setattr(server, "_search_doc_list", unreachable)
+    (result,) = json.loads(server.search_oceanbase_document("physical backup"))
+    assert result["title"] == "Backup and restore"
+    monkeypatch.setattr(server, "OB_DOC_REMOTE_FALLBACK", False)
+    assert server.search_oceanbase_document("sharding") == "No results were found"
@@ -0,0 +1,43 @@
+from oceanbase_mcp.doc_text import (
+    bm25_scores,
+    html_to_text,
+    select_passages,
+    split_passages,
+    tokenize,
+)
+
+
+def test_html_to_text_drops_scripts_and_blank_lines():
+    html = "<html><nav>menu</nav><h1> Title </h1>\n\n<p>Body</p><script>x()</script></html>"
+    assert html_to_text(html) == "Title\nBody"
+
+
+def test_tokenize_mixes_words_and_chinese_bigrams():
+    assert tokenize("HNSW 向量索引") == ["hnsw", "向量", "量索", "索引"]
+
+
+def test_split_passages_respects_size():
+    text = "\n".join(f"line {i} " + "x" * 40 for i in range(20))
+    passages = split_passages(text, passage_chars=200)
+    assert all(len(passage) <= 200 for passage in passages)
+    assert "\n".join(passages) == text
+
+
+def test_bm25_prefers_matching_passage():
+    scores = bm25_scores([["hnsw", "index"], ["backup", "restore"]], ["hnsw"])
+    assert scores[0] > 0 and scores[1] == 0
+
+
+def test_select_passages_returns_relevant_text_within_budget():
+    filler = "\n".join(
+        f"Unrelated paragraph {i} about backups and restore." for i in range(200)
+    )
+    relevant = "Create an HNSW vector index with CREATE VECTOR INDEX."
+    text = filler + "\n" + relevant + "\n" + filler
+    selected = select_passages(text, "HNSW vector index", budget=500, passage_chars=200)
+    assert relevant in selected
+    assert len(selected) <= 500
+    # Nothing matches, the beginning of the document is returned.
+    assert select_passages(text, "sharding", budget=100).startswith(
+        "Unrelated paragraph 0"
+    )
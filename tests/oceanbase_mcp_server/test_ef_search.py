@@ -0,0 +1,153 @@
+import json
+
+import numpy as np
+import pytest
+
+from oceanbase_mcp import server
+from oceanbase_mcp.ef_search import EfSearchStore, tune_ef_search
+from oceanbase_mcp.vec_clients import ObVecClientRegistry
+from oceanbase_mcp.vector_bench import LocalBackend
+
+
+@pytest.fixture
+def backend():
+    rng = np.random.default_rng(7)
+    return LocalBackend(
+        list(range(2000)), rng.normal(size=(2000, 8)).astype(np.float32)
+    )
+
+
+def test_tuner_finds_the_smallest_ef_search_meeting_the_target(backend):
+    tuning = tune_ef_search(
+        backend, "docs", "vector", target_recall=0.6, k=10, queries=40
+    )
+    setting = tuning.setting
+    assert setting.met_target and setting.holdout_recall > 0
+    recall = {point.ef_search: point.recall for point in tuning.tried}
+    assert recall[setting.ef_search] >= 0.6
+    # The value just below the answer was tried and missed the target.
+    assert recall[setting.ef_search - 1] < 0.6
+    assert len(tuning.tried) <= 12
+
+
+def test_tuner_reports_an_unreachable_target(backend):
+    tuning = tune_ef_search(
+        backend, "docs", "vector", target_recall=1.0, max_ef_search=20
+    )
+    assert not tuning.setting.met_target and tuning.setting.ef_search == 20
+    with pytest.raises(ValueError):
+        tune_ef_search(backend, "docs", "vector", target_recall=1.5)
+
+
+def test_store_keeps_settings_per_profile(tmp_path, backend):
+    path = tmp_path / "ef_search.json"
+    setting = tune_ef_search(
+        backend, "docs", "vector", target_recall=0.5, queries=10
+    ).setting
+    EfSearchStore(str(path)).put("root@host:2881", setting)
+    store = EfSearchStore(str(path))
+    assert store.get("root@host:2881", "docs", "vector") == setting
+    assert store.get("other@host:2881", "docs", "vector") is None
+    assert store.remove("root@host:2881", "docs", "vector")
+    assert EfSearchStore(str(path)).get("root@host:2881", "docs", "vector") is None
+
+
+class FakeDbapiConnection:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def cursor(self):
+        executed = self.executed
+
+        class Cursor:
+            def execute(self, sql):
+                executed.append(sql)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.info = {}
+        self.connection = FakeDbapiConnection(self.executed)
+
+
+def test_session_variables_are_set_only_when_they_change():
+    registry = ObVecClientRegistry()
+    conn = FakeConnection()
+
+    def run():
+        registry._apply_session(conn, None, "SELECT 1", None, None, False)
+
+    with registry.session_variables(ob_hnsw_ef_search=64):
+        run()
+        run()
+    run()
+    assert conn.executed == [
+        "SET SESSION ob_hnsw_ef_search = 64",
+        "SET SESSION ob_hnsw_ef_search = DEFAULT",
+    ]
+    with pytest.raises(ValueError):
+        with registry.session_variables(ob_query_timeout=1):
+            pass
+
+
+def test_vector_search_uses_the_tuned_value(monkeypatch, tmp_path):
+    from test_vector_search import FakeClient, FakeRegistry
+
+    registry = FakeRegistry(FakeClient())
+    monkeypatch.setattr(server, "vec_clients", registry)
+    monkeypatch.setattr(
+        server, "ef_search_settings", EfSearchStore(str(tmp_path / "ef.json"))
+    )
+    server.oceabase_vector_search("docs", [0.5])
+    rng = np.random.default_rng(1)
+    setting = tune_ef_search(
+        LocalBackend(list(range(100)), rng.normal(size=(100, 4))), "docs", "vector", 0.5
+    ).setting
+    server.ef_search_settings.put(server._baseline_profile(), setting)
+    server.oceabase_vector_search("docs", [0.5])
+    server.oceabase_vector_search("docs", [0.5], ef_search=300)
+    assert registry.session == [
+        {"ob_hnsw_ef_search": None},
+        {"ob_hnsw_ef_search": setting.ef_search},
+        {"ob_hnsw_ef_search": 300},
+    ]
+    registry.session.clear()
+    server.oceanbase_hybrid_search("docs", [0.5], ef_search=40)
+    server.oceanbase_hybrid_search("docs", [0.5])
+    server.oceanbase_vector_search_batch("docs", [[0.5], [0.25]], ef_search=50)
+    assert registry.session == [
+        {"ob_hnsw_ef_search": 40},
+        {"ob_hnsw_ef_search": setting.ef_search},
+        {"ob_hnsw_ef_search": 50},
+        {"ob_hnsw_ef_search": 50},
+    ]
+
+
+def test_tool_saves_the_setting(monkeypatch, tmp_path, fake_pool):
+    from test_vector_bench import vector_table
+
+    rng = np.random.default_rng(3)
+    monkeypatch.setattr(
+        server,
+        "db_pool",
+        vector_table(fake_pool, list(range(300)), rng.normal(size=(300, 4))),
+    )
+    monkeypatch.setattr(
+        server, "ef_search_settings", EfSearchStore(str(tmp_path / "ef.json"))
+    )
+    result = json.loads(
+        server.tune_vector_ef_search("docs", target_recall=0.9, queries=10)
+    )
+    # The fake pool answers exactly, the smallest ef_search that returns k rows suffices.
+    assert result["setting"]["ef_search"] == 10 and result["holdout"]["recall"] == 1.0
+    saved = server.ef_search_settings.get(server._baseline_profile(), "docs", "vector")
+    assert saved.ef_search == 10
+    assert json.loads(server.tune_vector_ef_search("docs", reset=True)) == {
+        "reset": True
+    }
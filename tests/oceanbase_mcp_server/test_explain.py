@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from oceanbase_mcp.explain import (
+    diff_plans,
+    explain,
+    parse_json_plan,
+    parse_text_plan,
+    summarize,
+)
+
+FULL_SCAN_PLAN = """\
+==========================================================
+|ID|OPERATOR           |NAME|EST.ROWS|EST.TIME(us)|
+----------------------------------------------------------
+|0 |HASH JOIN          |    |98      |1520        |
+|1 |├─TABLE FULL SCAN  |t2  |100     |5           |
+|2 |└─TABLE FULL SCAN  |t1  |100000  |1400        |
+==========================================================
+Outputs & filters:
+-------------------------------------
+  0 - output([t1.c1], [t2.c2]), filter(nil), rowset=16
+      equal_conds([t1.c1 = t2.c1]), other_conds(nil)
+  1 - output([t2.c1], [t2.c2]), filter(nil), rowset=16
+      access([t2.c1], [t2.c2]), partitions(p0)
+      is_index_back=false, is_global_index=false,
+      range_key([t2.__pk_increment]), range(MIN ; MAX)always true
+  2 - output([t1.c1]), filter(nil), rowset=16
+      access([t1.c1]), partitions(p[0-3])
+      is_index_back=false, is_global_index=false,
+      range_key([t1.__pk_increment]), range(MIN ; MAX)always true
+Used Hint:
+-------------------------------------
+  /*+
+  */
+"""
+
+INDEX_PLAN = """\
+==========================================================
+|ID|OPERATOR                 |NAME      |EST.ROWS|EST.TIME(us)|
+----------------------------------------------------------
+|0 |NESTED-LOOP JOIN         |          |98      |310         |
+|1 |├─TABLE FULL SCAN        |t2        |100     |5           |
+|2 |└─TABLE RANGE SCAN       |t1(idx_c1)|1       |3           |
+==========================================================
+Outputs & filters:
+-------------------------------------
+  2 - output([t1.c1]), filter(nil), rowset=16
+      access([t1.c1]), partitions(p[0-3])
+      is_index_back=true, is_global_index=false,
+      range_key([t1.c1]), range(MIN ; MAX)
+"""
+
+# OceanBase 3.x names every table access TABLE SCAN.
+V3_PLAN = """\
+=============================================
+|ID|OPERATOR   |NAME      |EST. ROWS|COST |
+---------------------------------------------
+|0 |HASH JOIN  |          |98010    |92478|
+|1 | TABLE SCAN|t1        |100000   |38630|
+|2 | TABLE SCAN|t2(idx_c1)|100      |46   |
+|3 | TABLE SCAN|t3        |100      |46   |
+=============================================
+
+Outputs & filters:
+-------------------------------------
+  0 - output([t1.c1], [t2.c2]), filter(nil),
+      equal_conds([t1.c1 = t2.c1]), other_conds(nil)
+  1 - output([t1.c1]), filter(nil),
+      access([t1.c1]), partitions(p0),
+      is_index_back=false,
+      range_key([t1.__pk_increment]), range(MIN ; MAX)always true
+  2 - output([t2.c1], [t2.c2]), filter(nil),
+      access([t2.c1], [t2.c2]), partitions(p0),
+      is_index_back=true,
+      range_key([t2.c1], [t2.__pk_increment]), range(1,MIN ; 10,MAX),
+      range_cond([t2.c1 >= 1], [t2.c1 <= 10])
+  3 - output([t3.c1]), filter(nil),
+      access([t3.c1]), partitions(p0),
+      is_index_back=false,
+      range_key([t3.c1], [t3.c2]), range(MIN,MIN ; MAX,MAX)
+"""
+
+
+def test_parse_text_plan_builds_tree():
+    root = parse_text_plan(FULL_SCAN_PLAN)
+    assert root.operator == "HASH JOIN" and root.cost == 1520
+    assert [child.id for child in root.children] == [1, 2]
+    scan = root.children[1]
+    assert scan.operator == "TABLE FULL SCAN"
+    assert (scan.table, scan.access_path, scan.partitions) == (
+        "t1",
+        "full_scan",
+        "p[0-3]",
+    )
+    assert scan.is_index_back is False and scan.est_rows == 100000
+    assert root.output == "[t1.c1], [t2.c2]"
+
+
+def test_parse_v3_text_plan_tells_full_from_range_scans():
+    root = parse_text_plan(V3_PLAN)
+    full, indexed, composite = root.children
+    assert (root.cost, root.est_rows) == (92478, 98010)
+    assert full.range == "MIN ; MAX always true"
+    assert (full.table, full.access_path) == ("t1", "full_scan")
+    assert (indexed.table, indexed.index, indexed.access_path) == (
+        "t2",
+        "idx_c1",
+        "range_scan",
+    )
+    assert composite.access_path == "full_scan"
+    assert summarize(root)["full_scans"] == ["t1", "t3"]
+
+
+def test_parse_json_plan():
+    plan = {
+        "ID": 1,
+        "OPERATOR": "SORT",
+        "NAME": "",
+        "EST.ROWS": 10,
+        "COST": 50,
+        "CHILD_1": {
+            "ID": 0,
+            "OPERATOR": "TABLE SCAN",
+            "NAME": "t1",
+            "EST.ROWS": 10,
+            "COST": 40,
+        },
+    }
+    root = parse_json_plan(json.dumps(plan))
+    (child,) = root.children
+    assert (root.cost, child.table, child.access_path) == (50, "t1", "full_scan")
+
+
+def test_diff_plans_reports_access_path_change():
+    diff = diff_plans(parse_text_plan(FULL_SCAN_PLAN), parse_text_plan(INDEX_PLAN))
+    assert diff["cheaper"] == "second" and diff["cost_delta"] == -1210
+    (change,) = diff["access_path_changes"]
+    assert change["table"] == "t1"
+    assert change["second"]["index"] == "idx_c1" and change["second"]["is_index_back"]
+    assert diff["first"]["full_scans"] == ["t2", "t1"]
+    assert diff["operators_only_in_second"] == ["NESTED-LOOP JOIN", "TABLE RANGE SCAN"]
+
+
+def test_explain_runs_explain_extended(fake_pool):
+    cursor = fake_pool(
+        ("EXPLAIN", [(line,) for line in INDEX_PLAN.splitlines()])
+    ).cursor()
+    root = explain(cursor, "SELECT * FROM t1 JOIN t2 ON t1.c1 = t2.c1;")
+    assert cursor.pool.statements == [
+        "EXPLAIN EXTENDED SELECT * FROM t1 JOIN t2 ON t1.c1 = t2.c1"
+    ]
+    assert root.children[1].index == "idx_c1"
+    with pytest.raises(ValueError):
+        explain(cursor, "EXPLAIN SELECT 1")
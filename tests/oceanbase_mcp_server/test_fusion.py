@@ -0,0 +1,59 @@
+import pytest
+
+from oceanbase_mcp.fusion import SearchHit, fuse, text_search_sql
+
+
+def hits(*pairs):
+    return [
+        SearchHit(key=key, row=(key, f"doc {key}"), score=score) for key, score in pairs
+    ]
+
+
+def test_rrf_rewards_rows_found_by_both_searches():
+    text = hits((1, 9.0), (2, 5.0), (3, 1.0))
+    vector = hits((3, 0.1), (4, 0.2), (1, 0.3))
+    fused = fuse(text, vector, method="rrf", topk=3)
+    assert [hit.key for hit in fused] == [1, 3, 2]
+    first = fused[0]
+    assert (first.text_rank, first.vector_rank) == (1, 3)
+    assert (first.text_score, first.distance) == (9.0, 0.3)
+    assert first.row == (1, "doc 1")
+    assert first.score == pytest.approx(0.5 / 61 + 0.5 / 63)
+
+
+def test_weighted_normalizes_scores_and_distances():
+    text = hits((1, 10.0), (2, 0.0))
+    vector = hits((2, 0.0), (1, 4.0))
+    assert [
+        hit.key for hit in fuse(text, vector, method="weighted", text_weight=0.8)
+    ] == [1, 2]
+    assert [
+        hit.key for hit in fuse(text, vector, method="weighted", text_weight=0.2)
+    ] == [2, 1]
+    # Inner product is a similarity, the larger value is the better hit.
+    fused = fuse(
+        [], vector, method="weighted", text_weight=0, vector_higher_is_better=True
+    )
+    assert [hit.key for hit in fused] == [1, 2]
+
+
+def test_duplicate_keys_count_once():
+    fused = fuse(hits((1, 3.0), (1, 2.0)), [], method="rrf")
+    assert len(fused) == 1 and fused[0].text_rank == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        fuse([], [], method="max")
+    with pytest.raises(ValueError):
+        fuse([], [], text_weight=1.5)
+
+
+def test_text_search_sql():
+    sql = text_search_sql("docs", ["title", "body"], ["id", "title"], ["lang = 'en'"])
+    assert sql == (
+        "SELECT `id`, `title`, MATCH (`title`, `body`) AGAINST (%s IN NATURAL LANGUAGE MODE) "
+        "AS _text_relevance FROM `docs` WHERE MATCH (`title`, `body`) AGAINST "
+        "(%s IN NATURAL LANGUAGE MODE) AND (lang = 'en') ORDER BY _text_relevance DESC LIMIT %s"
+    )
+    assert text_search_sql("docs", ["body"]).startswith("SELECT *, MATCH")
@@ -0,0 +1,95 @@
+import pytest
+
+from oceanbase_mcp.plan_cache import PlanBaselineStore, detect_regressions, load_plans
+
+
+def plan_row(
+    plan_id, plan_hash, avg_usec, last_active, svr_ip="10.0.0.1", executions=100
+):
+    return (
+        1002,
+        svr_ip,
+        2882,
+        plan_id,
+        "SQL1",
+        plan_hash,
+        "SELECT * FROM t1 WHERE c1 = ?",
+        executions,
+        executions - 1,
+        avg_usec,
+        avg_usec * 3,
+        avg_usec * executions / 2,
+        avg_usec * executions,
+        "2025-01-01 00:00:00",
+        last_active,
+    )
+
+
+@pytest.fixture
+def plan_cursor(fake_pool):
+    def make(plan_rows):
+        explain = [(0, 0, "TABLE FULL SCAN", "t1", 1000, 120.5, "access([t1.c1])")]
+        return fake_pool(("PLAN_EXPLAIN", explain), ("", plan_rows)).cursor()
+
+    return make
+
+
+def test_load_plans_reads_stats_and_operators(plan_cursor):
+    cursor = plan_cursor([plan_row(7, 111, 200.0, "2025-01-01 01:00:00")])
+    (plan,) = load_plans(cursor, sql_id="SQL1")
+    assert plan.plan_hash == "111" and plan.hit_ratio == 0.99
+    assert (
+        plan.operators[0].operator == "TABLE FULL SCAN"
+        and plan.operators[0].cost == 120.5
+    )
+    assert [
+        params for sql, params in cursor.pool.executed if "PLAN_EXPLAIN" in sql
+    ] == [(1002, "10.0.0.1", 2882, 7)]
+
+
+def test_load_plans_matches_whole_table_names(plan_cursor):
+    statements = [
+        "SELECT * FROM t10 WHERE c1 = ?",
+        "SELECT * FROM db.`t1` WHERE c1 = ?",
+        "SELECT * FROM t1_old WHERE c1 = ?",
+        "UPDATE T1 SET c1 = ?",
+    ]
+    rows = []
+    for plan_id, statement in enumerate(statements):
+        row = list(plan_row(plan_id, plan_id, 100.0, "2025-01-01 01:00:00"))
+        row[6] = statement
+        rows.append(tuple(row))
+    cursor = plan_cursor(rows)
+    plans = load_plans(cursor, table="t1", with_operators=False)
+    assert [plan.plan_id for plan in plans] == [1, 3]
+    assert load_plans(cursor, table="t1", limit=1, with_operators=False)[0].plan_id == 1
+    load_plans(cursor, table="t_1%", with_operators=False)
+    sql, params = cursor.pool.executed[-1]
+    assert "LIKE %s ESCAPE" in sql and params == ["%t\\_1\\%%"]
+
+
+def test_plan_flip_is_reported_against_baseline(tmp_path, plan_cursor):
+    store = PlanBaselineStore(str(tmp_path / "baselines.json"))
+    good = load_plans(plan_cursor([plan_row(7, 111, 200.0, "2025-01-01 01:00:00")]))
+    assert store.record("root@host:2881", good) == 1
+
+    current = load_plans(
+        plan_cursor(
+            [
+                plan_row(7, 111, 200.0, "2025-01-01 01:00:00"),
+                plan_row(9, 222, 900.0, "2025-01-02 01:00:00"),
+                plan_row(9, 222, 1100.0, "2025-01-02 01:00:00", svr_ip="10.0.0.2"),
+            ]
+        ),
+        with_operators=False,
+    )
+    # A new store reads the baselines back from disk.
+    reloaded = PlanBaselineStore(str(tmp_path / "baselines.json"))
+    (regression,) = detect_regressions(current, reloaded, "root@host:2881")
+    assert regression.plan_changed
+    assert (regression.current_plan_hash, regression.baseline_plan_hash) == (
+        "222",
+        "111",
+    )
+    assert regression.slowdown == 5.0
+    assert detect_regressions(current, reloaded, "other@host:2881") == []
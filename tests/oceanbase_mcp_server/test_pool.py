@@ -0,0 +1,96 @@
+import pytest
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+from oceanbase_mcp import pool as pool_module
+from oceanbase_mcp.pool import OBConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self.in_transaction = False
+        self.resets = 0
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.healthy:
+            raise Error("Lost connection")
+
+    def is_connected(self):
+        return self.healthy and not self.closed
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def reset_session(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    connections = []
+
+    def fake_connect(**kwargs):
+        conn = FakeConnection()
+        connections.append(conn)
+        return conn
+
+    monkeypatch.setattr(pool_module, "connect", fake_connect)
+    return connections
+
+
+def test_connection_is_reused(opened):
+    pool = OBConnectionPool({"host": "localhost"}, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert len(opened) == 1
+    assert first.resets == 2
+
+
+def test_open_transaction_is_rolled_back_on_return(opened):
+    pool = OBConnectionPool({"host": "localhost"}, size=1)
+    with pool.connection() as conn:
+        conn.in_transaction = True
+    assert conn.rollbacks == 1
+
+
+def test_unhealthy_connection_is_replaced(opened):
+    pool = OBConnectionPool({"host": "localhost"}, size=1)
+    with pool.connection() as conn:
+        pass
+    conn.healthy = False
+    with pool.connection() as replacement:
+        pass
+    assert replacement is not conn
+    assert conn.closed
+
+
+def test_idle_connection_is_evicted(opened, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(pool_module.time, "monotonic", lambda: clock[0])
+    pool = OBConnectionPool({"host": "localhost"}, size=1, idle_timeout=10)
+    with pool.connection() as conn:
+        pass
+    clock[0] += 11
+    with pool.connection() as replacement:
+        pass
+    assert replacement is not conn
+    assert conn.closed
+
+
+def test_acquire_times_out_when_pool_is_exhausted(opened):
+    pool = OBConnectionPool({"host": "localhost"}, size=1, acquire_timeout=0.01)
+    conn = pool.acquire()
+    with pytest.raises(PoolError):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.stats() == {"size": 1, "idle": 1}
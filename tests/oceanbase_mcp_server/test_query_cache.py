@@ -0,0 +1,108 @@
+import pytest
+
+from oceanbase_mcp import query_cache as query_cache_module
+from oceanbase_mcp import server
+from oceanbase_mcp.query_cache import (
+    QueryResultCache,
+    is_cacheable,
+    normalize_sql,
+    written_tables,
+)
+
+
+def test_normalize_sql_keeps_literals():
+    assert normalize_sql("SELECT  *\n FROM t1 WHERE name = 'a  b';") == (
+        "SELECT * FROM t1 WHERE name = 'a  b'"
+    )
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("SELECT * FROM t1", True),
+        ("show columns from t1", True),
+        ("DESCRIBE t1", True),
+        ("SELECT NOW()", False),
+        ("SELECT * FROM t1 FOR UPDATE", False),
+        ("SELECT * FROM oceanbase.GV$OB_SQL_AUDIT", False),
+        ("SHOW PROCESSLIST", False),
+        ("SELECT @@version", False),
+        ("UPDATE t1 SET a = 1", False),
+    ],
+)
+def test_is_cacheable(sql, expected):
+    assert is_cacheable(sql) is expected
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("INSERT INTO t1 VALUES (1)", {"t1"}),
+        ("INSERT IGNORE INTO `db`.`t1` (a) VALUES (1)", {"db", "t1"}),
+        ("UPDATE t1 SET a = 1 WHERE id = 2", {"t1"}),
+        ("DELETE FROM t1 WHERE id = 2", {"t1"}),
+        ("LOAD DATA LOCAL INFILE '/tmp/x.csv' INTO TABLE t1", {"t1"}),
+        ("SET autocommit = 0", None),
+    ],
+)
+def test_written_tables(sql, expected):
+    assert written_tables(sql) == expected
+
+
+def test_hit_miss_and_write_invalidation():
+    cache = QueryResultCache()
+    assert cache.get("SELECT * FROM t1") is None
+    cache.put("SELECT * FROM t1", "id\n1")
+    cache.put("SELECT * FROM t2", "id\n2")
+    assert cache.get("SELECT *  FROM t1;") == "id\n1"
+
+    cache.invalidate_statement("INSERT INTO t1 VALUES (2)")
+    assert cache.get("SELECT * FROM t1") is None
+    assert cache.get("SELECT * FROM t2") == "id\n2"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (2, 2, 1)
+
+
+def test_ddl_clears_cache():
+    cache = QueryResultCache()
+    cache.put("SHOW TABLES", "t1")
+    cache.invalidate_statement("CREATE TABLE t3 (id INT)")
+    assert cache.get("SHOW TABLES") is None
+
+
+def test_entries_expire(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(query_cache_module.time, "monotonic", lambda: clock[0])
+    cache = QueryResultCache(ttl=10)
+    cache.put("SELECT 1", "1")
+    clock[0] += 11
+    assert cache.get("SELECT 1") is None
+
+
+def test_memory_cap_evicts_least_recently_used():
+    cache = QueryResultCache(max_bytes=300)
+    cache.put("SELECT * FROM t1", "a" * 100)
+    cache.put("SELECT * FROM t2", "b" * 100)
+    cache.get("SELECT * FROM t1")
+    cache.put("SELECT * FROM t3", "c" * 100)
+    assert cache.get("SELECT * FROM t2") is None
+    assert cache.get("SELECT * FROM t1") is not None
+    assert cache.stats()["bytes"] <= 300
+
+
+def test_execute_sql_caches_show_and_call_as_text(monkeypatch, fake_pool):
+    pool = fake_pool(
+        ("SHOW", [("Database", "test"), ("Database", "oceanbase")]),
+        ("CALL", [("report text", 1)]),
+    )
+    monkeypatch.setattr(server, "db_pool", pool)
+    monkeypatch.setattr(server, "query_cache", QueryResultCache(ttl=30))
+    show = "SHOW DATABASES"
+    assert server.execute_sql(show) == "Database,test\nDatabase,oceanbase"
+    assert server.query_cache.get(show) == server.execute_sql(show)
+    assert server.execute_sql("CALL report()") == "report text,1"
+    assert len(pool.executed) == 2
+
+
+def test_execute_sql_cache_is_off_by_default():
+    assert server.OB_QUERY_CACHE_TTL == 0 and not server.query_cache.enabled
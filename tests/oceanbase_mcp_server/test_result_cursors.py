@@ -0,0 +1,79 @@
+import pytest
+
+from oceanbase_mcp import result_cursors as result_cursors_module
+from oceanbase_mcp import server
+from oceanbase_mcp.result_cursors import ResultCursorStore
+
+
+class FakeCursor:
+    description = [("id",), ("name",)]
+
+    def __init__(self, n_rows):
+        self._rows = iter([(i, f"name{i}") for i in range(n_rows)])
+
+    def fetchmany(self, size):
+        return [row for _, row in zip(range(size), self._rows)]
+
+
+def open_cursor(store, n_rows):
+    closed = []
+    token = store.open(FakeCursor(n_rows), closed.append)
+    return token, closed
+
+
+def test_pages_until_exhausted():
+    store = ResultCursorStore()
+    token, closed = open_cursor(store, 5)
+
+    columns, rows, token = store.fetch(token, 2)
+    assert columns == ["id", "name"]
+    assert rows == [(0, "name0"), (1, "name1")]
+    _, rows, token = store.fetch(token, 2)
+    assert rows == [(2, "name2"), (3, "name3")]
+    _, rows, token = store.fetch(token, 2)
+    assert rows == [(4, "name4")]
+    assert token is None
+    assert closed == [True]
+    assert len(store) == 0
+
+
+def test_exact_multiple_of_page_size_ends_without_empty_page():
+    store = ResultCursorStore()
+    token, closed = open_cursor(store, 4)
+    _, _, token = store.fetch(token, 2)
+    _, rows, token = store.fetch(token, 2)
+    assert len(rows) == 2
+    assert token is None
+    assert closed == [True]
+
+
+def test_expired_cursor_is_closed(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(result_cursors_module.time, "monotonic", lambda: clock[0])
+    store = ResultCursorStore(ttl=10)
+    token, closed = open_cursor(store, 100)
+    store.fetch(token, 10)
+
+    clock[0] += 11
+    store.reap()
+    assert closed == [False]
+    with pytest.raises(ValueError):
+        store.fetch(token, 10)
+
+
+def test_least_recently_used_cursor_is_dropped_when_full():
+    store = ResultCursorStore(max_open=1)
+    _, first_closed = open_cursor(store, 100)
+    open_cursor(store, 100)
+    assert first_closed == [False]
+    assert len(store) == 1
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_execute_sql_rejects_page_size_below_one(monkeypatch, fake_pool, page_size):
+    pool = fake_pool()
+    monkeypatch.setattr(server, "db_pool", pool)
+    result = server.execute_sql("SELECT * FROM t1", page_size=page_size)
+    assert result == "Error executing sql: page_size must be at least 1"
+    # No connection was taken from the pool.
+    assert pool.executed == []
@@ -0,0 +1,73 @@
+import pytest
+
+from oceanbase_mcp import server
+from oceanbase_mcp.query_cache import QueryResultCache
+from oceanbase_mcp.sampling import build_sample_sql, choose_percent, default_projection
+from oceanbase_mcp.schema_catalog import ColumnInfo, TableInfo
+
+
+def test_choose_percent_scales_with_table_size():
+    assert choose_percent(0, 100) == 100.0
+    assert choose_percent(100, 100) == 100.0
+    # Too small to oversample, but still sampled.
+    assert choose_percent(200, 100) == pytest.approx(50.0)
+    assert choose_percent(1_000_000, 100) == pytest.approx(0.03)
+    assert choose_percent(10**15, 100) == 0.000001
+    assert choose_percent(10**10 + 1, 10**10) == 99.999999
+
+
+@pytest.fixture
+def sampled(monkeypatch, fake_pool):
+    """Samples a table of 1,000,000 rows whose statistics have no row count yet."""
+    table = TableInfo(
+        name="events",
+        type="BASE TABLE",
+        estimated_rows=0,
+        columns=[ColumnInfo(name="id", type="int(11)", nullable="NO")],
+    )
+    monkeypatch.setattr(server.schema_catalog, "table", lambda name: table)
+    monkeypatch.setattr(server, "sample_cache", QueryResultCache(ttl=60))
+    pool = fake_pool(
+        ("COUNT(*)", [(1_000_000,)]),
+        ("SAMPLE", (["id"], [(7,), (9,)])),
+    )
+    monkeypatch.setattr(server, "db_pool", pool)
+    return pool
+
+
+def test_sample_counts_tables_without_statistics(sampled):
+    assert server.sample_table("events", limit=100) == "id\n7\n9"
+    assert sampled.statements == [
+        "SELECT COUNT(*) FROM `events`",
+        "SELECT `id` FROM `events` SAMPLE (0.030000) LIMIT 100",
+    ]
+    # The count is cached with the samples.
+    server.sample_table("events", limit=10)
+    assert sampled.statements[2:] == [
+        "SELECT `id` FROM `events` SAMPLE (0.003000) LIMIT 10"
+    ]
+
+
+def test_default_projection_skips_wide_columns():
+    columns = [
+        ("id", "int(11)"),
+        ("body", "longtext"),
+        ("embedding", "VECTOR(3)"),
+        ("name", "varchar(20)"),
+    ]
+    assert default_projection(columns, 10) == ["id", "name"]
+    assert default_projection(columns, 1) == ["id"]
+    assert default_projection([("body", "text")], 10) == ["body"]
+
+
+def test_build_sample_sql():
+    assert build_sample_sql("t1", ["id", "name"], 0.03, 100) == (
+        "SELECT `id`, `name` FROM `t1` SAMPLE (0.030000) LIMIT 100"
+    )
+    assert (
+        build_sample_sql("t1", None, 5, 10, block=True)
+        == "SELECT * FROM `t1` SAMPLE BLOCK (5.000000) LIMIT 10"
+    )
+    assert build_sample_sql("t1", None, 100, 10) == "SELECT * FROM `t1` LIMIT 10"
+    with pytest.raises(ValueError):
+        build_sample_sql("t1", None, 0, 10)
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+
+from oceanbase_mcp.schema_catalog import SchemaCatalog
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.tables = {"t1": "2024-01-01 00:00:00", "t2": "2024-01-01 00:00:00"}
+        self.columns = {
+            "t1": [("id", "int(11)", "NO", "PRI", None, "auto_increment", "")],
+            "t2": [("name", "varchar(255)", "YES", "", None, "", "")],
+        }
+        self.indexes = {"t1": [("PRIMARY", 0, "id")], "t2": []}
+        self.statements = []
+
+    @contextmanager
+    def connection(self):
+        yield FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    @contextmanager
+    def cursor(self):
+        yield FakeCursor(self.db)
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        self.db.statements.append((sql, params))
+        names = params[1:] if len(params) > 1 else list(self.db.tables)
+        if "DBA_OBJECTS" in sql:
+            self.rows = [
+                (name, "BASE TABLE", "", ddl, 10)
+                for name, ddl in self.db.tables.items()
+            ]
+        elif "information_schema.COLUMNS" in sql:
+            self.rows = [(t, *col) for t in names for col in self.db.columns[t]]
+        elif "information_schema.STATISTICS" in sql:
+            self.rows = [(t, *idx) for t in names for idx in self.db.indexes[t]]
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_initial_load_reads_all_tables():
+    db = FakeDatabase()
+    catalog = SchemaCatalog(db, "test")
+    assert [table.name for table in catalog.tables()] == ["t1", "t2"]
+    t1 = catalog.table("T1")
+    assert t1.columns[0].name == "id"
+    assert t1.indexes[0].name == "PRIMARY" and t1.indexes[0].unique
+    assert len(db.statements) == 3
+
+
+def test_refresh_reloads_only_changed_tables():
+    db = FakeDatabase()
+    catalog = SchemaCatalog(db, "test", refresh_interval=0)
+    catalog.tables()
+    db.statements.clear()
+
+    db.tables["t2"] = "2024-02-01 00:00:00"
+    db.columns["t2"].append(("age", "int(11)", "YES", "", None, "", ""))
+    assert [col.name for col in catalog.table("t2").columns] == ["name", "age"]
+    assert [col.name for col in catalog.table("t1").columns] == ["id"]
+    column_queries = [
+        p for sql, p in db.statements if "information_schema.COLUMNS" in sql
+    ]
+    assert column_queries == [["test", "t2"]]
+
+
+def test_refresh_drops_removed_tables():
+    db = FakeDatabase()
+    catalog = SchemaCatalog(db, "test", refresh_interval=0)
+    catalog.tables()
+    del db.tables["t2"]
+    assert catalog.table("t2") is None
+
+
+def test_probe_is_skipped_within_refresh_interval():
+    db = FakeDatabase()
+    catalog = SchemaCatalog(db, "test", refresh_interval=3600)
+    catalog.tables()
+    catalog.table("t1")
+    assert len(db.statements) == 3
+    catalog.mark_stale()
+    catalog.tables()
+    assert len(db.statements) == 6
@@ -0,0 +1,62 @@
+import datetime
+import decimal
+import json
+
+import numpy as np
+import pytest
+
+from oceanbase_mcp import search_results
+from oceanbase_mcp.search_results import format_search_results, search_payload
+from oceanbase_mcp.vector_codec import decode_vector
+
+
+def test_payload_lists_columns_once_and_converts_vectors():
+    rows = [
+        (1, "a", "[1,2.5]", 0.1),
+        (2, "b", np.array([3.0, 4.0], dtype=np.float32), 0.2),
+        (3, "c", None, 0.3),
+    ]
+    payload = search_payload(
+        ["id", "title", "embedding", "distance"], rows, vector_columns=["embedding"]
+    )
+    assert payload == {
+        "columns": ["id", "title", "embedding", "distance"],
+        "rows": [
+            [1, "a", [1.0, 2.5], 0.1],
+            [2, "b", [3.0, 4.0], 0.2],
+            [3, "c", None, 0.3],
+        ],
+    }
+
+
+def test_payload_excludes_and_encodes():
+    payload = search_payload(
+        ["id", "embedding", "distance"],
+        [(1, b"[0.5,0.25]", 0.1)],
+        vector_columns=["embedding"],
+        exclude_columns=["distance"],
+        encode_vectors=True,
+        vector_dtype="float16",
+    )
+    assert payload["columns"] == ["id", "embedding"]
+    assert decode_vector(payload["rows"][0][1], "float16").tolist() == [0.5, 0.25]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_format_handles_database_values(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(search_results, "orjson", None)
+    elif search_results.orjson is None:
+        pytest.skip("orjson is not installed")
+    payload = search_payload(
+        ["id", "price", "created", "name"],
+        [(np.int64(1), decimal.Decimal("9.90"), datetime.date(2024, 5, 1), "数据库")],
+    )
+    output = format_search_results(payload)
+    assert "数据库" in output
+    assert json.loads(output)["rows"] == [[1, "9.90", "2024-05-01", "数据库"]]
+    lines = format_search_results(payload, "jsonl").splitlines()
+    assert json.loads(lines[0]) == {"columns": ["id", "price", "created", "name"]}
+    assert json.loads(lines[1]) == [1, "9.90", "2024-05-01", "数据库"]
+    with pytest.raises(ValueError):
+        format_search_results(payload, "csv")
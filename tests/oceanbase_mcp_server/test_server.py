@@ -1,6 +1,39 @@
-from oceanbase_mcp_server.server import app
+import asyncio
+import time
+
+from oceanbase_mcp.server import app
 
 
 def test_server_initialization():
     """Test that the server initializes correctly."""
     assert app.name == "oceanbase_mcp_server"
+
+
+async def test_blocking_tools_keep_their_schema():
+    tools = {tool.name: tool for tool in await app.list_tools()}
+    schema = tools["execute_sql"].inputSchema
+    assert schema["required"] == ["sql"]
+    assert set(schema["properties"]) == {"sql", "page_size"}
+    assert "Execute an SQL" in tools["execute_sql"].description
+
+
+async def test_blocking_tool_does_not_block_event_loop():
+    from oceanbase_mcp import server
+
+    def slow_execute(sql, page_size=None):
+        time.sleep(0.2)
+        return sql
+
+    started = time.monotonic()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while time.monotonic() - started < 0.15:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    wrapped = server.blocking_executor.wrap(slow_execute)
+    result, _ = await asyncio.gather(wrapped("SELECT 1"), ticker())
+    assert result == "SELECT 1"
+    assert ticks > 5
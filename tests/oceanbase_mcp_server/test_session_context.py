@@ -0,0 +1,47 @@
+import pytest
+from mysql.connector import Error
+
+from oceanbase_mcp.session_context import SessionContextCache
+
+
+@pytest.fixture
+def make_pool(fake_pool):
+    def install(has_tenant_view=True):
+        tenant = (
+            [("sys", 1, "MYSQL", "4.3.5.2", "root@%")]
+            if has_tenant_view
+            else Error("Table 'oceanbase.DBA_OB_TENANTS' doesn't exist")
+        )
+        return fake_pool(
+            ("DBA_OB_TENANTS", tenant),
+            ("SHOW TENANT", [("test_tenant",)]),
+            ("SELECT VERSION()", [("5.7.25-OceanBase-v4.2.1", "app@%")]),
+            ("SHOW GRANTS", [("GRANT ALL PRIVILEGES ON *.* TO 'root'",)]),
+        )
+
+    return install
+
+
+def test_context_is_loaded_once(make_pool):
+    pool = make_pool()
+    cache = SessionContextCache(pool)
+    context = cache.get()
+    assert (context.tenant_name, context.tenant_id, context.compatibility_mode) == (
+        "sys",
+        1,
+        "MYSQL",
+    )
+    assert context.privileges == ["GRANT ALL PRIVILEGES ON *.* TO 'root'"]
+    assert cache.get() is context
+    assert len(pool.executed) == 2
+
+    cache.mark_stale()
+    cache.get()
+    assert len(pool.executed) == 4
+
+
+def test_context_falls_back_to_show_tenant(make_pool):
+    context = SessionContextCache(make_pool(has_tenant_view=False)).get()
+    assert context.tenant_name == "test_tenant"
+    assert context.tenant_id is None
+    assert context.ob_version == "5.7.25-OceanBase-v4.2.1"
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from mysql.connector import Error
+
+from oceanbase_mcp.sql_audit import group_percentiles, top_sql
+
+# SQL_ID, ELAPSED_TIME, CPU, logical reads, RETRY_CNT
+AUDIT_ROWS = [("A", 100.0, 80.0, 10, 0)] * 9 + [
+    ("A", 1000.0, 900.0, 50, 1),
+    ("B", 50.0, 40.0, 5, 3),
+]
+
+
+def audit_rows(sql, params):
+    wanted = params[-2:]
+    return [(row[0], row[1]) for row in AUDIT_ROWS if row[0] in wanted]
+
+
+@pytest.fixture
+def audit_cursor(fake_pool):
+    def make(pushdown=True):
+        aggregated = [
+            ("A", 10, 1900.0, 1620.0, 140, 1, "SELECT a"),
+            ("B", 1, 50.0, 40.0, 5, 3, "SELECT b"),
+        ]
+        return fake_pool(
+            (
+                "GROUP BY SQL_ID\n    ORDER BY",
+                aggregated if pushdown else Error("Size overflow"),
+            ),
+            ("GROUP BY SQL_ID", [("A", "SELECT a"), ("B", "SELECT b")]),
+            ("SQL_ID IN", audit_rows),
+            ("", list(AUDIT_ROWS)),
+        ).cursor()
+
+    return make
+
+
+def test_group_percentiles_match_numpy():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 4, size=500)
+    values = rng.exponential(100, size=500)
+    result = group_percentiles(codes, values, groups=5)
+    for group in range(4):
+        expected = np.percentile(values[codes == group], [50, 95, 99])
+        np.testing.assert_allclose(result[group], expected)
+    assert np.isnan(result[4]).all()
+
+
+def test_top_sql_pushes_aggregation_down(audit_cursor):
+    cursor = audit_cursor()
+    entries = top_sql(cursor, limit=2, batch_size=4)
+    assert [entry.sql_id for entry in entries] == ["A", "B"]
+    a = entries[0]
+    assert (a.executions, a.total_elapsed_us, a.avg_elapsed_us) == (10, 1900.0, 190.0)
+    assert a.p50_elapsed_us == 100.0
+    assert a.p99_elapsed_us == pytest.approx(np.percentile([100.0] * 9 + [1000.0], 99))
+    assert a.sql_text == "SELECT a"
+    assert len(cursor.pool.executed) == 2
+
+
+def test_top_sql_falls_back_to_streaming(audit_cursor):
+    entries = top_sql(
+        audit_cursor(pushdown=False), order_by="retries", limit=2, batch_size=3
+    )
+    assert [entry.sql_id for entry in entries] == ["B", "A"]
+    b, a = entries
+    assert (a.executions, a.total_elapsed_us, a.logical_reads, a.retries) == (
+        10,
+        1900.0,
+        140.0,
+        1.0,
+    )
+    assert b.sql_text == "SELECT b" and b.p95_elapsed_us == 50.0
+
+
+def test_top_sql_rejects_unknown_metric(audit_cursor):
+    with pytest.raises(ValueError):
+        top_sql(audit_cursor(), order_by="memory")
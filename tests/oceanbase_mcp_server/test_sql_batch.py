@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from mysql.connector import Error
+
+from oceanbase_mcp import server
+from oceanbase_mcp.query_cache import QueryResultCache
+
+
+@pytest.fixture
+def pool(monkeypatch, fake_pool):
+    pool = fake_pool(
+        ("BAD", Error("You have an error in your SQL syntax")),
+        ("SELECT", (["id"], [(1,), (2,), (3,)])),
+    )
+    monkeypatch.setattr(server, "db_pool", pool)
+    return pool
+
+
+def test_batch_runs_in_one_transaction(monkeypatch, pool):
+    monkeypatch.setattr(server, "query_cache", QueryResultCache(ttl=30))
+    server.query_cache.put("SELECT * FROM t1", "cached")
+    output = json.loads(
+        server.execute_sql_batch(
+            ["INSERT INTO t1 VALUES (%s)", "SELECT id FROM t1"],
+            params=[[1], None],
+            max_rows=2,
+        )
+    )
+    assert pool.commits == 1
+    assert pool.executed == [
+        ("INSERT INTO t1 VALUES (%s)", [1]),
+        ("SELECT id FROM t1", None),
+    ]
+    first, second = output["results"]
+    assert first["status"] == "ok" and first["rows_affected"] == 1
+    assert second["rows"] == [["1"], ["2"]] and second["truncated"]
+    assert "elapsed_ms" in first
+    assert server.query_cache.get("SELECT * FROM t1") is None
+
+
+def test_batch_rolls_back_on_error(pool):
+    output = json.loads(
+        server.execute_sql_batch(
+            ["INSERT INTO t1 VALUES (1)", "BAD SQL", "INSERT INTO t1 VALUES (2)"]
+        )
+    )
+    assert output["rolled_back"]
+    assert pool.rollbacks == 1 and pool.commits == 0
+    assert [r["status"] for r in output["results"]] == ["ok", "error", "skipped"]
+
+
+def test_autocommit_batch_can_continue_after_error(pool):
+    output = json.loads(
+        server.execute_sql_batch(
+            ["BAD SQL", "INSERT INTO t1 VALUES (2)"],
+            transaction=False,
+            stop_on_error=False,
+        )
+    )
+    assert [r["status"] for r in output["results"]] == ["error", "ok"]
+    assert not output["rolled_back"]
+    assert pool.autocommit is False
+
+
+def test_batch_rejects_mismatched_params(pool):
+    with pytest.raises(ValueError):
+        server.execute_sql_batch(["SELECT 1", "SELECT 2"], params=[None])
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from oceanbase_mcp import vec_clients as vec_clients_module
+from oceanbase_mcp.server import OBConnection
+from oceanbase_mcp.vec_clients import ObVecClientRegistry
+
+
+class FakeObVecClient:
+    instances = []
+
+    def __init__(self, uri, user, password, db_name, **kwargs):
+        self.kwargs = kwargs
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t1 (id INTEGER PRIMARY KEY, name TEXT)"))
+        self.metadata_obj = MetaData()
+        FakeObVecClient.instances.append(self)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    FakeObVecClient.instances = []
+    monkeypatch.setattr(vec_clients_module, "ObVecClient", FakeObVecClient)
+    return ObVecClientRegistry(pool_pre_ping=True)
+
+
+def conn_info(user="root"):
+    return OBConnection(
+        host="127.0.0.1", port=2881, user=user, password="", database="test"
+    )
+
+
+def test_client_is_shared_per_profile(registry):
+    first = registry.get(conn_info())
+    assert registry.get(conn_info()) is first
+    assert registry.get(conn_info(user="other")) is not first
+    assert first.kwargs == {"pool_pre_ping": True}
+
+
+def test_concurrent_get_creates_one_client(registry):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(lambda _: registry.get(conn_info(), "t1"), range(32))
+        )
+    assert len(FakeObVecClient.instances) == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_table_metadata_is_cached_until_forgotten(registry):
+    client = registry.get(conn_info(), "t1")
+    table = client.metadata_obj.tables["t1"]
+    assert registry.get(conn_info(), "t1").metadata_obj.tables["t1"] is table
+
+    registry.forget_tables(["t1"])
+    assert "t1" not in client.metadata_obj.tables
+    registry.get(conn_info(), "t1")
+    assert client.metadata_obj.tables["t1"] is not table
@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+import pytest
+
+from oceanbase_mcp import server, vector_bench
+from oceanbase_mcp.vector_bench import LocalBackend, exact_topk, run_benchmark
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(42)
+    return list(range(100, 1100)), rng.normal(size=(1000, 16)).astype(np.float32)
+
+
+@pytest.mark.parametrize("distance", ["l2", "cosine", "inner product"])
+def test_exact_topk_matches_a_full_sort(corpus, distance):
+    _, vectors = corpus
+    queries = vectors[:5] + 0.01
+    if distance == "l2":
+        distances = np.linalg.norm(vectors[None, :, :] - queries[:, None, :], axis=2)
+    elif distance == "cosine":
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        distances = -(queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ unit.T
+    else:
+        distances = -(queries @ vectors.T)
+    expected = np.argsort(distances, axis=1, kind="stable")[:, :7]
+    np.testing.assert_array_equal(exact_topk(vectors, queries, 7, distance), expected)
+
+
+def test_recall_grows_with_ef_search(corpus):
+    ids, vectors = corpus
+    report = run_benchmark(
+        LocalBackend(ids, vectors), k=10, queries=50, ef_search_values=[16, 64, 250]
+    )
+    assert (report["rows"], report["queries"], report["k"]) == (1000, 50, 10)
+    recalls = [point["recall"] for point in report["results"]]
+    assert recalls == sorted(recalls) and recalls[0] < 0.5
+    # ef_search * 4 rows covers the whole table, the search is exact.
+    assert recalls[-1] == 1.0
+    assert all(
+        point["qps"] > 0 and point["p99_ms"] >= point["p50_ms"]
+        for point in report["results"]
+    )
+
+
+def test_rejects_tables_with_too_few_rows(corpus):
+    ids, vectors = corpus
+    with pytest.raises(ValueError):
+        run_benchmark(LocalBackend(ids[:5], vectors[:5]), k=10)
+
+
+def vector_table(fake_pool, ids, vectors):
+    """fake_pool holding a vector table, both of its searches are exact l2 searches."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    def nearest(sql, params):
+        query = np.array(json.loads(params[0]), dtype=np.float32)
+        order = np.argsort(np.linalg.norm(vectors - query, axis=1), kind="stable")
+        return [(ids[i],) for i in order[: params[1]]]
+
+    def sample(sql, params):
+        seed, size = params
+        positions = np.random.default_rng(seed).permutation(len(ids))[:size]
+        # Vector columns come back in their text form.
+        return [(ids[i], json.dumps(vectors[i].tolist())) for i in positions]
+
+    return fake_pool(
+        ("COUNT(", [(len(ids),)]),
+        ("APPROXIMATE", nearest),
+        ("ORDER BY RAND", sample),
+        ("ORDER BY l2_distance", nearest),
+    )
+
+
+def test_tool_sets_and_resets_ef_search(monkeypatch, fake_pool, corpus):
+    ids, vectors = corpus
+    pool = vector_table(fake_pool, ids[:200], vectors[:200])
+    monkeypatch.setattr(server, "db_pool", pool)
+    report = json.loads(
+        server.benchmark_vector_search("docs", k=5, queries=10, ef_search_values=[40])
+    )
+    assert report["rows"] == 200 and report["queries"] == 10
+    assert report["results"][0]["ef_search"] == 40
+    assert report["results"][0]["recall"] == 1.0
+    statements = pool.statements
+    assert statements.count("SET SESSION ob_hnsw_ef_search = %s") == 10
+    assert statements.count("SET SESSION ob_hnsw_ef_search = DEFAULT") == 10
+    assert "ORDER BY l2_distance(`vector`, %s) APPROXIMATE LIMIT %s" in statements[-2]
+
+
+def test_tool_only_fetches_the_query_rows(monkeypatch, fake_pool, corpus):
+    ids, vectors = corpus
+    pool = vector_table(fake_pool, ids, vectors)
+    monkeypatch.setattr(server, "db_pool", pool)
+    server.benchmark_vector_search("docs", k=5, queries=10, ef_search_values=[40])
+    fetched = [params for sql, params in pool.executed if "`vector` FROM" in sql]
+    assert fetched == [(0, 10)]
+    # The exact neighbors are searched on the server, one query each, without the index.
+    exact = [
+        params
+        for sql, params in pool.executed
+        if "l2_distance" in sql and "APPROXIMATE" not in sql
+    ]
+    assert len(exact) == 10 and all(params[1] == 6 for params in exact)
+
+
+def test_backend_rejects_unknown_distance():
+    with pytest.raises(ValueError):
+        vector_bench.OceanBaseBackend(None, "docs", "vector", "id", "manhattan")
@@ -0,0 +1,54 @@
+import base64
+
+import numpy as np
+import pytest
+
+from oceanbase_mcp.vector_codec import (
+    decode_vector,
+    encode_vector,
+    parse_vector,
+    query_vector,
+)
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_round_trip(dtype):
+    vector = np.array([0.5, -1.25, 3.0], dtype=dtype)
+    data = encode_vector(vector, dtype)
+    assert len(base64.b64decode(data)) == 3 * vector.itemsize
+    np.testing.assert_array_equal(decode_vector(data, dtype), vector)
+
+
+def test_decode_is_little_endian():
+    data = base64.b64encode(np.array([1.5, 2.0], dtype="<f4").tobytes()).decode()
+    assert decode_vector(data).tolist() == [1.5, 2.0]
+
+
+@pytest.mark.parametrize(
+    "data, dtype",
+    [
+        ("not base64!", "float32"),
+        (base64.b64encode(b"\x00\x00\x80").decode(), "float32"),
+        ("", "float32"),
+        (encode_vector([np.nan, 1.0]), "float32"),
+        (encode_vector([1.0]), "float64"),
+    ],
+)
+def test_decode_rejects_bad_vectors(data, dtype):
+    with pytest.raises(ValueError):
+        decode_vector(data, dtype)
+
+
+def test_query_vector_passes_lists_through():
+    assert query_vector([1.0, 2.0]) == [1.0, 2.0]
+    assert query_vector(encode_vector([1.0, 2.0], "float16"), "float16") == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+    "value", ["[0.5,-1.25]", " [0.5, -1.25] ", b"[0.5,-1.25]", np.array([0.5, -1.25])]
+)
+def test_parse_vector_reads_text_and_arrays(value):
+    # ann_search runs a text query, its vector columns come back as '[...]' text.
+    vector = parse_vector(value)
+    assert vector.dtype == np.float32 and vector.tolist() == [0.5, -1.25]
+    assert decode_vector(encode_vector(vector)).tolist() == [0.5, -1.25]
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from mysql.connector import Error
+
+from oceanbase_mcp import server, vector_index
+
+
+LONGOP = (
+    "10.0.0.1",
+    2882,
+    "create index",
+    "table_id=500001",
+    "2024-05-01 10:00:00",
+    12.5,
+    30.0,
+    "STATUS: REPLICA BUILD, ROW_SCANNED: 400000, ROW_INSERTED: 0",
+)
+
+
+@pytest.fixture
+def pool(monkeypatch, fake_pool):
+    def table_stats(sql, params):
+        return [(1000000, "VECTOR(768)")] if params[1] == "embedding" else []
+
+    # Another table's build, inspect_vector_indexes must not report it.
+    other = LONGOP[:3] + ("table_id=5000012",) + LONGOP[4:]
+    pool = fake_pool(
+        ("information_schema.TABLES", table_stats),
+        ("DBA_OBJECTS", [(500001,)]),
+        ("GV$SESSION_LONGOPS", [LONGOP, other]),
+        (
+            "GV$OB_VECTOR_MEMORY",
+            (["SVR_IP", "DENSE_VECTOR_INDEX_SIZE"], [("10.0.0.1", 1024)]),
+        ),
+        (
+            "SHOW INDEX",
+            (
+                ["Table", "Key_name", "Column_name", "Index_type"],
+                [
+                    ("docs", "PRIMARY", "id", "BTREE"),
+                    ("docs", "vidx", "embedding", "VECTOR"),
+                ],
+            ),
+        ),
+    )
+    monkeypatch.setattr(server, "db_pool", pool)
+    return pool
+
+
+def test_index_params():
+    assert vector_index.index_params("hnsw", "cosine", m=32, ef_construction=400) == (
+        "DISTANCE=COSINE, TYPE=HNSW, LIB=VSAG, M=32, EF_CONSTRUCTION=400"
+    )
+    assert vector_index.index_params("ivf_pq", "inner product", m=48, nlist=256) == (
+        "DISTANCE=INNER_PRODUCT, TYPE=IVF_PQ, LIB=OB, NLIST=256, M=48"
+    )
+    assert (
+        vector_index.index_params("hnsw_sq", None)
+        == "DISTANCE=L2, TYPE=HNSW_SQ, LIB=VSAG"
+    )
+    for args in [("diskann", "l2"), ("hnsw", "manhattan")]:
+        with pytest.raises(ValueError):
+            vector_index.index_params(*args)
+    with pytest.raises(ValueError):
+        vector_index.index_params("hnsw", "l2", m=256)
+
+
+def test_estimate_memory():
+    # 1M 768-dim float32 vectors with m=16: 3072 bytes of values and 136 of neighbor ids each.
+    assert vector_index.estimate_memory(1000000, 768, "hnsw") == 3208000000
+    assert vector_index.estimate_memory(1000000, 768, "hnsw_sq") == 904000000
+    assert (
+        vector_index.estimate_memory(1000000, 768, "ivf_flat", nlist=100)
+        == 100 * 768 * 4
+    )
+
+
+def test_create_with_replace_drops_the_existing_index(pool):
+    result = json.loads(
+        server.create_vector_index(
+            "docs", "vidx", "embedding", index_type="hnsw", m=24, replace=True
+        )
+    )
+    assert result["statements"] == [
+        "DROP INDEX `vidx` ON `docs`",
+        "CREATE VECTOR INDEX `vidx` ON `docs` (`embedding`) WITH "
+        "(DISTANCE=L2, TYPE=HNSW, LIB=VSAG, M=24)",
+    ]
+    assert pool.statements[-2:] == result["statements"]
+    assert (result["rows"], result["dim"]) == (1000000, 768)
+    with pytest.raises(ValueError):
+        server.create_vector_index("docs", "vidx", "title")
+
+
+def test_inspect(pool):
+    result = json.loads(server.inspect_vector_indexes("docs", "embedding"))
+    assert result["indexes"] == [
+        {"name": "vidx", "column": "embedding", "index_type": "VECTOR"}
+    ]
+    build = result["builds_in_progress"][0]
+    assert build["progress"] == {
+        "STATUS": "REPLICA BUILD",
+        "ROW_SCANNED": "400000",
+        "ROW_INSERTED": "0",
+    }
+    assert result["vector_memory"] == [
+        {"svr_ip": "10.0.0.1", "dense_vector_index_size": 1024}
+    ]
+    assert set(result["estimated_memory_bytes"]) == set(vector_index.INDEX_TYPES)
+
+    assert [build["target"] for build in result["builds_in_progress"]] == [
+        "table_id=500001"
+    ]
+    assert pool.executed[-3] == (vector_index._TABLE_ID_SQL, ("docs",))
+
+    # Without the table id or the view, builds are unknown rather than unfiltered.
+    pool.responses.insert(0, ("GV$SESSION_LONGOPS", Error("Table doesn't exist")))
+    result = json.loads(server.inspect_vector_indexes("docs", "embedding"))
+    assert result["builds_in_progress"] is None
+    pool.responses[0] = ("DBA_OBJECTS", [])
+    result = json.loads(server.inspect_vector_indexes("docs", "embedding"))
+    assert result["builds_in_progress"] is None
@@ -0,0 +1,202 @@
+import json
+import threading
+from contextlib import contextmanager
+
+import pytest
+from mysql.connector import Error
+from sqlalchemy.exc import OperationalError
+
+from oceanbase_mcp import server
+from oceanbase_mcp.vector_codec import encode_vector
+
+
+class FakeResult(list):
+    """The frozen SQLAlchemy result ann_search returns: iterable rows with keys()."""
+
+    def __init__(self, keys, rows):
+        super().__init__(rows)
+        self._keys = keys
+
+    def keys(self):
+        return self._keys
+
+
+class FakeClient:
+    def __init__(self, concurrency=1):
+        self.calls = []
+        self.barrier = threading.Barrier(concurrency, timeout=5)
+
+    def ann_search(self, table_name, vec_data, **kwargs):
+        self.calls.append((vec_data, kwargs))
+        # Only passes if the searches of a batch run at the same time.
+        self.barrier.wait()
+        if vec_data == [0.0]:
+            raise RuntimeError("Vector dimension mismatch")
+        keys, row = ["id"], [1]
+        if kwargs.get("output_column_names") == ["id", "vector"]:
+            # A text query returns the vector column in its text form.
+            keys.append("vector")
+            row.append(json.dumps(vec_data))
+        if kwargs["with_dist"]:
+            keys.append("l2_distance(vector, '[...]')")
+            row.append(vec_data[0] * 10)
+        return FakeResult(keys, [tuple(row)])
+
+
+class FakeRegistry:
+    def __init__(self, client):
+        self.client = client
+        self.session = []
+
+    def get(self, conn_info, table_name=None):
+        return self.client
+
+    @contextmanager
+    def session_variables(self, **variables):
+        self.session.append(variables)
+        yield
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def install(concurrency=1):
+        fake = FakeClient(concurrency)
+        monkeypatch.setattr(server, "vec_clients", FakeRegistry(fake))
+        return fake
+
+    return install
+
+
+def test_batch_runs_searches_concurrently(client):
+    fake = client(concurrency=3)
+    output = server.oceanbase_vector_search_batch(
+        "docs", [[0.1], [0.2], [0.0]], filter_expr=["category = 'a'"], topk=3
+    )
+    assert json.loads(output) == {
+        "queries": [
+            {"columns": ["id", "distance"], "rows": [[1, 1.0]]},
+            {"columns": ["id", "distance"], "rows": [[1, 2.0]]},
+            {"error": "Vector dimension mismatch"},
+        ]
+    }
+    assert all(
+        kwargs["topk"] == 3 and len(kwargs["where_clause"]) == 1
+        for _, kwargs in fake.calls
+    )
+
+
+def test_batch_limits(client, monkeypatch):
+    client()
+    with pytest.raises(ValueError):
+        server.oceanbase_vector_search_batch("docs", [])
+    monkeypatch.setattr(server, "OB_VECTOR_BATCH_MAX", 2)
+    with pytest.raises(ValueError):
+        server.oceanbase_vector_search_batch("docs", [[1.0], [2.0], [3.0]])
+    with pytest.raises(ValueError):
+        server.oceanbase_vector_search_batch("docs", [[1.0]], distance_func="manhattan")
+
+
+def test_base64_query_and_result_vectors(client):
+    fake = client()
+    data = encode_vector([0.5, 0.25], "float16")
+    output = server.oceabase_vector_search(
+        "docs",
+        data,
+        output_column_name=["id", "vector"],
+        with_distance=False,
+        vector_dtype="float16",
+        encode_vectors=True,
+    )
+    assert fake.calls[0][0] == [0.5, 0.25]
+    assert json.loads(output) == {"columns": ["id", "vector"], "rows": [[1, data]]}
+
+
+def test_batch_rejects_malformed_vector_before_searching(client):
+    fake = client()
+    with pytest.raises(ValueError):
+        server.oceanbase_vector_search_batch("docs", [[1.0], "not base64!"])
+    assert fake.calls == []
+
+
+def test_output_options(client):
+    client()
+    output = server.oceabase_vector_search(
+        "docs", [0.5, 0.25], output_column_name=["id", "vector"], output_format="jsonl"
+    )
+    assert output.splitlines() == [
+        '{"columns":["id","vector","distance"]}',
+        "[1,[0.5,0.25],5.0]",
+    ]
+    output = server.oceanbase_hybrid_search(
+        "docs", [0.5], filter_expr=["id > 0"], exclude_columns=["distance"]
+    )
+    assert json.loads(output) == {"columns": ["id"], "rows": [[1]]}
+    with pytest.raises(ValueError):
+        server.oceabase_vector_search("docs", [0.5], output_format="xml")
+
+
+@pytest.fixture
+def text_pool(fake_pool):
+    columns = ["id", "title", "_text_relevance"]
+    return fake_pool(("MATCH", (columns, [(2, "b", 7.5), (1, "a", 3.0)])))
+
+
+class FakeFusionClient:
+    def ann_search(self, table_name, vec_data, **kwargs):
+        self.kwargs = kwargs
+        return FakeResult(
+            ["id", "title", "l2_distance(vector, '[...]')"],
+            [(1, "a", 0.1), (3, "c", 0.4)],
+        )
+
+
+def test_fused_search_merges_both_searches(monkeypatch, text_pool):
+    pool, fake = text_pool, FakeFusionClient()
+    registry = FakeRegistry(fake)
+    monkeypatch.setattr(server, "db_pool", pool)
+    monkeypatch.setattr(server, "vec_clients", registry)
+    output = server.oceanbase_fused_search(
+        "docs",
+        "oceanbase",
+        [0.5, 0.25],
+        ["title"],
+        topk=2,
+        candidates=10,
+        output_column_name=["title"],
+        exclude_columns=["text_score"],
+        ef_search=80,
+    )
+    assert registry.session == [{"ob_hnsw_ef_search": 80}]
+    assert pool.executed[0][1] == ("oceanbase", "oceanbase", 10)
+    assert fake.kwargs["topk"] == 10 and fake.kwargs["output_column_names"] == [
+        "id",
+        "title",
+    ]
+    assert json.loads(output) == {
+        "columns": ["id", "title", "score", "text_rank", "vector_rank", "distance"],
+        "rows": [
+            [1, "a", pytest.approx(0.5 / 62 + 0.5 / 61), 2, 1, 0.1],
+            [2, "b", pytest.approx(0.5 / 61), 1, None, None],
+        ],
+    }
+    with pytest.raises(ValueError):
+        server.oceanbase_fused_search(
+            "docs", "oceanbase", [0.5], ["title"], fusion_method="max"
+        )
+
+
+class FailingFusionClient:
+    def ann_search(self, table_name, vec_data, **kwargs):
+        raise OperationalError("SELECT ...", {}, Exception("Unknown column 'vector'"))
+
+
+def test_fused_search_reports_errors_of_either_search(monkeypatch, text_pool):
+    monkeypatch.setattr(server, "db_pool", text_pool)
+    monkeypatch.setattr(server, "vec_clients", FakeRegistry(FailingFusionClient()))
+    output = server.oceanbase_fused_search("docs", "oceanbase", [0.5], ["title"])
+    assert output.startswith("Error executing query:") and "Unknown column" in output
+
+    monkeypatch.setattr(server, "vec_clients", FakeRegistry(FakeFusionClient()))
+    text_pool.responses = [("MATCH", Error("Full text index not found"))]
+    output = server.oceanbase_fused_search("docs", "oceanbase", [0.5], ["title"])
+    assert output == "Error executing query: Full text index not found"